@@ -0,0 +1,175 @@
+"""タスク進捗の購読ブローカー
+
+APIプロセス内で Redis pub/sub の接続を1本だけ持ち、タスクごとのチャンネルを
+購読者の有無に応じて subscribe / unsubscribe する。受信したイベントは
+そのタスクを監視している全ての購読キューへ配る。
+遅い購読者のキューが一杯になった場合は、タスクごとに最新の進捗だけを残して詰め直す。
+完了・失敗イベントは捨てない。
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Optional, Set
+
+from app.api.task_status import build_status_payload
+from app.utils.redis_client import (
+    PROGRESS_CHANNEL_PREFIX,
+    get_async_redis,
+    progress_channel,
+)
+
+logger = logging.getLogger(__name__)
+
+# 購読者に必ず届ける終了状態
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+def _is_terminal(payload: Dict[str, Any]) -> bool:
+    return payload.get("status") in TERMINAL_STATUSES
+
+
+def _coalesce(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """タスクごとに最新の途中経過だけを残す（終了イベントは全て残す）"""
+    latest = {
+        event.get("task_id"): index
+        for index, event in enumerate(events)
+        if not _is_terminal(event)
+    }
+    return [
+        event
+        for index, event in enumerate(events)
+        if _is_terminal(event) or latest[event.get("task_id")] == index
+    ]
+
+
+def put_latest(queue: asyncio.Queue, payload: Dict[str, Any]) -> None:
+    """キューへイベントを入れる（一杯ならタスクごとの最新の状態に詰め直す）"""
+    if not queue.full():
+        queue.put_nowait(payload)
+        return
+
+    events: List[Dict[str, Any]] = []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    events = _coalesce(events + [payload])
+
+    overflow = len(events) - queue.maxsize
+    if overflow > 0:
+        # 詰め直しても入りきらない場合は、古い途中経過から捨てる
+        dropped = 0
+        kept = []
+        for event in events:
+            if dropped < overflow and not _is_terminal(event) and event is not payload:
+                dropped += 1
+                continue
+            kept.append(event)
+        events = kept
+        if len(events) > queue.maxsize:
+            events = events[len(events) - queue.maxsize:]
+            logger.warning(f"購読キューが終了イベントで一杯です: task_id={payload.get('task_id')}")
+
+    for event in events:
+        queue.put_nowait(event)
+
+
+class ProgressBroker:
+    """タスク進捗イベントを購読者へ配信するブローカー"""
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._pubsub = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._has_channels = asyncio.Event()
+        self._lock = asyncio.Lock()
+
+    async def subscribe(
+        self, task_id: str, queue: Optional[asyncio.Queue] = None
+    ) -> asyncio.Queue:
+        """タスクの進捗を購読する
+
+        Args:
+            task_id: 購読するタスクID
+            queue: 既存のキュー（複数タスクを1つのキューで受け取る場合に指定）
+
+        Returns:
+            ステータス（build_status_payload の形式）が届くキュー
+        """
+        if queue is None:
+            queue = asyncio.Queue(maxsize=self.queue_size)
+        async with self._lock:
+            self._ensure_started()
+            subscribers = self._subscribers.get(task_id)
+            if subscribers is None:
+                subscribers = set()
+                self._subscribers[task_id] = subscribers
+                await self._pubsub.subscribe(progress_channel(task_id))
+                self._has_channels.set()
+            subscribers.add(queue)
+        return queue
+
+    async def unsubscribe(self, task_id: str, queue: asyncio.Queue) -> None:
+        """購読を解除する（最後の購読者ならチャンネルも解除する）"""
+        async with self._lock:
+            subscribers = self._subscribers.get(task_id)
+            if not subscribers:
+                return
+            subscribers.discard(queue)
+            if subscribers:
+                return
+            del self._subscribers[task_id]
+            try:
+                await self._pubsub.unsubscribe(progress_channel(task_id))
+            except Exception as e:
+                logger.warning(f"進捗チャンネルの購読解除に失敗: task_id={task_id}, error={e}")
+            if not self._subscribers:
+                self._has_channels.clear()
+
+    def subscriber_count(self, task_id: str) -> int:
+        """タスクの購読者数"""
+        return len(self._subscribers.get(task_id, ()))
+
+    def _ensure_started(self) -> None:
+        """pub/sub 接続と受信ループを開始する"""
+        if self._pubsub is None:
+            self._pubsub = get_async_redis().pubsub(ignore_subscribe_messages=True)
+        if self._reader_task is None or self._reader_task.done():
+            self._reader_task = asyncio.create_task(self._reader_loop())
+
+    async def _reader_loop(self) -> None:
+        """pub/sub メッセージを受信して購読キューへ配る"""
+        while True:
+            try:
+                await self._has_channels.wait()
+                message = await self._pubsub.get_message(timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"進捗チャンネルの受信エラー: {e}")
+                await asyncio.sleep(1.0)
+                continue
+
+            if not message or message.get("type") != "message":
+                continue
+            self._dispatch(message.get("channel"), message.get("data"))
+
+    def _dispatch(self, channel: Optional[str], data: Optional[str]) -> None:
+        """受信したイベントを該当タスクの購読者へ配る"""
+        if not channel or not channel.startswith(PROGRESS_CHANNEL_PREFIX):
+            return
+        task_id = channel[len(PROGRESS_CHANNEL_PREFIX):]
+        try:
+            event = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning(f"不正な進捗イベント: channel={channel}")
+            return
+
+        payload = build_status_payload(task_id, event.get("state", ""), event.get("info"))
+        for queue in list(self._subscribers.get(task_id, ())):
+            # 遅いクライアントにはタスクごとの最新の状態と終了イベントを届ける
+            put_latest(queue, payload)
+
+
+# APIプロセス内で共有するブローカー
+progress_broker = ProgressBroker()
@@ -15,6 +15,8 @@ from .scripts_models import (
     ThemeTitleRequest,
     ShortScriptRequest,
     ShortTitleRequest,
+    ScriptTaskResponse,
+    ScriptTaskStatusResponse,
 )
 from .scripts_handlers import (
     handle_generate_title,
@@ -28,6 +30,11 @@ from .scripts_handlers import (
     handle_get_available_models,
     handle_generate_short_titles,
     handle_generate_short_script,
+    handle_enqueue_title,
+    handle_enqueue_outline,
+    handle_enqueue_script,
+    handle_enqueue_short_script,
+    handle_get_script_task_status,
 )
 
 router = APIRouter()
@@ -184,3 +191,37 @@ async def generate_short_script(request: ShortScriptRequest):
 async def health_check():
     """ヘルスチェック"""
     return {"status": "healthy", "service": "comedy_script_generator"}
+
+
+@router.post("/tasks/title", response_model=ScriptTaskResponse)
+async def enqueue_title(request: TitleRequest):
+    """
+    タイトル生成をバックグラウンドタスクとして開始
+
+    タスクIDを即座に返す。進捗は /ws/progress/{task_id} で購読できる。
+    """
+    return await handle_enqueue_title(request)
+
+
+@router.post("/tasks/outline", response_model=ScriptTaskResponse)
+async def enqueue_outline(request: OutlineRequest):
+    """アウトライン生成をバックグラウンドタスクとして開始"""
+    return await handle_enqueue_outline(request)
+
+
+@router.post("/tasks/script", response_model=ScriptTaskResponse)
+async def enqueue_script(request: ScriptRequest):
+    """台本生成をバックグラウンドタスクとして開始"""
+    return await handle_enqueue_script(request)
+
+
+@router.post("/tasks/short-script", response_model=ScriptTaskResponse)
+async def enqueue_short_script(request: ShortScriptRequest):
+    """ショート動画台本生成（60秒）をバックグラウンドタスクとして開始"""
+    return await handle_enqueue_short_script(request)
+
+
+@router.get("/tasks/{task_id}", response_model=ScriptTaskStatusResponse)
+async def get_script_task_status(task_id: str):
+    """台本生成タスクのステータスと結果を取得"""
+    return await handle_get_script_task_status(task_id)
@@ -5,7 +5,7 @@ from typing import Dict, Any
 import logging
 
 from app.models.script_models import ScriptMode, ComedyTitleBatch
-from app.core.script_generators.unified_script_generator import UnifiedScriptGenerator
+from app.utils.llm_executor import run_llm_call
 from .scripts_models import (
     TitleRequest,
     TitleResponse,
@@ -17,6 +17,8 @@ from .scripts_models import (
     FullScriptResponse,
     ThemeBatchResponse,
     ThemeTitleRequest,
+    ScriptTaskResponse,
+    ScriptTaskStatusResponse,
 )
 
 logger = logging.getLogger(__name__)
@@ -27,9 +29,11 @@ async def handle_generate_title(request: TitleRequest) -> TitleResponse:
     try:
         logger.info(f"タイトル生成リクエスト: テーマ={request.input_text}")
 
+        from app.core.script_generators.unified_script_generator import UnifiedScriptGenerator
+
         generator = UnifiedScriptGenerator(ScriptMode.COMEDY)
 
-        title, reference_info, model_info = generator.generate_title(
+        title, reference_info, model_info = await generator.agenerate_title(
             input_text=request.input_text,
             model=request.model,
             temperature=request.temperature,
@@ -55,9 +59,11 @@ async def handle_generate_outline(request: OutlineRequest) -> OutlineResponse:
     try:
         logger.info(f"アウトライン生成リクエスト: タイトル={request.title_data.title}")
 
+        from app.core.script_generators.unified_script_generator import UnifiedScriptGenerator
+
         generator = UnifiedScriptGenerator(ScriptMode.COMEDY)
 
-        outline, youtube_metadata, model_info = generator.generate_outline(
+        outline, youtube_metadata, model_info = await generator.agenerate_outline(
             title_data=request.title_data,
             reference_info=request.reference_info or "",
             model=request.model,
@@ -83,13 +89,16 @@ async def handle_generate_script(request: ScriptRequest) -> ScriptResponse:
     try:
         logger.info(f"台本生成リクエスト: タイトル={request.outline_data.title}")
 
+        from app.core.script_generators.unified_script_generator import UnifiedScriptGenerator
+
         generator = UnifiedScriptGenerator(ScriptMode.COMEDY)
 
-        script, model_info = generator.generate_script(
+        script, model_info = await generator.agenerate_script(
             outline_data=request.outline_data,
             reference_info=request.reference_info or "",
             model=request.model,
             temperature=request.temperature,
+            parallel_sections=request.parallel_sections,
         )
 
         return ScriptResponse(script=script)
@@ -106,36 +115,24 @@ async def handle_generate_full_script(request: FullScriptRequest) -> FullScriptR
     try:
         logger.info(f"完全台本生成リクエスト: テーマ={request.input_text}")
 
+        from app.core.script_generators.unified_script_generator import UnifiedScriptGenerator
+
         generator = UnifiedScriptGenerator(ScriptMode.COMEDY)
 
-        # 1. タイトル生成
-        title, reference_info, model_info = generator.generate_title(
+        # タイトル → アウトライン → {YouTubeメタデータ, 台本} を依存グラフで生成
+        result = await generator.agenerate_full_script(
             input_text=request.input_text,
             model=request.model,
             temperature=request.temperature,
         )
-
-        # 2. アウトライン生成
-        outline, youtube_metadata, _ = generator.generate_outline(
-            title_data=title,
-            reference_info=reference_info,
-            model=request.model,
-            temperature=request.temperature,
-        )
-
-        # 3. 台本生成
-        script, _ = generator.generate_script(
-            outline_data=outline,
-            reference_info=reference_info,
-            model=request.model,
-            temperature=request.temperature,
-        )
+        logger.info(f"完全台本生成の所要時間: {result['timings']}")
 
         return FullScriptResponse(
-            script=script,
-            title=title,
-            outline=outline,
-            youtube_metadata=youtube_metadata
+            script=result["script"],
+            title=result["title"],
+            outline=result["outline"],
+            youtube_metadata=result["youtube_metadata"],
+            timings=result["timings"],
         )
 
     except HTTPException:
@@ -164,7 +161,7 @@ async def handle_generate_comedy_titles_batch() -> ComedyTitleBatch:
         llm = create_llm_instance(model, temperature, model_config)
 
         # タイトル量産
-        title_batch = generator.generate_title_batch(llm)
+        title_batch = await run_llm_call(generator.generate_title_batch, llm)
 
         return title_batch
 
@@ -262,7 +259,7 @@ async def handle_generate_theme_batch() -> ThemeBatchResponse:
 
         llm = create_llm_instance(model, temperature, model_config)
 
-        theme_batch = generator.title_generator.generate_theme_batch(llm)
+        theme_batch = await run_llm_call(generator.title_generator.generate_theme_batch, llm)
 
         return ThemeBatchResponse(themes=theme_batch.themes)
 
@@ -290,8 +287,8 @@ async def handle_generate_theme_titles(request: ThemeTitleRequest) -> ComedyTitl
 
         llm = create_llm_instance(model, temperature, model_config)
 
-        title_batch = generator.title_generator.generate_title_from_theme(
-            request.theme, llm
+        title_batch = await run_llm_call(
+            generator.title_generator.generate_title_from_theme, request.theme, llm
         )
 
         return title_batch
@@ -322,7 +319,8 @@ async def handle_generate_short_titles(request) -> ComedyTitleBatch:
         llm = create_llm_instance(model, temperature, model_config)
 
         # ショートタイトル生成
-        title_batch = generator.generate_short_titles(
+        title_batch = await run_llm_call(
+            generator.generate_short_titles,
             theme=request.theme,
             llm=llm,
         )
@@ -355,7 +353,8 @@ async def handle_generate_short_script(request) -> ScriptResponse:
         llm = create_llm_instance(model, temperature, model_config)
 
         # ショート台本生成
-        script = generator.generate_short_script(
+        script = await run_llm_call(
+            generator.generate_short_script,
             title=request.title_data,
             llm=llm,
         )
@@ -379,3 +378,92 @@ async def handle_generate_short_script(request) -> ScriptResponse:
         logger.error(f"ショート動画台本生成エラー: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+
+def _enqueue_script_task(kind: str, **params: Any) -> ScriptTaskResponse:
+    """台本生成タスクを投入してレスポンスを作成"""
+    from app.tasks.dispatch import enqueue_script_generation
+
+    task_id = enqueue_script_generation(kind, **params)
+    return ScriptTaskResponse(
+        task_id=task_id,
+        status="pending",
+        message="台本生成を開始しました",
+    )
+
+
+async def handle_enqueue_title(request: TitleRequest) -> ScriptTaskResponse:
+    """タイトル生成タスク投入ハンドラー"""
+    try:
+        logger.info(f"タイトル生成タスク投入: テーマ={request.input_text}")
+        return _enqueue_script_task(
+            "title",
+            input_text=request.input_text,
+            model=request.model,
+            temperature=request.temperature,
+        )
+
+    except Exception as e:
+        logger.error(f"タイトル生成タスク投入エラー: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def handle_enqueue_outline(request: OutlineRequest) -> ScriptTaskResponse:
+    """アウトライン生成タスク投入ハンドラー"""
+    try:
+        logger.info(f"アウトライン生成タスク投入: タイトル={request.title_data.title}")
+        return _enqueue_script_task(
+            "outline",
+            title_data=request.title_data.model_dump(mode="json"),
+            model=request.model,
+            temperature=request.temperature,
+        )
+
+    except Exception as e:
+        logger.error(f"アウトライン生成タスク投入エラー: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def handle_enqueue_script(request: ScriptRequest) -> ScriptTaskResponse:
+    """台本生成タスク投入ハンドラー"""
+    try:
+        logger.info(f"台本生成タスク投入: タイトル={request.outline_data.title}")
+        return _enqueue_script_task(
+            "script",
+            outline_data=request.outline_data.model_dump(mode="json"),
+            model=request.model,
+            temperature=request.temperature,
+            parallel_sections=request.parallel_sections,
+        )
+
+    except Exception as e:
+        logger.error(f"台本生成タスク投入エラー: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def handle_enqueue_short_script(request) -> ScriptTaskResponse:
+    """ショート動画台本生成タスク投入ハンドラー"""
+    try:
+        logger.info(f"ショート動画台本生成タスク投入: タイトル={request.title_data.title}")
+        return _enqueue_script_task(
+            "short_script",
+            title_data=request.title_data.model_dump(mode="json"),
+            model=request.model,
+            temperature=request.temperature,
+        )
+
+    except Exception as e:
+        logger.error(f"ショート動画台本生成タスク投入エラー: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def handle_get_script_task_status(task_id: str) -> ScriptTaskStatusResponse:
+    """台本生成タスクのステータス取得ハンドラー"""
+    try:
+        from app.api.task_status import task_status_service
+
+        payload = await task_status_service.get_status(task_id)
+        return ScriptTaskStatusResponse(**payload)
+
+    except Exception as e:
+        logger.error(f"台本生成タスクのステータス取得エラー: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
@@ -62,6 +62,9 @@ class ScriptRequest(BaseModel):
     reference_info: Optional[str] = Field(None, description="参照情報（使用されない）")
     model: Optional[str] = Field(None, description="使用するLLMモデルID")
     temperature: Optional[float] = Field(None, description="生成温度")
+    parallel_sections: Optional[bool] = Field(
+        None, description="セクションを並列生成するか（省略時はサーバー設定）"
+    )
 
 
 class ScriptResponse(BaseModel):
@@ -88,6 +91,9 @@ class FullScriptResponse(BaseModel):
     youtube_metadata: Optional[YouTubeMetadata] = Field(
         default=None, description="YouTubeメタデータ（生成失敗時はNone）"
     )
+    timings: Optional[Dict[str, float]] = Field(
+        default=None, description="ステップごとの所要時間（秒）"
+    )
 
 
 class ThemeBatchResponse(BaseModel):
@@ -120,3 +126,21 @@ class ShortTitleRequest(BaseModel):
     model: Optional[str] = Field(None, description="使用するLLMモデル")
     temperature: Optional[float] = Field(None, description="生成温度")
 
+
+class ScriptTaskResponse(BaseModel):
+    """台本生成タスク投入レスポンス"""
+
+    task_id: str = Field(..., description="タスクID（/ws/progress/{task_id} で進捗を購読できる）")
+    status: str = Field(..., description="ステータス")
+    message: str = Field(..., description="メッセージ")
+
+
+class ScriptTaskStatusResponse(BaseModel):
+    """台本生成タスクのステータスレスポンス"""
+
+    task_id: str
+    status: str
+    progress: float = Field(default=0.0, ge=0.0, le=1.0)
+    message: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
@@ -0,0 +1,204 @@
+"""タスク状態のレスポンス生成
+
+Celeryの状態とメタ情報からクライアント向けのステータスを組み立てる。
+WebSocket中継とステータスAPIの両方で共通に使う。
+"""
+
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.tasks.celery_app import celery_app
+from app.utils.redis_client import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+# これ以上状態が変化しないCeleryの状態
+TERMINAL_STATES = frozenset({"SUCCESS", "FAILURE", "REVOKED"})
+
+
+def _error_message(info: Any) -> str:
+    """失敗時のメタ情報からエラーメッセージを取り出す"""
+    if isinstance(info, dict):
+        if "error" in info:
+            return str(info["error"])
+        # Celeryが保存した例外情報
+        if "exc_message" in info:
+            exc_message = info["exc_message"]
+            if isinstance(exc_message, (list, tuple)):
+                return " ".join(str(m) for m in exc_message)
+            return str(exc_message)
+    return str(info)
+
+
+def build_status_payload(task_id: str, state: str, info: Any = None) -> Dict[str, Any]:
+    """
+    Celeryの状態からクライアント向けステータスを作成
+
+    Args:
+        task_id: タスクID
+        state: Celeryのタスク状態
+        info: メタ情報（PROGRESS/FAILURE）または結果（SUCCESS）
+
+    Returns:
+        task_id, status, progress, message（および result / error）を持つ辞書
+    """
+    if state == "PENDING":
+        return {
+            "task_id": task_id,
+            "status": "pending",
+            "progress": 0.0,
+            "message": "タスクは待機中です",
+        }
+    if state == "PROGRESS":
+        info = info if isinstance(info, dict) else {}
+        payload = {
+            "task_id": task_id,
+            "status": "processing",
+            "progress": info.get("progress", 0.0),
+            "message": info.get("message", "処理中..."),
+        }
+        # 進捗の付加情報（ステージ・フレーム数など）はそのまま渡す
+        for key, value in info.items():
+            if key not in ("progress", "message"):
+                payload[key] = value
+        return payload
+    if state == "SUCCESS":
+        result = info if isinstance(info, dict) else {}
+        return {
+            "task_id": task_id,
+            "status": "completed",
+            "progress": 1.0,
+            "message": result.get("message", "完了しました"),
+            "result": result,
+        }
+    if state == "FAILURE":
+        message = "タスクが失敗しました"
+        if isinstance(info, dict) and "message" in info:
+            message = info["message"]
+        return {
+            "task_id": task_id,
+            "status": "failed",
+            "progress": 0.0,
+            "message": message,
+            "error": _error_message(info),
+        }
+    return {
+        "task_id": task_id,
+        "status": state.lower(),
+        "progress": 0.0,
+        "message": f"状態: {state}",
+    }
+
+
+def result_key(task_id: str) -> str:
+    """Celery結果バックエンドのキー名を取得"""
+    key = celery_app.backend.get_key_for_task(task_id)
+    return key.decode() if isinstance(key, bytes) else key
+
+
+def parse_result_meta(raw: Optional[str]) -> Tuple[str, Any]:
+    """結果バックエンドに保存されたJSONを (state, info) に変換"""
+    if not raw:
+        return "PENDING", None
+    meta = json.loads(raw)
+    return meta.get("status", "PENDING"), meta.get("result")
+
+
+def is_terminal_payload(payload: Dict[str, Any]) -> bool:
+    """ステータスが終了状態かどうか"""
+    return payload.get("status") in ("completed", "failed", "revoked")
+
+
+class TaskStatusService:
+    """
+    タスク状態の取得サービス
+
+    非同期Redisクライアントで結果バックエンドを直接読むため、イベントループをブロックしない。
+    終了状態（SUCCESS / FAILURE / REVOKED）はそれ以上変化しないため、プロセス内に
+    TTL付きでキャッシュし、完了済みタスクへのポーリングではRedisへ問い合わせない。
+    """
+
+    def __init__(self, terminal_ttl: float = 300.0, max_entries: int = 10000):
+        self.terminal_ttl = terminal_ttl
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    async def get_status(self, task_id: str) -> Dict[str, Any]:
+        """タスク1件の状態を取得"""
+        cached = self._get_cached(task_id)
+        if cached is not None:
+            return cached
+        raw = await get_async_redis().get(result_key(task_id))
+        return self._build(task_id, raw)
+
+    async def get_statuses(self, task_ids: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        複数タスクの状態をまとめて取得
+
+        キャッシュにないタスクのみを MGET 1回で取得する。
+
+        Returns:
+            task_ids と同じ順序のステータス一覧
+        """
+        payloads: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
+        for task_id in dict.fromkeys(task_ids):
+            cached = self._get_cached(task_id)
+            if cached is not None:
+                payloads[task_id] = cached
+            else:
+                missing.append(task_id)
+
+        if missing:
+            raws = await get_async_redis().mget([result_key(t) for t in missing])
+            for task_id, raw in zip(missing, raws):
+                payloads[task_id] = self._build(task_id, raw)
+
+        return [payloads[task_id] for task_id in task_ids]
+
+    def invalidate(self, task_id: str) -> None:
+        """キャッシュを破棄する"""
+        self._cache.pop(task_id, None)
+
+    def _build(self, task_id: str, raw: Optional[str]) -> Dict[str, Any]:
+        """結果バックエンドの値からステータスを作成し、終了状態ならキャッシュする"""
+        try:
+            state, info = parse_result_meta(raw)
+        except ValueError as e:
+            logger.warning(f"タスク結果の解析に失敗: task_id={task_id}, error={e}")
+            state, info = "PENDING", None
+        payload = build_status_payload(task_id, state, info)
+        if state in TERMINAL_STATES:
+            self._store(task_id, payload)
+        return payload
+
+    def _get_cached(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """有効期限内のキャッシュを取得"""
+        entry = self._cache.get(task_id)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at < time.monotonic():
+            del self._cache[task_id]
+            return None
+        self._cache.move_to_end(task_id)
+        return payload
+
+    def _store(self, task_id: str, payload: Dict[str, Any]) -> None:
+        """キャッシュに保存（上限を超えたら古いものから破棄）"""
+        self._cache[task_id] = (time.monotonic() + self.terminal_ttl, payload)
+        self._cache.move_to_end(task_id)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+
+# APIプロセス内で共有するステータスサービス
+task_status_service = TaskStatusService()
+
+
+async def fetch_status_snapshot(task_id: str) -> Dict[str, Any]:
+    """非同期Redisクライアントで現在のタスク状態を取得"""
+    return await task_status_service.get_status(task_id)
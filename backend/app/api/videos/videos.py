@@ -1,21 +1,33 @@
 """動画生成API"""
 
 from fastapi import APIRouter
-from typing import List
+from typing import List, Literal
 from .videos_models import (
     VideoGenerationRequest,
     VideoGenerationResponse,
     VideoStatusResponse,
+    BulkVideoStatusRequest,
+    BulkVideoStatusResponse,
     JsonFileInfo,
     JsonFileStatusUpdate,
+    StoryboardRequest,
+    StoryboardResponse,
+    FrameRenderRequest,
+    RenderEstimateRequest,
+    RenderEstimateResponse,
 )
 from .videos_handlers import (
     handle_generate_video,
     handle_get_video_status,
+    handle_get_video_statuses,
     handle_list_json_files,
     handle_get_json_file,
     handle_update_json_file_status,
     handle_delete_json_file,
+    handle_create_storyboard,
+    handle_render_frame,
+    handle_warm_up_frame_renderer,
+    handle_estimate_render,
 )
 
 router = APIRouter()
@@ -27,12 +39,42 @@ async def generate_video(request: VideoGenerationRequest):
     return await handle_generate_video(request)
 
 
+@router.post("/storyboard", response_model=StoryboardResponse)
+async def create_storyboard(request: StoryboardRequest):
+    """台本から動画を生成せずにストーリーボードを作成する"""
+    return await handle_create_storyboard(request)
+
+
+@router.post("/frame")
+async def render_frame(request: FrameRenderRequest):
+    """台本の指定時刻のフレームを描画する（タイムラインのスクラブ用）"""
+    return await handle_render_frame(request)
+
+
+@router.post("/frame/warmup")
+async def warm_up_frame_renderer(render_profile: Literal["default", "preview"] = "preview"):
+    """フレーム描画用の画像・フォントを事前に読み込む"""
+    return await handle_warm_up_frame_renderer(render_profile)
+
+
+@router.post("/estimate", response_model=RenderEstimateResponse)
+async def estimate_render(request: RenderEstimateRequest):
+    """動画を生成せずに長さ・必要なアセット・所要時間を見積もる（ドライラン）"""
+    return await handle_estimate_render(request)
+
+
 @router.get("/status/{task_id}", response_model=VideoStatusResponse)
 async def get_video_status(task_id: str):
     """動画生成のステータスを取得する"""
     return await handle_get_video_status(task_id)
 
 
+@router.post("/status/bulk", response_model=BulkVideoStatusResponse)
+async def get_video_statuses(request: BulkVideoStatusRequest):
+    """複数の動画生成タスクのステータスをまとめて取得する"""
+    return await handle_get_video_statuses(request)
+
+
 @router.get("/health")
 async def health_check():
     """動画生成APIのヘルスチェック"""
@@ -1,20 +1,26 @@
 """動画生成APIのエンドポイントハンドラー"""
 
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
 from typing import Dict, Any, List
 import logging
 from pathlib import Path
-from celery.result import AsyncResult
 
-from app.tasks.video_tasks import generate_video_task
-from app.tasks.celery_app import celery_app
+from app.api.task_status import task_status_service
+from app.tasks.dispatch import enqueue_video_generation
 from app.config.app import Paths
 from .videos_models import (
     VideoGenerationRequest,
     VideoGenerationResponse,
     VideoStatusResponse,
+    BulkVideoStatusRequest,
+    BulkVideoStatusResponse,
     JsonFileInfo,
     JsonFileStatusUpdate,
+    StoryboardRequest,
+    StoryboardResponse,
+    FrameRenderRequest,
+    RenderEstimateRequest,
+    RenderEstimateResponse,
 )
 
 logger = logging.getLogger(__name__)
@@ -31,7 +37,7 @@ async def handle_generate_video(request: VideoGenerationRequest) -> VideoGenerat
         if request.sections:
             sections_dict = [section.model_dump() for section in request.sections]
 
-        task = generate_video_task.delay(
+        task_id = enqueue_video_generation(
             conversations=conversations_dict,
             title=request.title,
             enable_subtitles=request.enable_subtitles,
@@ -39,13 +45,21 @@ async def handle_generate_video(request: VideoGenerationRequest) -> VideoGenerat
             sections=sections_dict,
             speed=request.speed,
             pitch=request.pitch,
-            intonation=request.intonation
+            intonation=request.intonation,
+            animation_seed=request.animation_seed,
+            render_profile=request.render_profile,
+            progressive=request.progressive,
+            renditions=(
+                [rendition.model_dump() for rendition in request.renditions]
+                if request.renditions
+                else None
+            )
         )
 
-        logger.info(f"動画生成タスク開始: task_id={task.id}")
+        logger.info(f"動画生成タスク開始: task_id={task_id}")
 
         return VideoGenerationResponse(
-            task_id=task.id,
+            task_id=task_id,
             status="pending",
             message="動画生成を開始しました",
         )
@@ -55,60 +69,162 @@ async def handle_generate_video(request: VideoGenerationRequest) -> VideoGenerat
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def handle_get_video_status(task_id: str) -> VideoStatusResponse:
-    """動画生成のステータスを取得する"""
+async def handle_create_storyboard(request: StoryboardRequest) -> StoryboardResponse:
+    """台本からストーリーボード（代表フレームのコンタクトシート）を作成する"""
     try:
-        task_result = AsyncResult(task_id, app=celery_app)
-
-        if task_result.state == "PENDING":
-            response = VideoStatusResponse(
-                task_id=task_id,
-                status="pending",
-                progress=0.0,
-                message="タスクは待機中です",
-            )
-        elif task_result.state == "PROGRESS":
-            info = task_result.info or {}
-            response = VideoStatusResponse(
-                task_id=task_id,
-                status="processing",
-                progress=info.get("progress", 0.0),
-                message=info.get("message", "処理中..."),
-            )
-        elif task_result.state == "SUCCESS":
-            result = task_result.result or {}
-            response = VideoStatusResponse(
-                task_id=task_id,
-                status="completed",
-                progress=1.0,
-                message=result.get("message", "完了しました"),
-                result=result,
-            )
-        elif task_result.state == "FAILURE":
-            info = task_result.info or {}
-            error_msg = str(info.get("error", task_result.info)) if isinstance(task_result.info, dict) else str(task_result.info)
-            response = VideoStatusResponse(
-                task_id=task_id,
-                status="failed",
-                progress=0.0,
-                message=info.get("message", "タスクが失敗しました") if isinstance(info, dict) else "タスクが失敗しました",
-                error=error_msg,
-            )
+        # 描画モジュール（OpenCV・合成処理）は初回リクエスト時に読み込む
+        from app.services.video.frame_preview import build_storyboard, run_frame_render
+
+        logger.info(f"ストーリーボード作成リクエスト: {len(request.conversations)}会話")
+
+        result = await run_frame_render(
+            build_storyboard,
+            conversations=[conv.model_dump() for conv in request.conversations],
+            sections=request.sections,
+            per=request.per,
+            enable_subtitles=request.enable_subtitles,
+            conversation_mode=request.conversation_mode,
+            voice_settings={
+                "speed": request.speed,
+                "pitch": request.pitch,
+                "intonation": request.intonation,
+            },
+            synthesize_voices=request.synthesize_voices,
+            columns=request.columns,
+            thumbnail_width=request.thumbnail_width,
+        )
+        return StoryboardResponse(**result)
+
+    except Exception as e:
+        logger.error(f"ストーリーボード作成エラー: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def handle_render_frame(request: FrameRenderRequest) -> Response:
+    """台本の指定時刻のフレームを画像で返す"""
+    try:
+        from app.services.video.frame_preview import render_frame_at, run_frame_render
+
+        result = await run_frame_render(
+            render_frame_at,
+            conversations=[conv.model_dump() for conv in request.conversations],
+            current_time=request.time,
+            enable_subtitles=request.enable_subtitles,
+            conversation_mode=request.conversation_mode,
+            voice_settings={
+                "speed": request.speed,
+                "pitch": request.pitch,
+                "intonation": request.intonation,
+            },
+            image_format=request.format,
+            quality=request.quality,
+            profile_name=request.render_profile,
+        )
+        headers = {
+            "Cache-Control": "no-store",
+            "X-Render-Time-Ms": str(result["elapsed_ms"]),
+            "X-Timeline-Cached": "1" if result["timeline_cached"] else "0",
+            "X-Total-Duration": str(result["total_duration"]),
+        }
+        if result["line_index"] is not None:
+            headers["X-Line-Index"] = str(result["line_index"])
+        return Response(
+            content=result["image"], media_type=f"image/{request.format}", headers=headers
+        )
+
+    except Exception as e:
+        logger.error(f"フレーム描画エラー: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def handle_warm_up_frame_renderer(render_profile: str) -> Dict[str, Any]:
+    """フレーム描画用のリソースを読み込む"""
+    try:
+        from app.services.video.frame_preview import run_frame_render, warm_up_frame_preview
+
+        return await run_frame_render(warm_up_frame_preview, render_profile)
+
+    except Exception as e:
+        logger.error(f"フレーム描画の準備エラー: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def handle_estimate_render(request: RenderEstimateRequest) -> RenderEstimateResponse:
+    """動画を生成せずに長さ・必要なアセット・キャッシュ・所要時間を見積もる"""
+    try:
+        from app.models.scripts.common import VideoSection
+        from app.services.video.frame_preview import run_frame_render
+        from app.services.video.render_estimate import estimate_render
+        from app.services.video.video_job import section_to_conversations
+
+        if request.json_file:
+            data = await handle_get_json_file(request.json_file)
+            try:
+                sections = [VideoSection(**section) for section in data.get("sections") or []]
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"台本JSONの形式が不正です: {e}")
+            if not sections:
+                raise HTTPException(status_code=400, detail="セクション情報が見つかりません")
+            conversations = [
+                conv for section in sections for conv in section_to_conversations(section)
+            ]
         else:
-            response = VideoStatusResponse(
-                task_id=task_id,
-                status=task_result.state.lower(),
-                progress=0.0,
-                message=f"状態: {task_result.state}",
-            )
+            sections = request.sections
+            conversations = [conv.model_dump() for conv in request.conversations]
 
-        return response
+        logger.info(f"レンダリング見積もりリクエスト: {len(conversations)}会話")
+
+        result = await run_frame_render(
+            estimate_render,
+            conversations=conversations,
+            sections=[section.model_dump() for section in sections] if sections else None,
+            enable_subtitles=request.enable_subtitles,
+            conversation_mode=request.conversation_mode,
+            speed=request.speed,
+            pitch=request.pitch,
+            intonation=request.intonation,
+            animation_seed=request.animation_seed,
+            render_profile=request.render_profile,
+            progressive=request.progressive,
+            renditions=(
+                [rendition.model_dump() for rendition in request.renditions]
+                if request.renditions
+                else None
+            ),
+        )
+        return RenderEstimateResponse(**result)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"レンダリング見積もりエラー: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def handle_get_video_status(task_id: str) -> VideoStatusResponse:
+    """動画生成のステータスを取得する"""
+    try:
+        payload = await task_status_service.get_status(task_id)
+        return VideoStatusResponse(**payload)
 
     except Exception as e:
         logger.error(f"ステータス取得エラー: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def handle_get_video_statuses(request: BulkVideoStatusRequest) -> BulkVideoStatusResponse:
+    """複数の動画生成タスクのステータスをまとめて取得する"""
+    try:
+        payloads = await task_status_service.get_statuses(request.task_ids)
+        return BulkVideoStatusResponse(
+            statuses=[VideoStatusResponse(**payload) for payload in payloads]
+        )
+
+    except Exception as e:
+        logger.error(f"ステータス一括取得エラー: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 async def handle_list_json_files() -> List[JsonFileInfo]:
     """outputs/json/ディレクトリ内のJSONファイル一覧を取得する"""
     try:
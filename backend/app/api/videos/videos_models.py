@@ -1,8 +1,9 @@
 """動画生成APIのリクエスト/レスポンスモデル"""
 
-from pydantic import BaseModel, Field
-from typing import List, Dict, Optional, Any
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Dict, Optional, Any, Literal
 
+from app.config.app import RENDITION_PRESETS
 from app.models.scripts.common import VideoSection
 
 
@@ -18,6 +19,30 @@ class ConversationLine(BaseModel):
     character_expressions: Optional[Dict[str, str]] = Field(None, description="キャラクターごとの表情")
 
 
+class RenditionSpec(BaseModel):
+    """最終動画と同時に書き出す追加出力"""
+
+    name: str = Field(
+        ...,
+        pattern=r"^[A-Za-z0-9_-]+$",
+        description="出力名（ファイル名の接尾辞）。720p / 480p / 360p は height 省略時にプリセットを使用",
+    )
+    height: Optional[int] = Field(None, ge=144, le=2160, description="高さ（幅は縦横比を保って決まる）")
+    crf: Optional[int] = Field(None, ge=0, le=63, description="画質（CRF）")
+    video_bitrate: Optional[str] = Field(
+        None, pattern=r"^\d+[kM]$", description="映像ビットレート（例: 1500k）。指定時はCRFより優先"
+    )
+    container: Literal["mp4", "mkv", "webm"] = Field(default="mp4", description="コンテナ")
+
+    @model_validator(mode="after")
+    def check_preset(self) -> "RenditionSpec":
+        if self.height is None and self.name not in RENDITION_PRESETS:
+            raise ValueError(
+                f"height を省略できるのはプリセット（{', '.join(RENDITION_PRESETS)}）のみです"
+            )
+        return self
+
+
 class VideoGenerationRequest(BaseModel):
     """動画生成リクエスト"""
 
@@ -29,6 +54,24 @@ class VideoGenerationRequest(BaseModel):
     speed: Optional[float] = Field(None, description="話速")
     pitch: Optional[float] = Field(None, description="音高")
     intonation: Optional[float] = Field(None, description="抑揚")
+    animation_seed: Optional[int] = Field(
+        None,
+        ge=0,
+        description="瞬きなどのアニメーションのシード（省略時は台本の内容から決定）",
+    )
+    render_profile: Literal["default", "preview"] = Field(
+        default="default",
+        description="描画プロファイル（preview は 640x360・低フレームレートの確認用）",
+    )
+    progressive: bool = Field(
+        default=False,
+        description="描画中の動画をHLSで逐次出力する（進捗の playlist_url で再生できる）",
+    )
+    renditions: Optional[List[RenditionSpec]] = Field(
+        None,
+        max_length=4,
+        description="追加出力（合成済みのフレームを1回のエンコードで全解像度に書き出す）",
+    )
 
 
 class VideoGenerationResponse(BaseModel):
@@ -48,6 +91,24 @@ class VideoStatusResponse(BaseModel):
     message: Optional[str] = None
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
+    playlist_url: Optional[str] = Field(None, description="描画中の動画のHLSプレイリスト")
+    stage: Optional[str] = Field(None, description="処理中のステージ（voice / render / encode など）")
+    frames_done: Optional[int] = Field(None, description="描画済みフレーム数")
+    total_frames: Optional[int] = Field(None, description="総フレーム数")
+    fps: Optional[float] = Field(None, description="描画速度（フレーム/秒）")
+    eta_seconds: Optional[float] = Field(None, description="ステージ完了までの残り時間の目安（秒）")
+
+
+class BulkVideoStatusRequest(BaseModel):
+    """複数タスクのステータス取得リクエスト"""
+
+    task_ids: List[str] = Field(..., min_length=1, max_length=500, description="タスクIDリスト")
+
+
+class BulkVideoStatusResponse(BaseModel):
+    """複数タスクのステータスレスポンス"""
+
+    statuses: List[VideoStatusResponse] = Field(..., description="タスクIDの指定順のステータス")
 
 
 class JsonFileInfo(BaseModel):
@@ -63,3 +124,164 @@ class JsonFileStatusUpdate(BaseModel):
 
     is_generated: bool = Field(..., description="動画生成済みかどうか")
 
+
+
+class StoryboardRequest(BaseModel):
+    """ストーリーボード作成リクエスト"""
+
+    conversations: List[ConversationLine] = Field(..., min_length=1, description="会話リスト")
+    sections: Optional[List[VideoSection]] = Field(None, description="セクション情報")
+    enable_subtitles: bool = Field(default=True, description="字幕を有効にする")
+    conversation_mode: str = Field(default="duo", description="会話モード")
+    speed: Optional[float] = Field(None, description="話速")
+    pitch: Optional[float] = Field(None, description="音高")
+    intonation: Optional[float] = Field(None, description="抑揚")
+    per: Literal["line", "section"] = Field(
+        default="line", description="代表フレームの単位（セリフごと / セクションごと）"
+    )
+    synthesize_voices: bool = Field(
+        default=False,
+        description="キャッシュにないセリフの音声を合成して正確な長さを使う（省略時は推定値）",
+    )
+    columns: int = Field(default=6, ge=1, le=20, description="コンタクトシートの列数")
+    thumbnail_width: int = Field(default=320, ge=64, le=1280, description="サムネイルの幅")
+
+
+class StoryboardFrame(BaseModel):
+    """ストーリーボードの1フレーム"""
+
+    index: int = Field(..., description="セリフのインデックス")
+    section_index: Optional[int] = Field(None, description="セクションのインデックス")
+    time: float = Field(..., description="フレームの時刻（秒）")
+    start_time: float = Field(..., description="セリフの開始時刻（秒）")
+    duration: float = Field(..., description="セリフの長さ（秒）")
+    speaker: str = Field(..., description="話者名")
+    text: str = Field(..., description="セリフ内容")
+    duration_source: Literal["cached", "synthesized", "estimated"] = Field(
+        ..., description="セリフの長さの出典"
+    )
+    image: str = Field(..., description="サムネイル画像（data URL）")
+
+
+class StoryboardResponse(BaseModel):
+    """ストーリーボード作成レスポンス"""
+
+    contact_sheet: Optional[str] = Field(None, description="コンタクトシート画像（data URL）")
+    frames: List[StoryboardFrame] = Field(..., description="代表フレーム")
+    total_duration: float = Field(..., description="動画全体の長さ（秒、推定値を含む）")
+    elapsed_ms: float = Field(..., description="作成にかかった時間（ミリ秒）")
+
+
+class FrameRenderRequest(BaseModel):
+    """指定時刻のフレーム描画リクエスト"""
+
+    conversations: List[ConversationLine] = Field(..., min_length=1, description="会話リスト")
+    time: float = Field(..., ge=0.0, description="描画する時刻（秒）")
+    enable_subtitles: bool = Field(default=True, description="字幕を有効にする")
+    conversation_mode: str = Field(default="duo", description="会話モード")
+    speed: Optional[float] = Field(None, description="話速")
+    pitch: Optional[float] = Field(None, description="音高")
+    intonation: Optional[float] = Field(None, description="抑揚")
+    format: Literal["jpeg", "webp"] = Field(default="jpeg", description="画像形式")
+    quality: int = Field(default=80, ge=1, le=100, description="画質")
+    render_profile: Literal["default", "preview"] = Field(
+        default="preview",
+        description="描画プロファイル（default は本番と同じ解像度）",
+    )
+
+
+class RenderEstimateRequest(BaseModel):
+    """レンダリング見積もり（ドライラン）リクエスト
+
+    conversations / sections の代わりに json_file で保存済みの台本を指定できる。
+    その他の項目は動画生成リクエストと同じ。
+    """
+
+    conversations: Optional[List[ConversationLine]] = Field(None, description="会話リスト")
+    sections: Optional[List[VideoSection]] = Field(None, description="セクション情報")
+    json_file: Optional[str] = Field(
+        None, description="保存済みの台本JSON（outputs/json からの相対パス）"
+    )
+    enable_subtitles: bool = Field(default=True, description="字幕を有効にする")
+    conversation_mode: str = Field(default="duo", description="会話モード")
+    speed: Optional[float] = Field(None, description="話速")
+    pitch: Optional[float] = Field(None, description="音高")
+    intonation: Optional[float] = Field(None, description="抑揚")
+    animation_seed: Optional[int] = Field(None, ge=0, description="アニメーションのシード")
+    render_profile: Literal["default", "preview"] = Field(
+        default="default", description="描画プロファイル"
+    )
+    progressive: bool = Field(default=False, description="描画中の動画をHLSで逐次出力する")
+    renditions: Optional[List[RenditionSpec]] = Field(None, max_length=4, description="追加出力")
+
+    @model_validator(mode="after")
+    def require_script(self) -> "RenderEstimateRequest":
+        if not self.conversations and not self.json_file:
+            raise ValueError("conversations か json_file のどちらかを指定してください")
+        return self
+
+
+class RenderEstimateAsset(BaseModel):
+    """見積もり対象の台本が参照するアセット"""
+
+    type: Literal["background", "character", "bgm", "font"] = Field(..., description="種類")
+    name: str = Field(..., description="名前（キャラクターは 名前/表情）")
+    available: bool = Field(..., description="ファイルが存在するか")
+    fallback: Optional[str] = Field(None, description="存在しない場合に代わりに使われるもの")
+
+
+class RenderEstimateLine(BaseModel):
+    """セリフごとの長さ"""
+
+    index: int = Field(..., description="セリフのインデックス（締めくくりを含む）")
+    duration: float = Field(..., description="長さ（秒）")
+    duration_source: Literal["cached", "estimated"] = Field(
+        ..., description="長さの出どころ（cached: キャッシュ済み音声, estimated: 文字数から推定）"
+    )
+
+
+class RenderEstimateSection(BaseModel):
+    """セクションごとのクリップキャッシュの状況"""
+
+    index: int = Field(..., description="セクションのインデックス")
+    section_key: Optional[str] = Field(None, description="セクションのキー")
+    section_name: str = Field(..., description="セクション名")
+    duration: float = Field(..., description="長さ（秒）")
+    cached: bool = Field(..., description="レンダリング済みクリップがあるか")
+
+
+class RenderEstimateTime(BaseModel):
+    """所要時間の見積もり（記録済みジョブの実時間比から算出）"""
+
+    render_duration: float = Field(..., description="描画が必要な動画の長さ（秒）")
+    estimated_seconds: Optional[float] = Field(None, description="ジョブ全体の所要時間（秒）")
+    render_seconds: Optional[float] = Field(None, description="うち音声合成・描画（秒）")
+    encode_seconds: Optional[float] = Field(None, description="うちエンコード（秒）")
+    realtime_factor: Optional[float] = Field(None, description="記録済みの実時間比")
+    samples: int = Field(default=0, description="記録済みのジョブ数")
+    calibrated: bool = Field(..., description="記録済みのジョブから算出できたか")
+
+
+class RenderEstimateResponse(BaseModel):
+    """レンダリング見積もり（ドライラン）レスポンス"""
+
+    render_profile: str = Field(..., description="描画プロファイル")
+    total_duration: float = Field(..., description="動画全体の長さ（秒、推定値を含む）")
+    frame_count: int = Field(..., description="フレーム数")
+    fps: int = Field(..., description="フレームレート")
+    resolution: List[int] = Field(..., description="解像度 [幅, 高さ]")
+    duration_source: Literal["cached", "estimated", "mixed"] = Field(
+        ..., description="長さの出どころ"
+    )
+    lines: List[RenderEstimateLine] = Field(..., description="セリフごとの長さ")
+    sections: List[RenderEstimateSection] = Field(
+        ..., description="セクションクリップの状況（セクション単位で描画しない場合は空）"
+    )
+    closing: Optional[Dict[str, Any]] = Field(
+        None, description="締めくくりクリップ（duration, cached）。本編に含めて描画する場合はNone"
+    )
+    cache: Dict[str, Any] = Field(..., description="利用できるキャッシュの件数")
+    assets: List[RenderEstimateAsset] = Field(..., description="必要なアセット")
+    missing_assets: List[RenderEstimateAsset] = Field(..., description="存在しないアセット")
+    estimate: RenderEstimateTime = Field(..., description="所要時間の見積もり")
+    elapsed_ms: float = Field(..., description="見積もりにかかった時間（ミリ秒）")
@@ -1,86 +1,72 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from celery.result import AsyncResult
 import asyncio
 import logging
 import json
+import time
+from typing import Any, Dict, Iterable, Set
 
-from app.tasks.celery_app import celery_app
+from app.api.progress_broker import progress_broker
+from app.api.task_status import (
+    fetch_status_snapshot,
+    is_terminal_payload,
+    task_status_service,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+# pub/sub のイベントが途絶えた場合（ワーカー停止など）に状態を再確認する間隔（秒）
+SNAPSHOT_REFRESH_SECONDS = 15.0
+
+# 多重化接続で差分をまとめて送る間隔（秒）
+MULTIPLEX_BATCH_SECONDS = 0.1
+
+# 多重化接続1本あたりの最大購読タスク数
+MULTIPLEX_MAX_TASKS = 200
+
+# 多重化接続の受信キューの大きさ（複数タスクのイベントを1つのキューで受ける）
+MULTIPLEX_QUEUE_SIZE = 1000
+
+
 @router.websocket("/progress/{task_id}")
 async def websocket_progress(websocket: WebSocket, task_id: str):
     """
     タスクの進捗をWebSocketでリアルタイム配信
 
+    ワーカーが配信する進捗イベントを Redis pub/sub 経由で中継する。
+    同じタスクを複数クライアントが監視しても購読は1つに集約される。
+
     Args:
         task_id: Celeryタスクのタスク ID
     """
     await websocket.accept()
     logger.info(f"WebSocket接続確立: task_id={task_id}")
 
+    queue = None
     try:
-        while True:
-            # タスクの状態を取得
-            task = AsyncResult(task_id, app=celery_app)
-
-            # 状態に応じたレスポンスを作成
-            if task.state == "PENDING":
-                response = {
-                    "task_id": task_id,
-                    "status": "pending",
-                    "progress": 0.0,
-                    "message": "タスクは待機中です",
-                }
-            elif task.state == "PROGRESS":
-                info = task.info or {}
-                response = {
-                    "task_id": task_id,
-                    "status": "processing",
-                    "progress": info.get("progress", 0.0),
-                    "message": info.get("message", "処理中..."),
-                }
-            elif task.state == "SUCCESS":
-                result = task.result or {}
-                response = {
-                    "task_id": task_id,
-                    "status": "completed",
-                    "progress": 1.0,
-                    "message": result.get("message", "完了しました"),
-                    "result": result,
-                }
-            elif task.state == "FAILURE":
-                info = task.info or {}
-                response = {
-                    "task_id": task_id,
-                    "status": "failed",
-                    "progress": 0.0,
-                    "message": info.get("message", "タスクが失敗しました"),
-                    "error": str(info.get("error", task.info)),
-                }
-            else:
-                response = {
-                    "task_id": task_id,
-                    "status": task.state.lower(),
-                    "progress": 0.0,
-                    "message": f"状態: {task.state}",
-                }
+        # 取りこぼしを防ぐため、購読を開始してから現在の状態を取得する
+        queue = await progress_broker.subscribe(task_id)
+        response = await fetch_status_snapshot(task_id)
 
+        while True:
             # クライアントに送信
             await websocket.send_json(response)
 
             # タスクが完了または失敗した場合は接続を閉じる
-            if task.state in ["SUCCESS", "FAILURE", "REVOKED"]:
+            if is_terminal_payload(response):
                 logger.info(
-                    f"タスク完了、WebSocket接続を閉じます: task_id={task_id}, state={task.state}"
+                    f"タスク完了、WebSocket接続を閉じます: task_id={task_id}, status={response['status']}"
                 )
                 break
 
-            # 0.5秒待機
-            await asyncio.sleep(0.5)
+            try:
+                response = await asyncio.wait_for(
+                    queue.get(), timeout=SNAPSHOT_REFRESH_SECONDS
+                )
+            except asyncio.TimeoutError:
+                response = await fetch_status_snapshot(task_id)
 
         # 正常終了時は接続を閉じる
         await websocket.close()
@@ -103,6 +89,184 @@ async def websocket_progress(websocket: WebSocket, task_id: str):
             await websocket.close()
         except:
             pass
+    finally:
+        if queue is not None:
+            await progress_broker.unsubscribe(task_id, queue)
+
+
+class _TaskMultiplexer:
+    """1本のWebSocket接続で複数タスクの進捗を購読する"""
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=MULTIPLEX_QUEUE_SIZE)
+        self.task_ids: Set[str] = set()
+        # タスクごとの未送信の最新ステータス
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        # タスクごとに最後に送ったステータス（変化のないイベントは送らない）
+        self._last_sent: Dict[str, Dict[str, Any]] = {}
+        self._last_refresh = time.monotonic()
+
+    async def subscribe(self, task_ids: Iterable[str]) -> None:
+        """タスクを購読し、現在の状態を次のバッチで送る"""
+        new_ids = [
+            task_id for task_id in dict.fromkeys(task_ids)
+            if task_id and task_id not in self.task_ids
+        ]
+        available = MULTIPLEX_MAX_TASKS - len(self.task_ids)
+        if len(new_ids) > available:
+            logger.warning(
+                f"購読タスク数の上限を超えたため一部を無視します: requested={len(new_ids)}, available={available}"
+            )
+            new_ids = new_ids[:max(0, available)]
+        if not new_ids:
+            return
+
+        # 取りこぼしを防ぐため、購読を開始してから現在の状態を取得する
+        for task_id in new_ids:
+            await progress_broker.subscribe(task_id, self.queue)
+            self.task_ids.add(task_id)
+        snapshots = await task_status_service.get_statuses(new_ids)
+        for snapshot in snapshots:
+            self._stage(snapshot)
+
+    async def unsubscribe(self, task_ids: Iterable[str]) -> None:
+        """タスクの購読を解除する"""
+        for task_id in list(task_ids):
+            if task_id not in self.task_ids:
+                continue
+            self.task_ids.discard(task_id)
+            self._pending.pop(task_id, None)
+            self._last_sent.pop(task_id, None)
+            await progress_broker.unsubscribe(task_id, self.queue)
+
+    async def close(self) -> None:
+        """全ての購読を解除する"""
+        await self.unsubscribe(list(self.task_ids))
+
+    def _stage(self, payload: Dict[str, Any]) -> None:
+        """送信待ちに積む（同じタスクは最新の状態で上書きする）"""
+        task_id = payload.get("task_id")
+        if task_id in self.task_ids:
+            self._pending[task_id] = payload
+
+    async def receive_loop(self) -> None:
+        """クライアントからの subscribe / unsubscribe 要求を処理する"""
+        while True:
+            data = await self.websocket.receive_text()
+            try:
+                message = json.loads(data)
+                action = message.get("action")
+                task_ids = message.get("task_ids") or []
+                if not isinstance(task_ids, list):
+                    raise ValueError("task_ids must be a list")
+                task_ids = [str(task_id) for task_id in task_ids]
+            except (ValueError, AttributeError) as e:
+                await self.websocket.send_json(
+                    {"type": "error", "message": f"不正なメッセージです: {e}"}
+                )
+                continue
+
+            if action == "subscribe":
+                await self.subscribe(task_ids)
+            elif action == "unsubscribe":
+                await self.unsubscribe(task_ids)
+            else:
+                await self.websocket.send_json(
+                    {"type": "error", "message": f"不明なアクションです: {action}"}
+                )
+
+    async def send_loop(self) -> None:
+        """受信したイベントを一定間隔でまとめて差分送信する"""
+        while True:
+            try:
+                payload = await asyncio.wait_for(
+                    self.queue.get(), timeout=MULTIPLEX_BATCH_SECONDS
+                )
+                self._stage(payload)
+                # 同じ間隔内に届いたイベントはまとめる
+                while not self.queue.empty():
+                    self._stage(self.queue.get_nowait())
+                await asyncio.sleep(MULTIPLEX_BATCH_SECONDS)
+                while not self.queue.empty():
+                    self._stage(self.queue.get_nowait())
+            except asyncio.TimeoutError:
+                pass
+
+            await self._refresh_if_due()
+            await self._flush()
+
+    async def _refresh_if_due(self) -> None:
+        """pub/sub のイベントが途絶えた場合に備えて定期的に状態を再確認する"""
+        if time.monotonic() - self._last_refresh < SNAPSHOT_REFRESH_SECONDS:
+            return
+        self._last_refresh = time.monotonic()
+        task_ids = list(self.task_ids)
+        if not task_ids:
+            return
+        snapshots = await task_status_service.get_statuses(task_ids)
+        for snapshot in snapshots:
+            self._stage(snapshot)
+
+    async def _flush(self) -> None:
+        """変化のあったタスクの状態を1メッセージで送信する"""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        updates = [
+            payload for task_id, payload in pending.items()
+            if self._last_sent.get(task_id) != payload
+        ]
+        if not updates:
+            return
+
+        await self.websocket.send_json({"type": "progress", "updates": updates})
+
+        finished = []
+        for payload in updates:
+            self._last_sent[payload["task_id"]] = payload
+            if is_terminal_payload(payload):
+                finished.append(payload["task_id"])
+        # 終了したタスクはサーバー側で購読を解除する
+        if finished:
+            await self.unsubscribe(finished)
+
+
+@router.websocket("/tasks")
+async def websocket_tasks(websocket: WebSocket):
+    """
+    複数タスクの進捗を1本のWebSocketで配信
+
+    クライアントは {"action": "subscribe" | "unsubscribe", "task_ids": [...]} を送り、
+    サーバーは変化のあったタスクの状態を {"type": "progress", "updates": [...]} として
+    まとめて送る。終了したタスクは最後の状態を送った後に自動で購読解除される。
+    """
+    await websocket.accept()
+    logger.info("多重化WebSocket接続確立")
+
+    multiplexer = _TaskMultiplexer(websocket)
+    receiver = asyncio.create_task(multiplexer.receive_loop())
+    sender = asyncio.create_task(multiplexer.send_loop())
+    try:
+        done, _ = await asyncio.wait(
+            {receiver, sender}, return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in done:
+            task.result()
+
+    except WebSocketDisconnect:
+        logger.info("多重化WebSocket接続が切断されました")
+    except Exception as e:
+        logger.error(f"多重化WebSocketエラー: {str(e)}", exc_info=True)
+        try:
+            await websocket.close()
+        except:
+            pass
+    finally:
+        for task in (receiver, sender):
+            task.cancel()
+        await asyncio.gather(receiver, sender, return_exceptions=True)
+        await multiplexer.close()
 
 
 @router.websocket("/notifications")
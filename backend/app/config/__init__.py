@@ -5,7 +5,20 @@
 """
 
 # アプリケーション基本設定
-from .app import AppConfig, SubtitleConfig, Paths, APP_CONFIG, SUBTITLE_CONFIG
+from .app import (
+    AppConfig,
+    SubtitleConfig,
+    WorkerConfig,
+    RenderProfile,
+    Rendition,
+    Paths,
+    APP_CONFIG,
+    SUBTITLE_CONFIG,
+    WORKER_CONFIG,
+    RENDER_PROFILES,
+    RENDITION_PRESETS,
+    get_render_profile,
+)
 
 # キャラクター + 表情設定
 from .content_config.characters import (
@@ -33,6 +46,9 @@ __all__ = [
     "BackgroundConfig",
     "SubtitleConfig",
     "UIConfig",
+    "WorkerConfig",
+    "RenderProfile",
+    "Rendition",
     # データクラス
     "Characters",
     "Expressions",
@@ -43,4 +59,8 @@ __all__ = [
     "APP_CONFIG",
     "SUBTITLE_CONFIG",
     "UI_CONFIG",
+    "WORKER_CONFIG",
+    "RENDER_PROFILES",
+    "RENDITION_PRESETS",
+    "get_render_profile",
 ]
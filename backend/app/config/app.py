@@ -1,5 +1,5 @@
-from typing import Tuple
-from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from dataclasses import dataclass, field, replace
 import os
 from pathlib import Path
 
@@ -41,6 +41,136 @@ class SubtitleConfig:
     max_chars_per_line: int = 25
     border_radius: int = 18
 
+    def scaled(self, factor: float, outline_width: Optional[int] = None) -> "SubtitleConfig":
+        """解像度に合わせてサイズ類を拡大縮小した設定を返す"""
+        if factor == 1.0 and outline_width is None:
+            return self
+
+        def scale(value: int) -> int:
+            return max(1, round(value * factor))
+
+        return replace(
+            self,
+            font_size=scale(self.font_size),
+            outline_width=(
+                outline_width if outline_width is not None else scale(self.outline_width)
+            ),
+            border_width=scale(self.border_width),
+            padding_x=scale(self.padding_x),
+            padding_top=scale(self.padding_top),
+            padding_bottom=scale(self.padding_bottom),
+            margin_bottom=scale(self.margin_bottom),
+            border_radius=scale(self.border_radius),
+        )
+
+
+@dataclass(frozen=True)
+class RenderProfile:
+    """描画・エンコードのプロファイル
+
+    preview はタイミングや表情の確認用で、低解像度・低フレームレート・高速エンコードで描画する。
+    """
+
+    name: str
+    fps: int
+    resolution: Tuple[int, int]
+    crf: int = 18
+    preset: str = "medium"
+    # 字幕のサイズ倍率（解像度に合わせる）
+    subtitle_scale: float = 1.0
+    # 字幕の縁取り幅（None は倍率どおり）。縁取りは1ピクセルごとに文字を描画し直すため重い
+    subtitle_outline_width: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class Rendition:
+    """最終動画と同時に書き出す追加出力（アップロード用・確認用プロキシなど）
+
+    幅は縦横比を保って height から決める。video_bitrate を指定した場合は
+    crf の代わりにビットレート指定でエンコードする。
+    """
+
+    name: str
+    height: int
+    crf: Optional[int] = None
+    video_bitrate: Optional[str] = None
+    # mp4 / mkv は H.264 + AAC、webm は VP9 + Opus
+    container: str = "mp4"
+
+
+@dataclass
+class WorkerConfig:
+    """Celeryワーカー・動画生成パイプライン設定
+
+    pipeline_mode:
+        "single" は1タスクで音声生成〜エンコードまで実行する。
+        "staged" は voice / render / encode の各キューに分割したチェーンで実行する
+        （各キューを処理するワーカーが起動している必要がある）。
+    """
+
+    pipeline_mode: str = field(
+        default_factory=lambda: os.getenv("VIDEO_PIPELINE_MODE", "single")
+    )
+    default_queue: str = "celery"
+    voice_queue: str = "voice"
+    render_queue: str = "render"
+    encode_queue: str = "encode"
+    # 台本生成（LLM呼び出し）タスクのキュー
+    llm_queue: str = "llm"
+    voice_parallelism: int = field(
+        default_factory=lambda: int(os.getenv("VOICE_SYNTHESIS_PARALLELISM", "2"))
+    )
+    # ワーカー子プロセス起動時に動画生成リソースを事前読み込みするか
+    warm_up: bool = field(
+        default_factory=lambda: os.getenv("WORKER_WARM_UP", "1") not in ("0", "false", "False")
+    )
+
+    # 締めくくりなどの固定セクションを事前レンダリング済みクリップとして連結するか
+    template_clip_cache: bool = field(
+        default_factory=lambda: os.getenv("TEMPLATE_CLIP_CACHE", "1") not in ("0", "false", "False")
+    )
+    # 保持するテンプレートクリップの最大数（設定違いのクリップを含む）
+    template_clip_cache_max: int = field(
+        default_factory=lambda: int(os.getenv("TEMPLATE_CLIP_CACHE_MAX", "8"))
+    )
+
+    # セクション単位でクリップをキャッシュし、変更のあったセクションのみ描画するか
+    # （単一タスク・ステージ分割チェーンの両方。追加出力・逐次出力のジョブは対象外）
+    section_render_cache: bool = field(
+        default_factory=lambda: os.getenv("SECTION_RENDER_CACHE", "1") not in ("0", "false", "False")
+    )
+    section_clip_cache_max: int = field(
+        default_factory=lambda: int(os.getenv("SECTION_CLIP_CACHE_MAX", "200"))
+    )
+    line_audio_cache_max: int = field(
+        default_factory=lambda: int(os.getenv("LINE_AUDIO_CACHE_MAX", "5000"))
+    )
+
+    # フレーム合成のスレッド数（0 は描画と書き込みを同じスレッドで順に行う）と、
+    # 合成済みフレームを書き込み待ちにできる上限
+    render_threads: int = field(
+        default_factory=lambda: int(os.getenv("RENDER_THREADS", "2"))
+    )
+    render_queue_depth: int = field(
+        default_factory=lambda: int(os.getenv("RENDER_QUEUE_DEPTH", "8"))
+    )
+
+    # 逐次出力（HLS）のセグメント長（秒）と、outputs/previews に残す完了済みプレビューの数
+    hls_segment_seconds: float = field(
+        default_factory=lambda: float(os.getenv("HLS_SEGMENT_SECONDS", "2"))
+    )
+    preview_keep: int = field(
+        default_factory=lambda: int(os.getenv("PREVIEW_KEEP", "10"))
+    )
+    # 描画が完了しないまま放置されたプレビューを削除するまでの時間
+    preview_max_age_hours: float = field(
+        default_factory=lambda: float(os.getenv("PREVIEW_MAX_AGE_HOURS", "24"))
+    )
+
+    @property
+    def is_staged(self) -> bool:
+        return self.pipeline_mode == "staged"
+
 
 class Paths:
     """パス設定"""
@@ -80,11 +210,31 @@ class Paths:
         """一時ファイルディレクトリを取得"""
         return os.path.join(Paths.get_project_root(), "temp")
 
+    @staticmethod
+    def get_jobs_dir() -> str:
+        """ジョブ単位の作業ディレクトリの親ディレクトリを取得"""
+        return os.path.join(Paths.get_temp_dir(), "jobs")
+
+    @staticmethod
+    def get_template_clips_dir() -> str:
+        """事前レンダリングしたテンプレートクリップのキャッシュディレクトリを取得"""
+        return os.path.join(Paths.get_temp_dir(), "template_clips")
+
+    @staticmethod
+    def get_section_clips_dir() -> str:
+        """セクション単位のレンダリング成果物のキャッシュディレクトリを取得"""
+        return os.path.join(Paths.get_temp_dir(), "section_clips")
+
     @staticmethod
     def get_outputs_dir() -> str:
         """出力ディレクトリを取得"""
         return os.path.join(Paths.get_project_root(), "outputs")
 
+    @staticmethod
+    def get_previews_dir() -> str:
+        """描画中の逐次出力（HLS）のディレクトリを取得"""
+        return os.path.join(Paths.get_outputs_dir(), "previews")
+
     @staticmethod
     def get_fonts_dir() -> str:
         """フォントディレクトリを取得"""
@@ -105,6 +255,38 @@ class Paths:
 # グローバル設定インスタンス
 APP_CONFIG = AppConfig()
 SUBTITLE_CONFIG = SubtitleConfig()
+WORKER_CONFIG = WorkerConfig()
+
+DEFAULT_RENDER_PROFILE = "default"
+RENDER_PROFILES: Dict[str, RenderProfile] = {
+    "default": RenderProfile(
+        name="default",
+        fps=APP_CONFIG.fps,
+        resolution=APP_CONFIG.resolution,
+    ),
+    "preview": RenderProfile(
+        name="preview",
+        fps=int(os.getenv("PREVIEW_FPS", "12")),
+        resolution=(640, 360),
+        crf=30,
+        preset="ultrafast",
+        subtitle_scale=0.5,
+        subtitle_outline_width=1,
+    ),
+}
+
+
+# よく使うレンディション
+RENDITION_PRESETS: Dict[str, Rendition] = {
+    "720p": Rendition(name="720p", height=720, crf=23),
+    "480p": Rendition(name="480p", height=480, crf=26),
+    "360p": Rendition(name="360p", height=360, crf=28),
+}
+
+
+def get_render_profile(name: Optional[str] = None) -> RenderProfile:
+    """名前から描画プロファイルを取得（未指定・不明な名前はデフォルト）"""
+    return RENDER_PROFILES.get(name or DEFAULT_RENDER_PROFILE, RENDER_PROFILES[DEFAULT_RENDER_PROFILE])
 
 
 PROMPTS_DIR = Path("app/prompts")
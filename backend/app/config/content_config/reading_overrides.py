@@ -0,0 +1,46 @@
+"""
+読み上げ用テキスト（ひらがな）生成の上書き辞書
+
+pykakasi が誤読しやすい固有名詞・ネットスラング・英字略語の読みを指定する。
+キーは台本上の表記、値はひらがなの読み。長いキーから順に置換される。
+"""
+
+from typing import Dict
+
+READING_OVERRIDES: Dict[str, str] = {
+    # キャラクター・作品名
+    "ずんだもん": "ずんだもん",
+    "四国めたん": "しこくめたん",
+    "春日部つむぎ": "かすかべつむぎ",
+    "めたん": "めたん",
+    "つむぎ": "つむぎ",
+    "VOICEVOX": "ぼいすぼっくす",
+    # サービス・英字略語
+    "YouTube": "ゆーちゅーぶ",
+    "ユーチューブ": "ゆーちゅーぶ",
+    "SNS": "えすえぬえす",
+    "AI": "えーあい",
+    "OK": "おーけー",
+    "NG": "えぬじー",
+    "www": "わらわら",
+    "ｗｗｗ": "わらわら",
+    # ネットスラング・口語
+    "草": "くさ",
+    "何言うてんの": "なにいうてんの",
+    "何で": "なんで",
+    "何か": "なにか",
+    "今日": "きょう",
+    "明日": "あした",
+    "一人": "ひとり",
+    "二人": "ふたり",
+    "大人": "おとな",
+}
+
+# 読み上げ用テキストに残す記号の正規化（半角 → 全角、三点リーダ → 読点）
+PUNCTUATION_NORMALIZATION: Dict[str, str] = {
+    "...": "、",
+    "…": "、",
+    "?": "？",
+    "!": "！",
+    ",": "、",
+}
@@ -2,7 +2,8 @@ import requests
 import json
 import os
 import logging
-from typing import Dict, Any, Optional, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Iterator, Tuple
 from app.config import Characters
 
 logger = logging.getLogger(__name__)
@@ -124,6 +125,136 @@ class VoiceGenerator:
             logger.error(f"Failed to save audio file: {e}")
             return None
 
+    def _resolve_voice_params(
+        self,
+        conv: Dict,
+        speed: Optional[float],
+        pitch: Optional[float],
+        intonation: Optional[float],
+    ) -> Tuple[float, float, float]:
+        """セリフごとの音声パラメータを決定
+
+        優先順位: 表情ベース > キャラデフォルト > グローバル
+        """
+        speaker = conv.get("speaker", "zundamon")
+
+        # キャラクター設定を取得
+        characters = Characters.get_all()
+        char_config = characters.get(speaker)
+
+        # 表情を取得（デフォルトはnormal）
+        expression = conv.get("expression", "normal")
+
+        if char_config and expression in char_config.expression_voice_map:
+            voice = char_config.expression_voice_map[expression]
+            return voice.speed, voice.pitch, voice.intonation
+
+        if char_config:
+            return (
+                char_config.default_speed,
+                char_config.default_pitch,
+                char_config.default_intonation,
+            )
+
+        return (
+            speed if speed is not None else 1.0,
+            pitch if pitch is not None else 0.0,
+            intonation if intonation is not None else 1.0,
+        )
+
+    def _generate_conversation_line(
+        self,
+        index: int,
+        conv: Dict,
+        speed: Optional[float],
+        pitch: Optional[float],
+        intonation: Optional[float],
+        output_dir: str,
+    ) -> Optional[str]:
+        """会話の1セリフ分の音声を生成"""
+        speaker = conv.get("speaker", "zundamon")
+        # VOICEVOX用のひらがなテキストを優先、なければ通常のテキストを使用
+        text = conv.get("text_for_voicevox", conv.get("text", "")).strip()
+
+        if not text:
+            return None
+
+        final_speed, final_pitch, final_intonation = self._resolve_voice_params(
+            conv, speed, pitch, intonation
+        )
+
+        # 出力ファイル名（会話順序を含む）
+        audio_path = os.path.join(output_dir, f"conv_{index:03d}_{speaker}.wav")
+
+        generated_path = self.generate_voice(
+            text=text,
+            speed=final_speed,
+            pitch=final_pitch,
+            intonation=final_intonation,
+            output_path=audio_path,
+            speaker=speaker,
+        )
+
+        if generated_path:
+            logger.info(
+                f"Generated conversation voice {index}: {speaker} - {generated_path}"
+            )
+        else:
+            logger.warning(
+                f"Failed to generate voice for conversation {index}: {speaker}"
+            )
+        return generated_path
+
+    def stream_conversation_voices(
+        self,
+        conversations: List[Dict],
+        speed: float = None,
+        pitch: float = None,
+        intonation: float = None,
+        output_dir: str = None,
+        max_workers: int = 2,
+    ) -> Iterator[Tuple[int, Optional[str]]]:
+        """会話音声を先行生成しつつ、会話順に1セリフずつ返す
+
+        後段（音声解析・フレーム描画）は最初のセリフが揃った時点で開始できる。
+
+        Args:
+            conversations: List of conversation items with keys: 'speaker', 'text'
+            speed, pitch, intonation: Global voice parameters (None = use character defaults)
+            output_dir: Output directory for audio files
+            max_workers: VOICEVOXへの同時リクエスト数
+
+        Yields:
+            (会話インデックス, 音声ファイルパス)。空テキストや生成失敗時はパスがNone
+        """
+        if not output_dir:
+            output_dir = "/app/temp"
+
+        os.makedirs(output_dir, exist_ok=True)
+
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="voicevox"
+        )
+        futures = [
+            executor.submit(
+                self._generate_conversation_line,
+                i,
+                conv,
+                speed,
+                pitch,
+                intonation,
+                output_dir,
+            )
+            for i, conv in enumerate(conversations)
+        ]
+
+        try:
+            for i, future in enumerate(futures):
+                yield i, future.result()
+        finally:
+            # 途中で中断された場合は未着手のリクエストを破棄する
+            executor.shutdown(wait=True, cancel_futures=True)
+
     def generate_conversation_voices(
         self,
         conversations: List[Dict],
@@ -151,68 +282,10 @@ class VoiceGenerator:
 
         # 会話順序に従って各セリフの音声を生成
         for i, conv in enumerate(conversations):
-            speaker = conv.get("speaker", "zundamon")
-            # VOICEVOX用のひらがなテキストを優先、なければ通常のテキストを使用
-            text = conv.get("text_for_voicevox", conv.get("text", "")).strip()
-
-            if not text:
-                continue
-
-            # キャラクター設定を取得
-            characters = Characters.get_all()
-            char_config = characters.get(speaker)
-
-            # 表情を取得（デフォルトはnormal）
-            expression = conv.get("expression", "normal")
-
-            # 音声パラメータを決定（優先順位: 表情ベース > キャラデフォルト > グローバル）
-            # Speed
-            if char_config and expression in char_config.expression_voice_map:
-                final_speed = char_config.expression_voice_map[expression].speed
-            elif char_config:
-                final_speed = char_config.default_speed
-            else:
-                final_speed = speed if speed is not None else 1.0
-
-            # Pitch
-            if char_config and expression in char_config.expression_voice_map:
-                final_pitch = char_config.expression_voice_map[expression].pitch
-            elif char_config:
-                final_pitch = char_config.default_pitch
-            else:
-                final_pitch = pitch if pitch is not None else 0.0
-
-            # Intonation
-            if char_config and expression in char_config.expression_voice_map:
-                final_intonation = char_config.expression_voice_map[expression].intonation
-            elif char_config:
-                final_intonation = char_config.default_intonation
-            else:
-                final_intonation = intonation if intonation is not None else 1.0
-
-            # 出力ファイル名（会話順序を含む）
-            audio_filename = f"conv_{i:03d}_{speaker}.wav"
-            audio_path = os.path.join(output_dir, audio_filename)
-
-            # 音声生成
-            generated_path = self.generate_voice(
-                text=text,
-                speed=final_speed,
-                pitch=final_pitch,
-                intonation=final_intonation,
-                output_path=audio_path,
-                speaker=speaker,
+            generated_path = self._generate_conversation_line(
+                i, conv, speed, pitch, intonation, output_dir
             )
-
             if generated_path:
                 audio_paths.append(generated_path)
-                logger.info(
-                    f"Generated conversation voice {i}: {speaker} - {generated_path}"
-                )
-            else:
-                logger.warning(
-                    f"Failed to generate voice for conversation {i}: {speaker}"
-                )
 
         return audio_paths
-
@@ -1,7 +1,8 @@
 import logging
+import threading
 from typing import List, Dict
 
-from app.config import APP_CONFIG, SUBTITLE_CONFIG, Characters
+from app.config import SUBTITLE_CONFIG, Characters, RenderProfile, get_render_profile
 
 from .video_processor_image_loader import ImageLoaderMixin
 from .video_processor_compositor import CompositorMixin
@@ -12,14 +13,18 @@ logger = logging.getLogger(__name__)
 
 
 class VideoProcessor(ImageLoaderMixin, CompositorMixin, SubtitleMixin, AnimationMixin):
-    def __init__(self):
-        self.fps = APP_CONFIG.fps
-        self.resolution = APP_CONFIG.resolution
+    def __init__(self, profile: RenderProfile = None):
+        self.profile = profile or get_render_profile()
+        self.fps = self.profile.fps
+        self.resolution = self.profile.resolution
         self.characters = Characters.get_all()
-        self.subtitle_config = SUBTITLE_CONFIG
+        self.subtitle_config = SUBTITLE_CONFIG.scaled(
+            self.profile.subtitle_scale, self.profile.subtitle_outline_width
+        )
 
         self._cached_font = None
         self._resize_cache = {}
+        self._resize_lock = threading.Lock()
         
         # SubtitleMixinで使用するbudouxパーサーを初期化
         from budoux import load_default_japanese_parser
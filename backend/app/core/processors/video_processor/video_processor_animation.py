@@ -2,7 +2,7 @@
 
 import logging
 import random
-from typing import List, Dict
+from typing import List, Dict, Optional
 import numpy as np
 
 logger = logging.getLogger(__name__)
@@ -12,11 +12,18 @@ class AnimationMixin:
     """瞬き・口パクアニメーション機能を提供するMixin"""
 
     def generate_blink_timings(
-        self, total_duration: float, character_name: str = None
+        self,
+        total_duration: float,
+        character_name: str = None,
+        rng: Optional[random.Random] = None,
     ) -> List[Dict]:
-        """瞬きタイミングを生成"""
+        """瞬きタイミングを生成
+
+        rng を指定すると、その乱数生成器だけを使うため同じシードから同じタイミングになる。
+        """
+        rng = rng or random
         blink_times = []
-        current_time = random.uniform(1.0, 3.0)
+        current_time = rng.uniform(1.0, 3.0)
 
         while current_time < total_duration - self.blink_config["duration"]:
             blink_start = current_time
@@ -26,7 +33,7 @@ class AnimationMixin:
                 {"start": blink_start, "end": blink_end, "character": character_name}
             )
 
-            interval = random.uniform(
+            interval = rng.uniform(
                 self.blink_config["min_interval"], self.blink_config["max_interval"]
             )
             current_time += interval
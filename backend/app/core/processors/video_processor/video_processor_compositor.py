@@ -27,16 +27,19 @@ class CompositorMixin:
         mouth_state = self._get_mouth_state(intensity, is_blinking)
         cache_key = (char_name, expression, mouth_state, target_width, target_height)
 
-        if cache_key in self._resize_cache:
-            return self._resize_cache[cache_key]
+        # 合成は複数スレッドから呼ばれるため、キャッシュの更新のみロックする
+        resized_img = self._resize_cache.get(cache_key)
+        if resized_img is not None:
+            return resized_img
 
         resized_img = cv2.resize(original_img, (target_width, target_height))
 
-        if len(self._resize_cache) >= 100:
-            first_key = next(iter(self._resize_cache))
-            del self._resize_cache[first_key]
+        with self._resize_lock:
+            if len(self._resize_cache) >= 100:
+                first_key = next(iter(self._resize_cache))
+                del self._resize_cache[first_key]
 
-        self._resize_cache[cache_key] = resized_img
+            self._resize_cache[cache_key] = resized_img
 
         return resized_img
 
@@ -45,15 +48,16 @@ class CompositorMixin:
         background: np.ndarray,
         character: np.ndarray,
         position: Tuple[int, int] = None,
+        in_place: bool = False,
     ) -> np.ndarray:
-        """キャラクターを背景に合成"""
+        """キャラクターを背景に合成（in_place=True なら background に直接書き込む）"""
         if position is None:
             bg_h, bg_w = background.shape[:2]
             char_h, char_w = character.shape[:2]
             position = ((bg_w - char_w) // 2, (bg_h - char_h) // 2)
 
         x, y = position
-        result = background.copy()
+        result = background if in_place else background.copy()
 
         if character.shape[2] == 4:
             char_rgb = character[:, :, :3]
@@ -113,9 +117,17 @@ class CompositorMixin:
         conversation_mode: str = "duo",
         current_time: float = 0.0,
         blink_timings: List[Dict] = None,
+        out: Optional[np.ndarray] = None,
     ) -> np.ndarray:
-        """会話用のフレーム合成（表情対応）"""
-        result = background.copy()
+        """会話用のフレーム合成（表情対応）
+
+        out を指定した場合は新たに配列を確保せず、out に合成して返す。
+        """
+        if out is not None:
+            np.copyto(out, background)
+            result = out
+        else:
+            result = background.copy()
 
         # デバッグ: active_speakers の内容をログ出力（サンプリング）
         if not hasattr(self, "_composite_call_count"):
@@ -217,7 +229,7 @@ class CompositorMixin:
             x = max(-target_width // 3, min(x, bg_w - target_width // 3 * 2))
             y = max(margin, min(y, bg_h - target_height - margin))
 
-            result = self.composite_frame(result, mouth_img, (x, y))
+            result = self.composite_frame(result, mouth_img, (x, y), in_place=True)
 
         return result
 
@@ -230,6 +242,7 @@ class CompositorMixin:
         current_time: float = 0.0,
         blink_timings: List[Dict] = None,
         item_image: Optional[np.ndarray] = None,
+        out: Optional[np.ndarray] = None,
     ) -> np.ndarray:
         """会話用のフレーム合成（アイテム画像表示対応版）
 
@@ -241,6 +254,7 @@ class CompositorMixin:
             current_time: 現在時刻
             blink_timings: 瞬きタイミング
             item_image: 教育アイテム画像（None の場合は表示しない）
+            out: 合成先のバッファ（背景と同じ形状）。None の場合は新たに確保する
 
         Returns:
             合成されたフレーム
@@ -253,6 +267,7 @@ class CompositorMixin:
             conversation_mode,
             current_time,
             blink_timings,
+            out=out,
         )
 
         # アイテム画像がある場合は右側中央に配置
@@ -1,7 +1,10 @@
 """お笑いモード専用の台本生成ロジック"""
 
 import json
+import os
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Callable, Tuple
 
@@ -15,15 +18,22 @@ from app.models.script_models import (
     ComedyOutline,
     ComedyScript,
     YouTubeMetadata,
+    VideoSection,
 )
 from app.core.script_generators.generic_section_generator import GenericSectionGenerator
 from app.core.script_generators.section_context import SectionContext
 from .comedy_mood_generator import ComedyMoodGenerator
 from .comedy_title_generator import ComedyTitleGenerator
+from .comedy_section_reconciler import ComedySectionReconciler
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# セクションを並列生成するか（アウトラインから全セクションを同時に生成し、境界を整合調整する）
+PARALLEL_SECTIONS_DEFAULT = os.getenv("SCRIPT_PARALLEL_SECTIONS", "0") in ("1", "true", "True")
+# 並列生成時の同時LLM呼び出し数
+PARALLEL_SECTIONS_MAX_WORKERS = int(os.getenv("SCRIPT_PARALLEL_SECTIONS_WORKERS", "6"))
+
 
 class ComedyScriptGenerator:
     """お笑いモード専用生成ロジック"""
@@ -144,6 +154,7 @@ class ComedyScriptGenerator:
         outline: ComedyOutline,
         llm: Any,
         progress_callback: Optional[Callable[[str, float], None]] = None,
+        parallel: Optional[bool] = None,
     ) -> ComedyScript:
         """アウトラインから詳細台本を生成
 
@@ -151,129 +162,42 @@ class ComedyScriptGenerator:
             outline: 生成されたアウトライン
             llm: LLMインスタンス
             progress_callback: 進捗通知用コールバック関数(message, progress)
+            parallel: セクションを並列生成するか（Noneの場合は環境変数 SCRIPT_PARALLEL_SECTIONS）
 
         Returns:
             ComedyScript: 生成された台本
         """
         logger.info(f"お笑いモード 台本生成開始: {outline.theme}")
 
+        if parallel is None:
+            parallel = PARALLEL_SECTIONS_DEFAULT
+
         try:
             if progress_callback:
                 progress_callback("🎬 各セクションの詳細を生成中...", 0.0)
 
             generator = GenericSectionGenerator(ScriptMode.COMEDY)
-            sections = []
-            previous_sections_summary = []
-
-            # 機嫌レベルを辞書形式に変換
-            character_moods_dict = {
-                "zundamon": outline.character_moods.zundamon,
-                "metan": outline.character_moods.metan,
-                "tsumugi": outline.character_moods.tsumugi,
-            }
-
-            # 各セクションを生成
-            for i, section_def in enumerate(outline.sections):
-                is_final = i == len(outline.sections) - 1
-
-                if progress_callback:
-                    progress_callback(
-                        f"📝 セクション {i+1}/{len(outline.sections)}: {section_def.section_name} を生成中... "
-                        f"({section_def.min_lines}-{section_def.max_lines}セリフ)",
-                        (i / len(outline.sections)),
-                    )
-
-                # コンテキスト構築
-                context = SectionContext(
-                    mode=ScriptMode.COMEDY,
-                    section_definition=section_def,
-                    story_summary=outline.story_summary,
-                    reference_information="",  # お笑いモードでは参照情報不要
-                    previous_sections=previous_sections_summary,
-                    character_moods=character_moods_dict,
-                    forced_ending_type=outline.ending_type,
-                    is_final_section=is_final,
+            if parallel:
+                sections = self._generate_sections_parallel(
+                    outline, llm, generator, progress_callback
+                )
+            else:
+                sections = self._generate_sections_sequential(
+                    outline, llm, generator, progress_callback
                 )
-
-                try:
-                    section = generator.generate(context, llm)
-                    sections.append(section)
-
-                    # 次のセクション用の要約を作成
-                    section_summary = {
-                        "section_name": section.section_name,
-                        "segment_count": len(section.segments),
-                        "last_speaker": (
-                            section.segments[-1].speaker if section.segments else ""
-                        ),
-                        "last_text": (
-                            section.segments[-1].text if section.segments else ""
-                        ),
-                        "summary": generator.summarize_section(section),
-                    }
-                    previous_sections_summary.append(section_summary)
-
-                    if progress_callback:
-                        progress_callback(
-                            f"✅ {section_def.section_name} 完了 ({len(section.segments)}セリフ)",
-                            ((i + 1) / len(outline.sections)),
-                        )
-
-                    logger.info(
-                        f"セクション {i+1}/{len(outline.sections)} 完了: "
-                        f"{section_def.section_name} - {len(section.segments)}セリフ"
-                    )
-
-                except Exception as e:
-                    logger.error(
-                        f"セクション生成エラー ({section_def.section_name}): {str(e)}",
-                        exc_info=True,
-                    )
-                    raise
 
             # 品質チェック
             if progress_callback:
                 progress_callback("🔍 品質チェック中...", 0.95)
 
-            all_segments = []
-            for section in sections:
-                all_segments.extend(section.segments)
-
-            total_segments = len(all_segments)
-            logger.info(f"全セグメント数: {total_segments}")
-
-            if total_segments < 60:
-                logger.warning(f"セリフ数が少なめ: {total_segments}/60")
-            elif total_segments > 120:
-                logger.warning(f"セリフ数が多め: {total_segments}/120")
-            else:
-                logger.info(f"セリフ数が適正範囲: {total_segments}")
-
-            # 推定時間計算
-            estimated_duration_sec = total_segments * 4
-            estimated_duration = (
-                f"{estimated_duration_sec // 60}分{estimated_duration_sec % 60}秒"
-            )
-
-            # 台本作成
-            script = ComedyScript(
-                title=outline.title,
-                mode=ScriptMode.COMEDY,
-                theme=outline.theme,
-                estimated_duration=estimated_duration,
-                character_moods=outline.character_moods,
-                sections=sections,
-                all_segments=all_segments,
-                ending_type=outline.ending_type,
-                youtube_metadata=outline.youtube_metadata,
-            )
+            script = self._build_script(outline, sections)
 
             if progress_callback:
                 progress_callback("🎉 台本生成完了！", 1.0)
 
             logger.info(
-                f"台本生成成功: {total_segments}セリフ, "
-                f"推定時間: {estimated_duration}, "
+                f"台本生成成功: {len(script.all_segments)}セリフ, "
+                f"推定時間: {script.estimated_duration}, "
                 f"オチ: {outline.ending_type}"
             )
 
@@ -284,6 +208,243 @@ class ComedyScriptGenerator:
             logger.error(error_msg, exc_info=True)
             raise
 
+    @staticmethod
+    def _character_moods_dict(outline: ComedyOutline) -> Dict[str, int]:
+        """機嫌レベルを辞書形式に変換"""
+        return {
+            "zundamon": outline.character_moods.zundamon,
+            "metan": outline.character_moods.metan,
+            "tsumugi": outline.character_moods.tsumugi,
+        }
+
+    def _build_section_context(
+        self,
+        outline: ComedyOutline,
+        index: int,
+        previous_sections: List[Dict[str, Any]],
+        speculative: bool = False,
+    ) -> SectionContext:
+        """セクション生成用のコンテキストを構築
+
+        speculative=True の場合は前のセクションの内容の代わりに前後のセクション定義を渡す。
+        """
+        adjacent_sections = None
+        if speculative:
+            adjacent_sections = {
+                "previous": outline.sections[index - 1] if index > 0 else None,
+                "next": (
+                    outline.sections[index + 1]
+                    if index + 1 < len(outline.sections)
+                    else None
+                ),
+            }
+
+        return SectionContext(
+            mode=ScriptMode.COMEDY,
+            section_definition=outline.sections[index],
+            story_summary=outline.story_summary,
+            reference_information="",  # お笑いモードでは参照情報不要
+            previous_sections=previous_sections,
+            character_moods=self._character_moods_dict(outline),
+            forced_ending_type=outline.ending_type,
+            is_final_section=index == len(outline.sections) - 1,
+            adjacent_sections=adjacent_sections,
+        )
+
+    @staticmethod
+    def _summarize_for_next(
+        generator: GenericSectionGenerator, section: VideoSection
+    ) -> Dict[str, Any]:
+        """次のセクション用の要約を作成"""
+        return {
+            "section_name": section.section_name,
+            "segment_count": len(section.segments),
+            "last_speaker": (section.segments[-1].speaker if section.segments else ""),
+            "last_text": (section.segments[-1].text if section.segments else ""),
+            "summary": generator.summarize_section(section),
+        }
+
+    def _generate_sections_sequential(
+        self,
+        outline: ComedyOutline,
+        llm: Any,
+        generator: GenericSectionGenerator,
+        progress_callback: Optional[Callable[[str, float], None]] = None,
+    ) -> List[VideoSection]:
+        """前のセクションの要約を引き継ぎながら1つずつ生成"""
+        sections = []
+        previous_sections_summary = []
+
+        for i, section_def in enumerate(outline.sections):
+            if progress_callback:
+                progress_callback(
+                    f"📝 セクション {i+1}/{len(outline.sections)}: {section_def.section_name} を生成中... "
+                    f"({section_def.min_lines}-{section_def.max_lines}セリフ)",
+                    (i / len(outline.sections)),
+                )
+
+            context = self._build_section_context(outline, i, previous_sections_summary)
+
+            try:
+                section = generator.generate(context, llm)
+                sections.append(section)
+                previous_sections_summary.append(
+                    self._summarize_for_next(generator, section)
+                )
+
+                if progress_callback:
+                    progress_callback(
+                        f"✅ {section_def.section_name} 完了 ({len(section.segments)}セリフ)",
+                        ((i + 1) / len(outline.sections)),
+                    )
+
+                logger.info(
+                    f"セクション {i+1}/{len(outline.sections)} 完了: "
+                    f"{section_def.section_name} - {len(section.segments)}セリフ"
+                )
+
+            except Exception as e:
+                logger.error(
+                    f"セクション生成エラー ({section_def.section_name}): {str(e)}",
+                    exc_info=True,
+                )
+                raise
+
+        return sections
+
+    def _generate_sections_parallel(
+        self,
+        outline: ComedyOutline,
+        llm: Any,
+        generator: GenericSectionGenerator,
+        progress_callback: Optional[Callable[[str, float], None]] = None,
+    ) -> List[VideoSection]:
+        """全セクションをアウトラインから同時に生成し、境界を整合調整する
+
+        生成に失敗した、またはセリフ数が大きく不足したセクションのみ、
+        確定済みの前セクションの要約を使って逐次生成し直す。
+        """
+        total = len(outline.sections)
+        results: List[Optional[VideoSection]] = [None] * total
+        started_at = time.monotonic()
+
+        if progress_callback:
+            progress_callback(f"📝 {total}セクションを並列生成中...", 0.0)
+
+        max_workers = min(total, PARALLEL_SECTIONS_MAX_WORKERS)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="section") as executor:
+            futures = {
+                executor.submit(
+                    generator.generate,
+                    self._build_section_context(outline, i, [], speculative=True),
+                    llm,
+                ): i
+                for i in range(total)
+            }
+            done = 0
+            for future in as_completed(futures):
+                i = futures[future]
+                section_def = outline.sections[i]
+                done += 1
+                try:
+                    section = future.result()
+                except Exception as e:
+                    logger.warning(f"並列生成に失敗: {section_def.section_name}: {e}")
+                    continue
+                if self._is_acceptable_section(section, section_def):
+                    results[i] = section
+                else:
+                    logger.warning(
+                        f"セリフ数が不足しているため再生成します: {section_def.section_name} "
+                        f"({len(section.segments)}/{section_def.min_lines})"
+                    )
+                if progress_callback:
+                    progress_callback(
+                        f"✅ {section_def.section_name} 完了 ({done}/{total})",
+                        0.8 * done / total,
+                    )
+
+        logger.info(f"並列セクション生成完了: {time.monotonic() - started_at:.1f}秒")
+
+        # 失敗したセクションは確定済みの前セクションを引き継いで逐次生成し直す
+        regenerated = set()
+        for i in range(total):
+            if results[i] is not None:
+                continue
+            section_def = outline.sections[i]
+            if progress_callback:
+                progress_callback(f"🔁 {section_def.section_name} を再生成中...", 0.8)
+            previous = [
+                self._summarize_for_next(generator, section)
+                for section in results[:i]
+                if section is not None
+            ]
+            results[i] = generator.generate(
+                self._build_section_context(outline, i, previous), llm
+            )
+            regenerated.add(i)
+
+        sections: List[VideoSection] = results
+        boundaries = [i for i in range(1, total) if i not in regenerated]
+        if boundaries:
+            if progress_callback:
+                progress_callback("🧵 セクション間のつながりを調整中...", 0.9)
+            try:
+                applied = ComedySectionReconciler().reconcile(
+                    outline, sections, boundaries, llm
+                )
+                logger.info(f"境界の整合調整完了: {applied}セリフを修正")
+            except Exception as e:
+                # 調整に失敗しても各セクションは有効なため、そのまま使う
+                logger.warning(f"境界の整合調整に失敗しました: {e}")
+
+        logger.info(
+            f"並列台本生成完了: {time.monotonic() - started_at:.1f}秒 "
+            f"(再生成 {len(regenerated)}/{total}セクション)"
+        )
+        return sections
+
+    @staticmethod
+    def _is_acceptable_section(section: VideoSection, section_def: Any) -> bool:
+        """並列生成したセクションをそのまま採用できるか"""
+        return len(section.segments) >= max(1, section_def.min_lines // 2)
+
+    def _build_script(
+        self, outline: ComedyOutline, sections: List[VideoSection]
+    ) -> ComedyScript:
+        """セクションを統合して台本を作成"""
+        all_segments = []
+        for section in sections:
+            all_segments.extend(section.segments)
+
+        total_segments = len(all_segments)
+        logger.info(f"全セグメント数: {total_segments}")
+
+        if total_segments < 60:
+            logger.warning(f"セリフ数が少なめ: {total_segments}/60")
+        elif total_segments > 120:
+            logger.warning(f"セリフ数が多め: {total_segments}/120")
+        else:
+            logger.info(f"セリフ数が適正範囲: {total_segments}")
+
+        # 推定時間計算
+        estimated_duration_sec = total_segments * 4
+        estimated_duration = (
+            f"{estimated_duration_sec // 60}分{estimated_duration_sec % 60}秒"
+        )
+
+        return ComedyScript(
+            title=outline.title,
+            mode=ScriptMode.COMEDY,
+            theme=outline.theme,
+            estimated_duration=estimated_duration,
+            character_moods=outline.character_moods,
+            sections=sections,
+            all_segments=all_segments,
+            ending_type=outline.ending_type,
+            youtube_metadata=outline.youtube_metadata,
+        )
+
     def generate_title_batch(
         self, llm: Any, progress_callback: Optional[Callable[[str], None]] = None
     ):
@@ -304,6 +465,7 @@ class ComedyScriptGenerator:
         title: ComedyTitle,
         llm: Any,
         progress_callback: Optional[Callable[[str], None]] = None,
+        include_metadata: bool = True,
     ) -> Tuple[ComedyOutline, Optional[YouTubeMetadata]]:
         """タイトルから動的セクション構造のアウトラインを生成
 
@@ -311,6 +473,8 @@ class ComedyScriptGenerator:
             title: 生成されたタイトル
             llm: LLMインスタンス
             progress_callback: 進捗通知用コールバック関数
+            include_metadata: YouTubeメタデータも続けて生成するか
+                （False の場合は呼び出し側で generate_youtube_metadata を並行実行する）
 
         Returns:
             ComedyOutline: 生成されたアウトライン
@@ -398,6 +562,9 @@ class ComedyScriptGenerator:
                     f"({section.min_lines}-{section.max_lines}セリフ)"
                 )
 
+            if not include_metadata:
+                return outline, None
+
             # YouTubeメタデータ生成
             youtube_metadata = self.generate_youtube_metadata(
                 title, outline, llm, progress_callback
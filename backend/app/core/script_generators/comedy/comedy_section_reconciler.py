@@ -0,0 +1,126 @@
+"""並列生成したセクション間のつながりを調整する"""
+
+from pathlib import Path
+from typing import Any, List, Sequence
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.output_parsers import PydanticOutputParser
+
+from app.models.script_models import (
+    ComedyOutline,
+    SectionReconciliation,
+    VideoSection,
+)
+from app.core.script_generators.reading_generator import get_reading_generator
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 書き換えを許可する次セクション冒頭のセリフ数
+EDITABLE_OPENING_LINES = 2
+# 境界の前後としてLLMに見せるセリフ数
+BOUNDARY_CONTEXT_LINES = 2
+
+
+class ComedySectionReconciler:
+    """セクション境界の整合調整
+
+    各境界の前後数セリフだけをLLMに渡し、不自然な境界について
+    次セクションの冒頭セリフのみを書き換える（1回の軽量な呼び出しで全境界を処理する）。
+    """
+
+    def __init__(self):
+        self.prompt_file = Path("app/prompts/comedy/long/section_reconciliation.md")
+
+    def reconcile(
+        self,
+        outline: ComedyOutline,
+        sections: List[VideoSection],
+        boundary_indices: Sequence[int],
+        llm: Any,
+    ) -> int:
+        """境界を調整する（sections をその場で書き換える）
+
+        Args:
+            outline: アウトライン
+            sections: 生成済みセクション
+            boundary_indices: 調整対象の境界（i は sections[i-1] と sections[i] の間）
+            llm: LLMインスタンス
+
+        Returns:
+            int: 書き換えたセリフ数
+        """
+        boundary_indices = [i for i in boundary_indices if 0 < i < len(sections)]
+        if not boundary_indices:
+            return 0
+
+        with open(self.prompt_file, "r", encoding="utf-8") as f:
+            prompt_template = f.read().strip()
+
+        parser = PydanticOutputParser(pydantic_object=SectionReconciliation)
+        prompt_text = prompt_template.replace("{story_summary}", outline.story_summary)
+        prompt_text = prompt_text.replace(
+            "{boundaries}", self._format_boundaries(sections, boundary_indices)
+        )
+        prompt_text = prompt_text.replace(
+            "{format_instructions}", parser.get_format_instructions()
+        )
+
+        messages = [
+            SystemMessage(
+                content="あなたは、お笑い台本の編集者です。セクションの切れ目だけを最小限に手直しします。"
+            ),
+            HumanMessage(content=prompt_text),
+        ]
+
+        logger.info(f"セクション境界の整合調整中: {len(boundary_indices)}箇所")
+        result = parser.invoke(llm.invoke(messages))
+        return self._apply(sections, boundary_indices, result)
+
+    @staticmethod
+    def _format_boundaries(
+        sections: List[VideoSection], boundary_indices: Sequence[int]
+    ) -> str:
+        """境界ごとの前後のセリフをテキスト化"""
+        blocks = []
+        for index in boundary_indices:
+            before = sections[index - 1].segments[-BOUNDARY_CONTEXT_LINES:]
+            after = sections[index].segments[:BOUNDARY_CONTEXT_LINES]
+            lines = [
+                f"### 境界: {sections[index - 1].section_name} → {sections[index].section_name}",
+                "前のセクションの最後:",
+            ]
+            lines += [f"- {seg.speaker}: {seg.text}" for seg in before]
+            lines.append(f"次のセクションの冒頭（section_index={index}）:")
+            lines += [
+                f"- segment_index={i} {seg.speaker}: {seg.text}"
+                for i, seg in enumerate(after)
+            ]
+            blocks.append("\n".join(lines))
+        return "\n\n".join(blocks)
+
+    @staticmethod
+    def _apply(
+        sections: List[VideoSection],
+        boundary_indices: Sequence[int],
+        result: SectionReconciliation,
+    ) -> int:
+        """許可された範囲の書き換えのみを反映する"""
+        allowed = set(boundary_indices)
+        applied = 0
+        for fix in result.fixes:
+            if fix.section_index not in allowed or fix.segment_index >= EDITABLE_OPENING_LINES:
+                logger.warning(
+                    f"範囲外の書き換えを無視しました: section={fix.section_index}, segment={fix.segment_index}"
+                )
+                continue
+            segments = sections[fix.section_index].segments
+            if fix.segment_index >= len(segments):
+                continue
+            segment = segments[fix.segment_index]
+            logger.info(f"境界のセリフを調整: {segment.text} -> {fix.text}")
+            segment.text = fix.text
+            # 読み上げ用テキストは書き換え後のセリフからローカルで作り直す
+            segment.text_for_voicevox = get_reading_generator().to_hiragana(fix.text)
+            applied += 1
+        return applied
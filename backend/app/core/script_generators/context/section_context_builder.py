@@ -34,6 +34,17 @@ def build_context_text(context: SectionContext, mode: ScriptMode) -> str:
 話が盛り上がっている最中に終了し、誰も成長せず、何も解決しません。
 """
 
+    if context.adjacent_sections:
+        context_text += """
+## 前後のセクションの予定
+前後のセクションは同時に執筆中です。予定内容を踏まえ、前のセクションから自然につながる入り方と、
+次のセクションへ渡せる終わり方にしてください。
+"""
+        for label, key in (("前のセクション", "previous"), ("次のセクション", "next")):
+            adjacent = context.adjacent_sections.get(key)
+            if adjacent is not None:
+                context_text += f"- {label}: {adjacent.section_name}（{adjacent.content_summary}）\n"
+
     if context.previous_sections:
         context_text += "\n## 前のセクションまでの展開\n"
         for prev in context.previous_sections:
@@ -1,5 +1,7 @@
 """汎用セクションジェネレーター（両モード共通）"""
 
+import os
+import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 from dataclasses import dataclass
@@ -7,7 +9,13 @@ from dataclasses import dataclass
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.output_parsers import PydanticOutputParser
 
-from app.models.script_models import VideoSection, SectionDefinition, ScriptMode
+from app.models.script_models import (
+    VideoSection,
+    VideoSectionDraft,
+    ConversationSegment,
+    SectionDefinition,
+    ScriptMode,
+)
 from app.config.resource_config.bgm_library import (
     get_section_bgm,
     format_bgm_choices_for_prompt,
@@ -16,23 +24,33 @@ from app.config.resource_config.bgm_library import (
 )
 from app.core.script_generators.section_context import SectionContext
 from app.core.script_generators.context.section_context_builder import build_context_text
+from app.core.script_generators.reading_generator import get_reading_generator
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 読み上げ用テキスト（text_for_voicevox）をLLMに出力させるか（既定はローカルで生成）
+LLM_READINGS_DEFAULT = os.getenv("SCRIPT_LLM_READINGS", "0") in ("1", "true", "True")
+
 
 class GenericSectionGenerator:
     """汎用セクション生成クラス（両モード対応）"""
 
-    def __init__(self, mode: ScriptMode):
+    def __init__(self, mode: ScriptMode, llm_readings: Optional[bool] = None):
         """
         Args:
             mode: 生成モード（FOOD or COMEDY）
+            llm_readings: 読み上げ用テキストをLLMに出力させるか
+                （Noneの場合は環境変数 SCRIPT_LLM_READINGS。False ならローカルで生成する）
         """
         self.mode = mode
+        self.llm_readings = LLM_READINGS_DEFAULT if llm_readings is None else llm_readings
         self.section_prompt_file = Path(
             f"app/prompts/{mode.value}/long/section_generation.md"
         )
+        self.voicevox_rules_file = Path(
+            f"app/prompts/{mode.value}/long/section_voicevox_rules.md"
+        )
 
     def load_section_prompt(self) -> str:
         """セクション生成プロンプトを読み込む"""
@@ -70,9 +88,15 @@ class GenericSectionGenerator:
 
         try:
             section_prompt_template = self.load_section_prompt()
+            if self.llm_readings:
+                with open(self.voicevox_rules_file, "r", encoding="utf-8") as f:
+                    section_prompt_template += "\n\n" + f.read().strip()
             context_text = self.build_context_text(context)
 
-            parser = PydanticOutputParser(pydantic_object=VideoSection)
+            # ローカルで読みを生成する場合は text_for_voicevox を含まないスキーマで出力させる
+            parser = PydanticOutputParser(
+                pydantic_object=VideoSection if self.llm_readings else VideoSectionDraft
+            )
             format_instructions = parser.get_format_instructions()
 
             # Comedyモードの場合、BGM選択肢情報を追加
@@ -107,7 +131,9 @@ class GenericSectionGenerator:
             ]
 
             logger.info(f"{context.section_definition.section_name} をLLMで生成中...")
+            llm_started_at = time.monotonic()
             llm_response = llm.invoke(messages)
+            self._log_llm_usage(context, llm_response, time.monotonic() - llm_started_at)
 
             # LLMの応答内のタイポを修正（text_for_voivevox → text_for_voicevox）
             if isinstance(llm_response.content, str):
@@ -120,6 +146,8 @@ class GenericSectionGenerator:
 
             # LLMの応答をパース
             section = parser.invoke(llm_response)
+            if isinstance(section, VideoSectionDraft):
+                section = self.attach_readings(section)
 
             # セグメントのvisible_charactersをチェック・修正
             for i, segment in enumerate(section.segments):
@@ -214,6 +242,32 @@ class GenericSectionGenerator:
             logger.error(error_msg, exc_info=True)
             raise
 
+    def _log_llm_usage(
+        self, context: SectionContext, llm_response: Any, elapsed: float
+    ) -> None:
+        """セクション生成呼び出しの所要時間と出力トークン数を記録する"""
+        usage = getattr(llm_response, "usage_metadata", None) or {}
+        logger.info(
+            f"セクション生成LLM応答: {context.section_definition.section_name} "
+            f"{elapsed:.1f}秒, output_tokens={usage.get('output_tokens', '-')}, "
+            f"readings={'llm' if self.llm_readings else 'local'}"
+        )
+
+    @staticmethod
+    def attach_readings(draft: VideoSectionDraft) -> VideoSection:
+        """LLM出力のセクションに、ローカルで生成した読み上げ用テキストを付与する"""
+        reading_generator = get_reading_generator()
+        segments = [
+            ConversationSegment(
+                **segment.model_dump(),
+                text_for_voicevox=reading_generator.to_hiragana(segment.text),
+            )
+            for segment in draft.segments
+        ]
+        return VideoSection(
+            **draft.model_dump(exclude={"segments"}), segments=segments
+        )
+
     @staticmethod
     def summarize_section(section: VideoSection) -> str:
         """セクションを要約（次のセクションへの引き継ぎ用）"""
@@ -0,0 +1,76 @@
+"""読み上げ用テキスト（ひらがな）の生成
+
+台本のセリフから VOICEVOX 用のひらがなテキストをローカルで生成する。
+上書き辞書で固有名詞やスラングの読みを先に置き換え、残りを pykakasi で変換する。
+LLM にひらがな版のセリフを出力させる必要がなくなるため、セクション生成の出力トークンが減る。
+"""
+
+import re
+import threading
+from typing import Dict, Optional
+
+from app.config.content_config.reading_overrides import (
+    PUNCTUATION_NORMALIZATION,
+    READING_OVERRIDES,
+)
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_WHITESPACE = re.compile(r"[\s　]+")
+
+
+class ReadingGenerator:
+    """セリフをひらがなの読みに変換する"""
+
+    def __init__(self, overrides: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            overrides: 表記 → 読み の上書き辞書（省略時は READING_OVERRIDES）
+        """
+        overrides = READING_OVERRIDES if overrides is None else overrides
+        # 長い表記から順に置換する（「四国めたん」を「めたん」より先に処理する）
+        self.overrides = sorted(overrides.items(), key=lambda item: len(item[0]), reverse=True)
+        self._kakasi = None
+        self._lock = threading.Lock()
+
+    def _get_kakasi(self):
+        """pykakasi の変換器を取得（初回のみ辞書を読み込む）"""
+        if self._kakasi is None:
+            import pykakasi
+
+            self._kakasi = pykakasi.kakasi()
+        return self._kakasi
+
+    def to_hiragana(self, text: str) -> str:
+        """
+        セリフを VOICEVOX 用のひらがなテキストに変換
+
+        空白は除去し、句読点・疑問符などは全角にそろえて残す。
+
+        Args:
+            text: 字幕表示用のセリフ
+
+        Returns:
+            str: ひらがなの読み（変換できない英数字はそのまま残る）
+        """
+        reading = _WHITESPACE.sub("", text)
+        for surface, replacement in PUNCTUATION_NORMALIZATION.items():
+            reading = reading.replace(surface, replacement)
+        for surface, replacement in self.overrides:
+            reading = reading.replace(surface, replacement)
+
+        with self._lock:
+            tokens = self._get_kakasi().convert(reading)
+        return "".join(token["hira"] for token in tokens) or text
+
+
+_reading_generator: Optional[ReadingGenerator] = None
+
+
+def get_reading_generator() -> ReadingGenerator:
+    """プロセス内で共有する ReadingGenerator を取得"""
+    global _reading_generator
+    if _reading_generator is None:
+        _reading_generator = ReadingGenerator()
+    return _reading_generator
@@ -0,0 +1,159 @@
+"""台本生成パイプラインの依存グラフ実行
+
+タイトル → アウトライン → {YouTubeメタデータ, セクション群} のように、
+各ステップ（ノード）を依存関係つきで定義し、依存が揃ったノードから
+上限つきの並列数で実行する。互いに独立したLLM呼び出しが重なって実行されるため、
+全体のレイテンシは最長経路の合計に近づく。
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Sequence
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class PipelineNode:
+    """パイプラインのノード
+
+    func は依存ノードの結果（ノード名 → 結果）を受け取って自分の結果を返す。
+    optional=True のノードは失敗しても結果を None として後続を実行する。
+    """
+
+    name: str
+    func: Callable[[Dict[str, Any]], Any]
+    depends_on: Sequence[str] = field(default_factory=tuple)
+    optional: bool = False
+
+
+@dataclass
+class NodeTiming:
+    """ノードの実行時間"""
+
+    name: str
+    started_at: float
+    finished_at: float
+    status: str  # completed / failed
+
+    @property
+    def duration(self) -> float:
+        return self.finished_at - self.started_at
+
+
+class ScriptPipeline:
+    """依存グラフに沿ってノードを並列実行する"""
+
+    def __init__(self, nodes: Sequence[PipelineNode], max_workers: int = 3):
+        self.nodes = {node.name: node for node in nodes}
+        if len(self.nodes) != len(nodes):
+            raise ValueError("ノード名が重複しています")
+        self.max_workers = max(1, max_workers)
+        self.timings: Dict[str, NodeTiming] = {}
+        self._validate()
+
+    def _validate(self) -> None:
+        """未定義の依存と循環を検出する"""
+        for node in self.nodes.values():
+            for dep in node.depends_on:
+                if dep not in self.nodes:
+                    raise ValueError(f"未定義の依存ノードです: {node.name} -> {dep}")
+
+        visiting, visited = set(), set()
+
+        def visit(name: str) -> None:
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"依存関係が循環しています: {name}")
+            visiting.add(name)
+            for dep in self.nodes[name].depends_on:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.nodes:
+            visit(name)
+
+    def run(self) -> Dict[str, Any]:
+        """全ノードを実行する
+
+        Returns:
+            ノード名 → 結果（失敗した optional ノードは None）
+
+        Raises:
+            必須ノードで発生した例外（未実行のノードは実行しない）
+        """
+        results: Dict[str, Any] = {}
+        pending = dict(self.nodes)
+        running: Dict[Future, str] = {}
+        started_at = time.monotonic()
+
+        executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="pipeline"
+        )
+        try:
+            while pending or running:
+                for name in self._ready(pending, results):
+                    node = pending.pop(name)
+                    inputs = {dep: results[dep] for dep in node.depends_on}
+                    running[executor.submit(self._run_node, node, inputs)] = name
+
+                if not running:
+                    # 依存が解決できないノードが残っている（_validate で防いでいるため通常は起きない）
+                    raise RuntimeError(f"実行できないノードがあります: {list(pending)}")
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        if not self.nodes[name].optional:
+                            raise
+                        logger.warning(f"任意ノードが失敗したため結果なしで続行します: {name}: {e}")
+                        results[name] = None
+        except BaseException:
+            # 実行中の他ノード（任意ノードのLLM呼び出しなど）の完了を待たずに例外を返す
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+
+        logger.info(
+            f"パイプライン完了: {time.monotonic() - started_at:.1f}秒 ("
+            + ", ".join(f"{t.name}={t.duration:.1f}s" for t in self.timings.values())
+            + ")"
+        )
+        return results
+
+    @staticmethod
+    def _ready(pending: Dict[str, PipelineNode], results: Dict[str, Any]) -> List[str]:
+        """依存が全て完了したノード"""
+        return [
+            name
+            for name, node in pending.items()
+            if all(dep in results for dep in node.depends_on)
+        ]
+
+    def _run_node(self, node: PipelineNode, inputs: Dict[str, Any]) -> Any:
+        """ノードを実行して実行時間を記録する"""
+        started = time.monotonic()
+        status = "failed"
+        try:
+            result = node.func(inputs)
+            status = "completed"
+            return result
+        finally:
+            self.timings[node.name] = NodeTiming(
+                name=node.name,
+                started_at=started,
+                finished_at=time.monotonic(),
+                status=status,
+            )
+
+    def timing_summary(self) -> Dict[str, float]:
+        """ノード名 → 実行時間（秒）"""
+        return {name: round(t.duration, 3) for name, t in self.timings.items()}
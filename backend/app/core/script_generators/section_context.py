@@ -19,4 +19,6 @@ class SectionContext:
     character_moods: Optional[Dict[str, int]] = None
     forced_ending_type: Optional[str] = None
     is_final_section: bool = False
+    # 並列生成時: 前後のセクション定義（前のセクションの実際の内容は未確定）
+    adjacent_sections: Optional[Dict[str, SectionDefinition]] = None
 
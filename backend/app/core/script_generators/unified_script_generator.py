@@ -9,8 +9,10 @@ from app.models.script_models import (
 )
 from app.core.script_generators.comedy import ComedyScriptGenerator
 from app.core.script_generators.generate_food_over import create_llm_instance
+from app.core.script_generators.script_pipeline import PipelineNode, ScriptPipeline
 from app.config.models import get_model_config, get_default_model_config
 from app.utils.logger import get_logger
+from app.utils.llm_executor import run_llm_call
 
 logger = get_logger(__name__)
 
@@ -29,6 +31,35 @@ class UnifiedScriptGenerator:
         self.mode = mode
         self.generator = ComedyScriptGenerator()
 
+    def _resolve_llm(
+        self, model: Optional[str], temperature: Optional[float]
+    ) -> Tuple[Any, Dict[str, Any]]:
+        """モデル設定を解決してLLMインスタンスを取得
+
+        Returns:
+            Tuple[LLMインスタンス, モデル設定（model, temperature, model_config）]
+        """
+        if model is None:
+            model_config = get_default_model_config()
+            model = model_config["id"]
+        else:
+            model_config = get_model_config(model)
+
+        if temperature is None:
+            temperature = model_config["default_temperature"]
+
+        # お笑いモードはtemperatureを高めに調整
+        if temperature < 0.8:
+            temperature = 0.8
+            logger.info(f"お笑いモードのためtemperatureを{temperature}に調整")
+
+        llm = create_llm_instance(model, temperature, model_config)
+        return llm, {
+            "model": model,
+            "temperature": temperature,
+            "model_config": model_config,
+        }
+
     def generate_title(
         self,
         input_text: str,
@@ -49,22 +80,7 @@ class UnifiedScriptGenerator:
         """
 
         try:
-            # モデル設定
-            if model is None:
-                model_config = get_default_model_config()
-                model = model_config["id"]
-            else:
-                model_config = get_model_config(model)
-
-            if temperature is None:
-                temperature = model_config["default_temperature"]
-
-            # お笑いモードはtemperatureを高めに調整
-            if temperature < 0.8:
-                temperature = 0.8
-                logger.info(f"お笑いモードのためtemperatureを{temperature}に調整")
-
-            llm = create_llm_instance(model, temperature, model_config)
+            llm, model_info = self._resolve_llm(model, temperature)
 
             # タイトル生成
             title = self.generator.generate_title(input_text, llm, progress_callback)
@@ -72,11 +88,7 @@ class UnifiedScriptGenerator:
             return (
                 title,
                 "",  # 参照情報は不要
-                {
-                    "model": model,
-                    "temperature": temperature,
-                    "model_config": model_config,
-                },
+                model_info,
             )
 
         except Exception as e:
@@ -105,22 +117,7 @@ class UnifiedScriptGenerator:
         """
 
         try:
-            # モデル設定
-            if model is None:
-                model_config = get_default_model_config()
-                model = model_config["id"]
-            else:
-                model_config = get_model_config(model)
-
-            if temperature is None:
-                temperature = model_config["default_temperature"]
-
-            # お笑いモードはtemperatureを高めに調整
-            if temperature < 0.8:
-                temperature = 0.8
-                logger.info(f"お笑いモードのためtemperatureを{temperature}に調整")
-
-            llm = create_llm_instance(model, temperature, model_config)
+            llm, model_info = self._resolve_llm(model, temperature)
 
             # アウトライン生成（メタデータも同時生成）
             outline, youtube_metadata = self.generator.generate_outline(
@@ -130,11 +127,7 @@ class UnifiedScriptGenerator:
             return (
                 outline,
                 youtube_metadata,
-                {
-                    "model": model,
-                    "temperature": temperature,
-                    "model_config": model_config,
-                },
+                model_info,
             )
 
         except Exception as e:
@@ -148,6 +141,7 @@ class UnifiedScriptGenerator:
         model: Optional[str] = None,
         temperature: Optional[float] = None,
         progress_callback: Optional[Callable[[str, float], None]] = None,
+        parallel_sections: Optional[bool] = None,
     ) -> Tuple[ComedyScript, Dict[str, Any]]:
         """台本生成
 
@@ -157,41 +151,139 @@ class UnifiedScriptGenerator:
             model: 使用するモデルID
             temperature: 生成温度
             progress_callback: 進捗通知用コールバック関数
+            parallel_sections: セクションを並列生成するか（Noneの場合は既定値）
 
         Returns:
             Tuple[台本, モデル設定]
         """
 
         try:
-            # モデル設定
-            if model is None:
-                model_config = get_default_model_config()
-                model = model_config["id"]
-            else:
-                model_config = get_model_config(model)
-
-            if temperature is None:
-                temperature = model_config["default_temperature"]
-
-            # お笑いモードはtemperatureを高めに調整
-            if temperature < 0.8:
-                temperature = 0.8
-                logger.info(f"お笑いモードのためtemperatureを{temperature}に調整")
-
-            llm = create_llm_instance(model, temperature, model_config)
+            llm, model_info = self._resolve_llm(model, temperature)
 
             # 台本生成
-            script = self.generator.generate_script(outline_data, llm, progress_callback)
+            script = self.generator.generate_script(
+                outline_data, llm, progress_callback, parallel=parallel_sections
+            )
 
             return (
                 script,
-                {
-                    "model": model,
-                    "temperature": temperature,
-                    "model_config": model_config,
-                },
+                model_info,
             )
 
         except Exception as e:
             logger.error(f"台本生成エラー ({self.mode.value}): {str(e)}", exc_info=True)
             raise
+
+    def generate_full_script(
+        self,
+        input_text: str,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        progress_callback: Optional[Callable[[str, Optional[float]], None]] = None,
+        parallel_sections: Optional[bool] = None,
+        max_workers: int = 3,
+    ) -> Dict[str, Any]:
+        """タイトル → アウトライン → {YouTubeメタデータ, 台本} を依存グラフで生成
+
+        メタデータはアウトラインのみに依存するため、台本（セクション群）の生成と並行して実行する。
+
+        Args:
+            input_text: テーマ
+            model: 使用するモデルID
+            temperature: 生成温度
+            progress_callback: 進捗通知用コールバック関数(message, progress)
+            parallel_sections: セクションを並列生成するか
+            max_workers: 同時に実行するノード数の上限
+
+        Returns:
+            title, outline, youtube_metadata, script, model_info, timings を含む辞書
+        """
+        llm, model_info = self._resolve_llm(model, temperature)
+
+        def notify(message: str, progress: Optional[float] = None) -> None:
+            if progress_callback:
+                progress_callback(message, progress)
+
+        def run_title(_: Dict[str, Any]) -> ComedyTitle:
+            return self.generator.generate_title(
+                input_text, llm, lambda message: notify(message, 0.05)
+            )
+
+        def run_outline(inputs: Dict[str, Any]) -> ComedyOutline:
+            outline, _ = self.generator.generate_outline(
+                inputs["title"],
+                llm,
+                lambda message: notify(message, 0.15),
+                include_metadata=False,
+            )
+            return outline
+
+        def run_metadata(inputs: Dict[str, Any]) -> Optional[YouTubeMetadata]:
+            return self.generator.generate_youtube_metadata(
+                inputs["title"], inputs["outline"], llm
+            )
+
+        def run_script(inputs: Dict[str, Any]) -> ComedyScript:
+            return self.generator.generate_script(
+                inputs["outline"],
+                llm,
+                lambda message, progress: notify(message, 0.2 + 0.75 * progress),
+                parallel=parallel_sections,
+            )
+
+        pipeline = ScriptPipeline(
+            [
+                PipelineNode("title", run_title),
+                PipelineNode("outline", run_outline, depends_on=("title",)),
+                PipelineNode(
+                    "youtube_metadata",
+                    run_metadata,
+                    depends_on=("title", "outline"),
+                    optional=True,
+                ),
+                PipelineNode("script", run_script, depends_on=("outline",)),
+            ],
+            max_workers=max_workers,
+        )
+
+        try:
+            results = pipeline.run()
+        except Exception as e:
+            logger.error(f"完全台本生成エラー ({self.mode.value}): {str(e)}", exc_info=True)
+            raise
+
+        # メタデータは台本と並行して生成したため、最後にアウトライン・台本へ反映する
+        outline: ComedyOutline = results["outline"]
+        script: ComedyScript = results["script"]
+        youtube_metadata = results["youtube_metadata"]
+        outline.youtube_metadata = youtube_metadata
+        script.youtube_metadata = youtube_metadata
+
+        notify("🎉 台本生成完了！", 1.0)
+
+        return {
+            "title": results["title"],
+            "outline": outline,
+            "youtube_metadata": youtube_metadata,
+            "script": script,
+            "model_info": model_info,
+            "timings": pipeline.timing_summary(),
+        }
+
+    async def agenerate_title(self, *args, **kwargs) -> Tuple[ComedyTitle, str, Dict[str, Any]]:
+        """generate_title の非同期版（LLM実行プールで実行し、イベントループをブロックしない）"""
+        return await run_llm_call(self.generate_title, *args, **kwargs)
+
+    async def agenerate_outline(
+        self, *args, **kwargs
+    ) -> Tuple[ComedyOutline, Optional[YouTubeMetadata], Dict[str, Any]]:
+        """generate_outline の非同期版"""
+        return await run_llm_call(self.generate_outline, *args, **kwargs)
+
+    async def agenerate_full_script(self, *args, **kwargs) -> Dict[str, Any]:
+        """generate_full_script の非同期版"""
+        return await run_llm_call(self.generate_full_script, *args, **kwargs)
+
+    async def agenerate_script(self, *args, **kwargs) -> Tuple[ComedyScript, Dict[str, Any]]:
+        """generate_script の非同期版"""
+        return await run_llm_call(self.generate_script, *args, **kwargs)
@@ -1,12 +1,23 @@
+import time
+
+_import_started_at = time.perf_counter()
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import os
+import sys
 import logging
 from app.config import Paths
 
 logger = logging.getLogger(__name__)
 
+# APIプロセスの起動時間予算（秒）。超えた場合は警告を出す
+STARTUP_BUDGET_SECONDS = float(os.getenv("API_STARTUP_BUDGET_SECONDS", "3.0"))
+
+# APIプロセスでは読み込まない想定の重いモジュール（動画処理はワーカー側で行う）
+HEAVY_MODULES = ("moviepy", "cv2", "librosa", "scipy", "langchain_aws")
+
 app = FastAPI(
     title="Zundan Studio API",
     description="API for Zundamon video generation",
@@ -19,6 +30,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # フレーム描画APIのメタ情報（描画時間・セリフ位置など）
+    expose_headers=[
+        "X-Render-Time-Ms",
+        "X-Timeline-Cached",
+        "X-Total-Duration",
+        "X-Line-Index",
+    ],
 )
 
 
@@ -45,15 +63,6 @@ assets_dir = Paths.get_assets_dir()
 assets_dir = os.path.abspath(assets_dir)
 
 if os.path.exists(assets_dir):
-    backgrounds_dir = os.path.join(assets_dir, "backgrounds")
-    logger.info(f"Assets directory: {assets_dir}")
-    logger.info(f"Backgrounds directory exists: {os.path.exists(backgrounds_dir)}")
-    if os.path.exists(backgrounds_dir):
-        bg_files = os.listdir(backgrounds_dir)
-        logger.info(f"Background files count: {len(bg_files)}")
-        if bg_files:
-            logger.info(f"Sample background files: {bg_files[:5]}")
-
     app.mount("/assets", StaticFiles(directory=assets_dir, html=False), name="assets")
     logger.info(f"Mounted assets directory: {assets_dir} at /assets")
 else:
@@ -66,3 +75,20 @@ app.include_router(scripts.router, prefix="/api/scripts", tags=["scripts"])
 app.include_router(voices.router, prefix="/api/voices", tags=["voices"])
 app.include_router(management.router, prefix="/api/management", tags=["management"])
 app.include_router(websocket.router, prefix="/ws", tags=["websocket"])
+
+
+def _report_startup_time():
+    """起動（インポート）にかかった時間と重いモジュールの読み込み有無を記録"""
+    elapsed = time.perf_counter() - _import_started_at
+    loaded_heavy = [name for name in HEAVY_MODULES if name in sys.modules]
+
+    logger.info(f"API startup imports finished in {elapsed:.2f}s")
+    if elapsed > STARTUP_BUDGET_SECONDS:
+        logger.warning(
+            f"API startup exceeded budget: {elapsed:.2f}s > {STARTUP_BUDGET_SECONDS:.2f}s"
+        )
+    if loaded_heavy:
+        logger.warning(f"Heavy modules loaded in API process: {loaded_heavy}")
+
+
+_report_startup_time()
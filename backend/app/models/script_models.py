@@ -8,7 +8,9 @@ __all__ = [
     "BaseScriptModel",
     "SectionDefinition",
     "ConversationSegment",
+    "ConversationSegmentDraft",
     "VideoSection",
+    "VideoSectionDraft",
     "CharacterMood",
     "ComedyTitleCandidate",
     "ComedyTitleBatch",
@@ -17,4 +19,6 @@ __all__ = [
     "ComedyScript",
     "YouTubeMetadata",
     "ThemeBatch",
+    "SectionBoundaryFix",
+    "SectionReconciliation",
 ]
@@ -8,7 +8,9 @@ from app.models.scripts.base import (
 from app.models.scripts.common import (
     SectionDefinition,
     ConversationSegment,
+    ConversationSegmentDraft,
     VideoSection,
+    VideoSectionDraft,
 )
 from app.models.scripts.comedy import (
     CharacterMood,
@@ -19,6 +21,8 @@ from app.models.scripts.comedy import (
     ComedyOutline,
     ComedyScript,
     YouTubeMetadata,
+    SectionBoundaryFix,
+    SectionReconciliation,
 )
 
 __all__ = [
@@ -29,7 +33,9 @@ __all__ = [
     "BaseScriptModel",
     "SectionDefinition",
     "ConversationSegment",
+    "ConversationSegmentDraft",
     "VideoSection",
+    "VideoSectionDraft",
     "CharacterMood",
     "ThemeBatch",
     "ComedyTitleCandidate",
@@ -38,5 +44,7 @@ __all__ = [
     "ComedyOutline",
     "ComedyScript",
     "YouTubeMetadata",
+    "SectionBoundaryFix",
+    "SectionReconciliation",
 ]
 
@@ -208,3 +208,26 @@ class ComedyScript(BaseScriptModel):
         if not v:
             raise ValueError("全セグメントリストは空にできません")
         return v
+
+
+class SectionBoundaryFix(BaseModel):
+    """セクション境界の書き換え（並列生成後の整合調整用）"""
+
+    section_index: int = Field(ge=0, description="書き換えるセクションの番号（0始まり）")
+    segment_index: int = Field(ge=0, description="セクション内のセリフ番号（0始まり）")
+    text: str = Field(description="書き換え後のセリフ内容")
+
+    @field_validator("text")
+    @classmethod
+    def validate_string_not_empty(cls, v: str) -> str:
+        if not v or not v.strip():
+            raise ValueError("文字列は空にできません")
+        return v.strip()
+
+
+class SectionReconciliation(BaseModel):
+    """セクション境界の整合調整結果"""
+
+    fixes: List[SectionBoundaryFix] = Field(
+        default_factory=list, description="書き換えるセリフのリスト（修正不要なら空）"
+    )
@@ -39,12 +39,11 @@ class SectionDefinition(BaseModel):
         return v
 
 
-class ConversationSegment(BaseModel):
+class ConversationSegmentDraft(BaseModel):
+    """LLM出力用の会話セグメント（読み上げ用テキストは生成後にローカルで付与する）"""
+
     speaker: str = Field(description="話者名（ローマ字で指定: zundamon, metan, tsumugi, narrator のいずれか）")
     text: str = Field(description="セリフ内容（字幕表示用・漢字カタカナ含む）")
-    text_for_voicevox: str = Field(
-        description="VOICEVOX読み上げ用テキスト（完全ひらがな）"
-    )
     expression: str = Field(description="話者の表情名（後方互換性のため維持）")
     visible_characters: List[str] = Field(description="表示するキャラクターのリスト（ローマ字で指定: zundamon, metan, tsumugi のいずれか）")
     character_expressions: Dict[str, str] = Field(
@@ -52,7 +51,7 @@ class ConversationSegment(BaseModel):
         description="各キャラクターの表情を個別に指定 {キャラクター名（ローマ字）: 表情名}。例: {\"zundamon\": \"excited\", \"metan\": \"angry\"}",
     )
 
-    @field_validator("speaker", "text", "text_for_voicevox", "expression")
+    @field_validator("speaker", "text", "expression")
     @classmethod
     def validate_string_not_empty(cls, v: str) -> str:
         if not v or not v.strip():
@@ -184,6 +183,19 @@ class ConversationSegment(BaseModel):
         return cleaned
 
 
+class ConversationSegment(ConversationSegmentDraft):
+    text_for_voicevox: str = Field(
+        description="VOICEVOX読み上げ用テキスト（完全ひらがな）"
+    )
+
+    @field_validator("text_for_voicevox")
+    @classmethod
+    def validate_reading_not_empty(cls, v: str) -> str:
+        if not v or not v.strip():
+            raise ValueError("文字列は空にできません")
+        return v.strip()
+
+
 class VideoSection(BaseModel):
     section_name: str = Field(description="セクション名")
     section_key: Optional[str] = Field(
@@ -220,3 +232,10 @@ class VideoSection(BaseModel):
             raise ValueError("セグメントリストは空にできません")
         return v
 
+
+class VideoSectionDraft(VideoSection):
+    """LLM出力用のセクション（セグメントは読み上げ用テキストを含まない）"""
+
+    segments: List[ConversationSegmentDraft] = Field(
+        description="このセクションの会話セグメント"
+    )
@@ -1,6 +1,12 @@
 """Services module."""
 
-from .video import VideoGenerator
-
 __all__ = ["VideoGenerator"]
 
+
+def __getattr__(name):
+    # VideoGenerator は moviepy / OpenCV / librosa を読み込むため、参照時まで遅延させる
+    if name == "VideoGenerator":
+        from .video import VideoGenerator
+
+        return VideoGenerator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -22,7 +22,9 @@ logger = logging.getLogger(__name__)
 class BGMMixer:
     """BGMミキサークラス"""
 
-    def __init__(self):
+    def __init__(self, max_cache_size: int = 8):
+        # キャッシュに保持するBGMファイル数の上限（ワーカー常駐時のメモリ上限）
+        self.max_cache_size = max_cache_size
         # 使用中のBGMクリップを追跡（クリーンアップ用）
         self._active_clips: List[AudioFileClip] = []
         # BGMファイルのキャッシュ（音声データをメモリに保持）
@@ -283,6 +285,45 @@ class BGMMixer:
             except Exception as e:
                 logger.warning(f"BGMクリップのクリーンアップエラー: {e}")
 
+    def preload(self, bgm_ids: Optional[List[str]] = None) -> int:
+        """BGMファイルを事前に読み込む
+
+        Args:
+            bgm_ids: 読み込むBGM ID（省略時はライブラリ全体から上限数まで）
+
+        Returns:
+            読み込みに成功した件数
+        """
+        if bgm_ids is None:
+            from app.config.resource_config.bgm_library import BGM_LIBRARY
+
+            bgm_ids = list(BGM_LIBRARY.keys())
+
+        loaded = 0
+        for bgm_id in bgm_ids:
+            if loaded >= self.max_cache_size:
+                break
+            if not bgm_id or bgm_id == "none":
+                continue
+            bgm_file_path = get_bgm_file_path(bgm_id)
+            if bgm_file_path and os.path.exists(bgm_file_path):
+                if self._load_bgm_file(bgm_file_path):
+                    loaded += 1
+        return loaded
+
+    def trim_cache(self):
+        """キャッシュを上限数まで縮小する（古く読み込んだものから破棄）"""
+        with self._load_lock:
+            while len(self._bgm_cache) > self.max_cache_size:
+                bgm_path = next(iter(self._bgm_cache))
+                clip = self._bgm_cache.pop(bgm_path)
+                try:
+                    if clip in self._active_clips:
+                        self._active_clips.remove(clip)
+                    clip.close()
+                except Exception as e:
+                    logger.warning(f"BGMキャッシュのクリーンアップエラー ({bgm_path}): {e}")
+
     def clear_cache(self):
         """使用中のBGMクリップとキャッシュをクリーンアップする"""
         closed_count = 0
@@ -1,7 +1,11 @@
+import hashlib
 import logging
 import os
+import random
 import cv2
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+from app.config.app import Paths
 
 logger = logging.getLogger(__name__)
 
@@ -11,33 +15,102 @@ class ResourceManager:
 
     def __init__(self, video_processor):
         self.video_processor = video_processor
+        # ワーカープロセス内で再利用する読み込み済みリソース
+        self._character_images: Optional[Dict] = None
+        self._backgrounds: Optional[Dict] = None
+        self._backgrounds_mtime: Optional[int] = None
 
     def load_character_images(self) -> Dict:
-        """キャラクター画像の読み込み"""
+        """キャラクター画像の読み込み（読み込み済みなら再利用）"""
+        if self._character_images:
+            return self._character_images
+
         character_images = self.video_processor.load_all_character_images()
         if not character_images:
             logger.error("No character images loaded")
             return None
+        self._character_images = character_images
         return character_images
 
     def load_backgrounds(self) -> Dict:
-        """背景画像の読み込み"""
+        """背景画像の読み込み
+
+        背景は実行中に追加生成されることがあるため、
+        ディレクトリの更新時刻が変わった場合のみ読み込み直す。
+        """
+        bg_dir = Paths.get_backgrounds_dir()
+        try:
+            dir_mtime = os.stat(bg_dir).st_mtime_ns
+        except OSError:
+            dir_mtime = None
+
+        if self._backgrounds and dir_mtime is not None and dir_mtime == self._backgrounds_mtime:
+            return self._backgrounds
+
         backgrounds = self.video_processor.load_backgrounds()
         if not backgrounds:
             logger.error("No background images loaded")
             return None
+        self._backgrounds = backgrounds
+        self._backgrounds_mtime = dir_mtime
         return backgrounds
 
-    def generate_blink_timings(self, total_duration: float) -> List:
-        """瞬きタイミングの生成"""
+    def clear_cache(self):
+        """読み込み済みリソースを破棄"""
+        self._character_images = None
+        self._backgrounds = None
+        self._backgrounds_mtime = None
+
+    def generate_blink_timings(
+        self, total_duration: float, start_time: float = 0.0, seed: Optional[int] = None
+    ) -> List:
+        """瞬きタイミングの生成
+
+        Args:
+            total_duration: 生成区間の終了時刻（秒）
+            start_time: 生成区間の開始時刻（秒）。区間ごとに生成する場合に使用
+            seed: アニメーションのシード。指定するとキャラクターごとに派生させたシードで
+                時刻0からの瞬きの列を作り、その区間に始まる瞬きだけを返す。
+                列は区間の切り方によらないため、一括描画・区間ごとの描画のどちらでも
+                同じ入力から同じタイミングになる
+        """
         blink_timings = []
+        window = total_duration - start_time
+        if window <= 0:
+            return blink_timings
+
         for char_name in self.video_processor.characters.keys():
+            if seed is None:
+                char_blink_timings = self.video_processor.generate_blink_timings(
+                    window, char_name
+                )
+                for blink in char_blink_timings:
+                    blink["start"] += start_time
+                    blink["end"] += start_time
+                blink_timings.extend(char_blink_timings)
+                continue
+
+            # 同じ乱数列から生成するため、終了時刻を延ばしても先頭部分は変わらない。
+            # 区間の終了間際に始まる瞬きも含めるよう、瞬きの長さだけ延ばして生成する
+            rng = random.Random(self._derive_seed(seed, char_name))
             char_blink_timings = self.video_processor.generate_blink_timings(
-                total_duration, char_name
+                total_duration + self.video_processor.blink_config["duration"],
+                char_name,
+                rng=rng,
+            )
+            blink_timings.extend(
+                blink
+                for blink in char_blink_timings
+                if start_time <= blink["start"] < total_duration
             )
-            blink_timings.extend(char_blink_timings)
         return blink_timings
 
+    @staticmethod
+    def _derive_seed(seed: int, *parts) -> int:
+        """ベースのシードとキャラクター名などから個別のシードを派生させる"""
+        raw = ":".join([str(seed), *(repr(part) for part in parts)])
+        return int.from_bytes(hashlib.sha256(raw.encode("utf-8")).digest()[:8], "big")
+
     def validate_resources(self, character_images: Dict, backgrounds: Dict) -> bool:
         """リソースの検証"""
         return character_images is not None and backgrounds is not None
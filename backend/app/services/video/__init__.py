@@ -1,6 +1,12 @@
 """Video generation services module."""
 
-from .video_generator import VideoGenerator
-
 __all__ = ["VideoGenerator"]
 
+
+def __getattr__(name):
+    # 重い依存を含むため、参照時まで読み込みを遅延させる
+    if name == "VideoGenerator":
+        from .video_generator import VideoGenerator
+
+        return VideoGenerator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,11 +1,18 @@
 import cv2
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
+from app.config.app import WORKER_CONFIG
 from app.models.video_models import AudioSegmentInfo, SubtitleData
 from .frame_info_builder import FrameInfoBuilder
+from .frame_pipeline import OrderedFramePipeline, get_buffer_pool
 
 logger = logging.getLogger(__name__)
 
+# アイテム表示が許可されるセクションキー
+ITEM_ALLOWED_SECTIONS = {"background", "learning"}
+
 
 class FrameGenerator:
     """フレーム生成クラス"""
@@ -15,6 +22,42 @@ class FrameGenerator:
         self.fps = fps
         self.frame_info_builder = FrameInfoBuilder(video_processor, fps)
 
+        # 合成スレッド（0 の場合は使わない）。ジョブをまたいで再利用する
+        self.render_threads = WORKER_CONFIG.render_threads
+        self.queue_depth = WORKER_CONFIG.render_queue_depth
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._buffer_pools: Dict = {}
+        # 字幕描画（PIL の FreeType フォント）はスレッド間で共有できないため直列化する
+        self._subtitle_lock = threading.Lock()
+
+    def open_writer(self, temp_video_path: str) -> Optional[cv2.VideoWriter]:
+        """一時動画ファイル用のVideoWriterを開く"""
+        fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+        out = cv2.VideoWriter(
+            temp_video_path, fourcc, self.fps, self.video_processor.resolution
+        )
+
+        if not out.isOpened():
+            logger.error("Failed to open video writer")
+            return None
+        return out
+
+    @staticmethod
+    def build_section_segment_ranges(sections: List = None) -> List[Dict]:
+        """セクションごとのセグメント範囲を計算"""
+        section_segment_ranges = []
+        if sections:
+            segment_index = 0
+            for section in sections:
+                segment_count = len(section.segments)
+                section_segment_ranges.append({
+                    "key": getattr(section, "section_key", None),
+                    "start": segment_index,
+                    "end": segment_index + segment_count
+                })
+                segment_index += segment_count
+        return section_segment_ranges
+
     def generate_video_frames(
         self,
         total_frames: int,
@@ -38,105 +81,208 @@ class FrameGenerator:
         ):
             logger.warning("Timing inconsistency detected, but continuing...")
 
-        fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-        out = cv2.VideoWriter(
-            temp_video_path, fourcc, self.fps, self.video_processor.resolution
-        )
-
-        if not out.isOpened():
-            logger.error("Failed to open video writer")
+        out = self.open_writer(temp_video_path)
+        if out is None:
             return False
 
         try:
-            # 現在表示中のアイテムを追跡
-            current_item = None
-            current_section_key = None
-
-            # アイテム表示が許可されるセクションキー
-            ITEM_ALLOWED_SECTIONS = {"background", "learning"}
-
-            # セクションごとのセグメント範囲を事前計算
-            section_segment_ranges = []
-            if sections:
-                segment_index = 0
-                for section in sections:
-                    segment_count = len(section.segments)
-                    section_segment_ranges.append({
-                        "key": getattr(section, "section_key", None),
-                        "start": segment_index,
-                        "end": segment_index + segment_count
-                    })
-                    segment_index += segment_count
-
-            for frame_idx in range(total_frames):
+            render_state = {}
+
+            def frame_callback(frames_done: int):
                 if progress_callback:
-                    progress_callback((frame_idx + 1) / total_frames)
-
-                current_time = frame_idx / self.fps
-
-                # 現在のフレーム情報を取得
-                active_speakers, current_background = (
-                    self.frame_info_builder.get_frame_info(
-                        current_time,
-                        conversations,
-                        audio_file_list,
-                        segment_audio_intensities,
-                        backgrounds,
+                    progress_callback(
+                        frames_done / total_frames,
+                        frames_done=frames_done,
+                        total_frames=total_frames,
                     )
+
+            self.render_frame_range(
+                out,
+                start_frame=0,
+                end_frame=total_frames,
+                conversations=conversations,
+                audio_file_list=audio_file_list,
+                segment_audio_intensities=segment_audio_intensities,
+                backgrounds=backgrounds,
+                character_images=character_images,
+                blink_timings=blink_timings,
+                subtitle_lines=subtitle_lines,
+                conversation_mode=conversation_mode,
+                section_segment_ranges=self.build_section_segment_ranges(sections),
+                render_state=render_state,
+                frame_callback=frame_callback,
+            )
+
+            out.release()
+            return True
+
+        except Exception as e:
+            logger.error(f"Frame generation failed: {e}")
+            out.release()
+            return False
+
+    def render_frame_range(
+        self,
+        out,
+        start_frame: int,
+        end_frame: int,
+        conversations: List[Dict],
+        audio_file_list: List[str],
+        segment_audio_intensities: List[AudioSegmentInfo],
+        backgrounds: Dict,
+        character_images: Dict,
+        blink_timings: List,
+        subtitle_lines: List[SubtitleData],
+        conversation_mode: str,
+        section_segment_ranges: List[Dict],
+        render_state: Dict,
+        frame_callback=None,
+    ) -> int:
+        """指定範囲のフレームを合成してwriterに書き込む
+
+        ストリーミング生成では、タイムラインが確定した区間ごとに呼び出される。
+        render_state は呼び出し間で引き継ぐアイテム表示状態。
+        frame_callback はフレームを書き込むたびに書き込み済みフレーム数で呼ばれる。
+
+        フレーム情報の特定とアイテム状態の更新はこのスレッドで順に行い、
+        合成・字幕描画は合成スレッド、書き込みは書き込みスレッドで並行して行う。
+
+        Returns:
+            書き込んだフレーム数
+        """
+        frames = self._plan_frames(
+            start_frame,
+            end_frame,
+            conversations,
+            audio_file_list,
+            segment_audio_intensities,
+            backgrounds,
+            section_segment_ranges,
+            render_state,
+        )
+
+        def compose(plan, buffer=None):
+            current_time, current_background, active_speakers, current_item = plan
+            if buffer is not None and buffer.shape != current_background.shape:
+                buffer = None
+            frame = self.video_processor.composite_conversation_frame_with_item(
+                current_background,
+                character_images,
+                active_speakers,
+                conversation_mode,
+                current_time,
+                blink_timings,
+                current_item,
+                out=buffer,
+            )
+            if not subtitle_lines:
+                return frame
+            with self._subtitle_lock:
+                return self.frame_info_builder.add_subtitle_to_frame(
+                    frame, subtitle_lines, current_time
                 )
 
-                # 現在のセグメントを特定してアイテムを更新
-                for i, conv in enumerate(conversations):
-                    if i < len(segment_audio_intensities):
-                        segment = segment_audio_intensities[i]
-                        segment_start = segment.start_time
-                        segment_end = segment_start + segment.duration
-
-                        if segment_start <= current_time < segment_end:
-                            # 現在のセグメントが属するセクションを判定
-                            new_section_key = None
-                            for section_range in section_segment_ranges:
-                                if section_range["start"] <= i < section_range["end"]:
-                                    new_section_key = section_range["key"]
-                                    break
-
-                            # セクションが変わった場合
-                            if new_section_key != current_section_key:
-                                # アイテム表示が許可されていないセクションに入った場合はクリア
-                                if new_section_key not in ITEM_ALLOWED_SECTIONS:
-                                    if current_item is not None:
-                                        logger.info(
-                                            f"Item cleared: section changed to '{new_section_key}' at time={current_time:.3f}s"
-                                        )
-                                        current_item = None
-                                else:
-                                    logger.info(
-                                        f"Entered item-allowed section '{new_section_key}' at time={current_time:.3f}s"
-                                    )
-                                current_section_key = new_section_key
+        if self.render_threads <= 0:
+            for frame_idx, plan in zip(range(start_frame, end_frame), frames):
+                out.write(compose(plan))
+                if frame_callback:
+                    frame_callback(frame_idx + 1)
+            return max(0, end_frame - start_frame)
+
+        pipeline = None
+        try:
+            for plan in frames:
+                if pipeline is None:
+                    pool = get_buffer_pool(
+                        self._buffer_pools, plan[1].shape, self.queue_depth + 1
+                    )
+                    pipeline = OrderedFramePipeline(
+                        out,
+                        compose,
+                        self._get_executor(),
+                        depth=self.queue_depth,
+                        frame_callback=frame_callback,
+                        frames_done=start_frame,
+                        pool=pool,
+                    )
+                pipeline.submit(plan)
+        finally:
+            if pipeline is not None:
+                pipeline.close()
+        return max(0, end_frame - start_frame)
 
-                            break
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.render_threads, thread_name_prefix="compose"
+            )
+        return self._executor
 
-                # フレーム合成（アイテム付き）
-                frame = self.video_processor.composite_conversation_frame_with_item(
-                    current_background,
-                    character_images,
-                    active_speakers,
-                    conversation_mode,
+    def _plan_frames(
+        self,
+        start_frame: int,
+        end_frame: int,
+        conversations: List[Dict],
+        audio_file_list: List[str],
+        segment_audio_intensities: List[AudioSegmentInfo],
+        backgrounds: Dict,
+        section_segment_ranges: List[Dict],
+        render_state: Dict,
+    ):
+        """フレームごとの合成内容（時刻・背景・話者・アイテム）を順に求める
+
+        アイテムの表示状態は前のフレームに依存するため、必ずフレーム順に評価する。
+        """
+        # 現在表示中のアイテムを追跡
+        current_item = render_state.get("current_item")
+        current_section_key = render_state.get("current_section_key")
+
+        for frame_idx in range(start_frame, end_frame):
+            current_time = frame_idx / self.fps
+
+            # 現在のフレーム情報を取得
+            active_speakers, current_background = (
+                self.frame_info_builder.get_frame_info(
                     current_time,
-                    blink_timings,
-                    current_item,
+                    conversations,
+                    audio_file_list,
+                    segment_audio_intensities,
+                    backgrounds,
                 )
+            )
 
-                # 字幕追加
-                frame = self.frame_info_builder.add_subtitle_to_frame(frame, subtitle_lines, current_time)
+            # 現在のセグメントを特定してアイテムを更新
+            for i, conv in enumerate(conversations):
+                if i < len(segment_audio_intensities):
+                    segment = segment_audio_intensities[i]
+                    segment_start = segment.start_time
+                    segment_end = segment_start + segment.duration
 
-                out.write(frame)
+                    if segment_start <= current_time < segment_end:
+                        # 現在のセグメントが属するセクションを判定
+                        new_section_key = None
+                        for section_range in section_segment_ranges:
+                            if section_range["start"] <= i < section_range["end"]:
+                                new_section_key = section_range["key"]
+                                break
 
-            out.release()
-            return True
+                        # セクションが変わった場合
+                        if new_section_key != current_section_key:
+                            # アイテム表示が許可されていないセクションに入った場合はクリア
+                            if new_section_key not in ITEM_ALLOWED_SECTIONS:
+                                if current_item is not None:
+                                    logger.info(
+                                        f"Item cleared: section changed to '{new_section_key}' at time={current_time:.3f}s"
+                                    )
+                                    current_item = None
+                            else:
+                                logger.info(
+                                    f"Entered item-allowed section '{new_section_key}' at time={current_time:.3f}s"
+                                )
+                            current_section_key = new_section_key
 
-        except Exception as e:
-            logger.error(f"Frame generation failed: {e}")
-            out.release()
-            return False
+                        break
+
+            render_state["current_item"] = current_item
+            render_state["current_section_key"] = current_section_key
+            yield current_time, current_background, active_speakers, current_item
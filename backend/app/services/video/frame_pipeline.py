@@ -0,0 +1,121 @@
+"""フレーム合成と書き込みのパイプライン
+
+合成（背景コピー・アルファブレンド・字幕描画）と writer への書き込みを別スレッドで
+並行させる。合成は複数スレッドで行い（OpenCV / NumPy の処理中は GIL が解放される）、
+結果は投入順のまま上限付きキューを通して書き込みスレッドへ渡す。キューとバッファ
+プールが一杯になると投入側が待つため、メモリ使用量は一定に保たれる。
+"""
+
+import logging
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class FrameBufferPool:
+    """合成先のフレームバッファを使い回すプール"""
+
+    def __init__(self, shape: Tuple[int, ...], size: int, dtype=np.uint8):
+        self.shape = tuple(shape)
+        self.dtype = dtype
+        self._buffers: "queue.Queue[np.ndarray]" = queue.Queue()
+        for _ in range(size):
+            self._buffers.put(np.empty(self.shape, dtype=dtype))
+
+    def acquire(self) -> np.ndarray:
+        """空きバッファを取得（全て使用中なら返却を待つ）"""
+        return self._buffers.get()
+
+    def release(self, buffer: np.ndarray):
+        """バッファを返却する"""
+        self._buffers.put(buffer)
+
+
+class OrderedFramePipeline:
+    """合成スレッド → 順序付きキュー → 書き込みスレッド のパイプライン
+
+    使用例:
+        pipeline = OrderedFramePipeline(out, compose, executor, depth=8)
+        for job in jobs:
+            pipeline.submit(job)
+        pipeline.close()
+
+    compose(job, buffer) はフレームを返す関数で、buffer（None の場合あり）に合成してよい。
+    frame_callback は書き込むたびに書き込み済みフレーム数で呼ばれる（書き込みスレッド）。
+    """
+
+    def __init__(
+        self,
+        out,
+        compose: Callable,
+        executor: ThreadPoolExecutor,
+        depth: int,
+        frame_callback: Optional[Callable[[int], None]] = None,
+        frames_done: int = 0,
+        pool: Optional[FrameBufferPool] = None,
+    ):
+        self.out = out
+        self.compose = compose
+        self.executor = executor
+        self.pool = pool
+        self.frame_callback = frame_callback
+        self.frames_done = frames_done
+        self.written = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, depth))
+        self._error: Optional[BaseException] = None
+        self._writer = threading.Thread(target=self._write_loop, name="frame-writer", daemon=True)
+        self._writer.start()
+
+    def submit(self, job):
+        """フレームの合成を投入する（キューが一杯なら空くまで待つ）"""
+        if self._error is not None:
+            raise self._error
+        buffer = self.pool.acquire() if self.pool else None
+        future: Future = self.executor.submit(self.compose, job, buffer)
+        self._queue.put((future, buffer))
+
+    def close(self):
+        """投入済みのフレームを書き終えるまで待つ（失敗していれば例外を送出）"""
+        self._queue.put(_STOP)
+        self._writer.join()
+        if self._error is not None:
+            raise self._error
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            future, buffer = item
+            try:
+                if self._error is None:
+                    self.out.write(future.result())
+                    self.written += 1
+                    if self.frame_callback:
+                        self.frame_callback(self.frames_done + self.written)
+            except BaseException as e:
+                logger.error(f"Frame pipeline failed: {e}")
+                self._error = e
+            finally:
+                if buffer is not None:
+                    # 失敗後も合成の完了を待ってから返却する（合成中のバッファを再利用しない）
+                    future.exception()
+                    self.pool.release(buffer)
+
+
+def get_buffer_pool(
+    pools: Dict[Tuple[int, ...], FrameBufferPool], shape: Tuple[int, ...], size: int
+) -> FrameBufferPool:
+    """形状ごとのバッファプールを取得（なければ作成）"""
+    pool = pools.get(tuple(shape))
+    if pool is None:
+        pool = FrameBufferPool(shape, size)
+        pools[tuple(shape)] = pool
+    return pool
@@ -0,0 +1,594 @@
+"""動画ジョブを使わないフレームのプレビュー描画
+
+台本の確認用に、音声合成をせずにタイムラインを組み立て（キャッシュ済みの音声があれば
+その長さ、なければ読みの文字数から推定した長さを使う）、既存の合成処理で
+任意のフレームを描画する。セリフごとの代表フレームを並べたコンタクトシート
+（ストーリーボード）の作成にも使う。
+
+キャラクター画像・背景・フォントはプロセス内に常駐させ、描画プロファイルごとに
+1つのレンダラーを使い回す。
+"""
+
+import asyncio
+import base64
+import functools
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+import cv2
+import numpy as np
+
+from app.config.app import RenderProfile, get_render_profile
+from app.core.processors.video_processor import VideoProcessor
+from app.models.video_models import AudioSegmentInfo, SubtitleData
+from app.services.resource_manager import ResourceManager
+from app.services.video.frame_info_builder import FrameInfoBuilder
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# APIプロセス内で同時に描画するリクエスト数の上限
+FRAME_RENDER_CONCURRENCY = int(os.getenv("FRAME_RENDER_CONCURRENCY", "2"))
+
+# 音声がないセリフの長さの推定（読みの文字数 / 秒、セリフ間の余白）
+ESTIMATED_CHARS_PER_SECOND = float(os.getenv("ESTIMATED_CHARS_PER_SECOND", "7.5"))
+ESTIMATED_PAUSE_SECONDS = 0.3
+MIN_LINE_SECONDS = 0.8
+
+# 代表フレームとして使うセリフ内の位置（字幕がほぼ表示し終わる位置）
+REPRESENTATIVE_POSITION = 0.6
+
+# 組み立て済みタイムラインの保持数と、推定値を含むタイムラインの有効期間（秒）
+# （推定値のセリフは後から音声が合成されると長さが変わるため短時間だけ使い回す）
+TIMELINE_CACHE_SIZE = 16
+ESTIMATED_TIMELINE_TTL = 10.0
+
+
+@dataclass
+class PreviewTimeline:
+    """プレビュー用のタイムライン"""
+
+    conversations: List[Dict[str, Any]]
+    segments: List[AudioSegmentInfo]
+    subtitles: List[SubtitleData]
+    # セリフごとの長さの出典（cached / synthesized / estimated）
+    duration_sources: List[str] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        if not self.segments:
+            return 0.0
+        last = self.segments[-1]
+        return last.start_time + last.duration
+
+    def line_at(self, current_time: float) -> Optional[int]:
+        """指定時刻のセリフのインデックス"""
+        for index, segment in enumerate(self.segments):
+            if segment.start_time <= current_time < segment.start_time + segment.duration:
+                return index
+        return None
+
+
+def estimate_line_duration(conversation: Dict[str, Any], speed: Optional[float] = None) -> float:
+    """読みの文字数からセリフの長さを推定する"""
+    reading = conversation.get("text_for_voicevox") or conversation.get("text", "")
+    seconds = len(reading.strip()) / ESTIMATED_CHARS_PER_SECOND
+    if speed:
+        seconds /= speed
+    return max(MIN_LINE_SECONDS, seconds + ESTIMATED_PAUSE_SECONDS)
+
+
+def encode_image(frame: np.ndarray, image_format: str = "jpeg", quality: int = 80) -> bytes:
+    """フレームを JPEG / WebP にエンコードする"""
+    if image_format == "webp":
+        ok, buffer = cv2.imencode(".webp", frame, [cv2.IMWRITE_WEBP_QUALITY, quality])
+    else:
+        ok, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError(f"画像のエンコードに失敗しました: {image_format}")
+    return buffer.tobytes()
+
+
+def to_data_url(data: bytes, image_format: str = "jpeg") -> str:
+    """画像データを data URL にする"""
+    return f"data:image/{image_format};base64," + base64.b64encode(data).decode("ascii")
+
+
+class FramePreviewRenderer:
+    """常駐リソースを使って単一フレームを描画するレンダラー"""
+
+    def __init__(self, profile: Optional[RenderProfile] = None):
+        self.profile = profile or get_render_profile()
+        self.video_processor = VideoProcessor(self.profile)
+        self.resource_manager = ResourceManager(self.video_processor)
+        self.frame_info_builder = FrameInfoBuilder(self.video_processor, self.profile.fps)
+        self._timelines: "OrderedDict[str, Any]" = OrderedDict()
+        self._timelines_lock = threading.Lock()
+        # 字幕描画（PIL の FreeType フォント）はスレッド間で共有できないため直列化する
+        self._subtitle_lock = threading.Lock()
+
+    def warm_up(self):
+        """フォント・キャラクター画像・背景を読み込む"""
+        started = time.monotonic()
+        self.video_processor.get_japanese_font()
+        self.resource_manager.load_character_images()
+        self.resource_manager.load_backgrounds()
+        logger.info(
+            f"FramePreviewRenderer warmed up ({self.profile.name}) "
+            f"in {time.monotonic() - started:.2f}s"
+        )
+
+    def compile_timeline(
+        self,
+        conversations: List[Dict[str, Any]],
+        enable_subtitles: bool = True,
+        voice_settings: Optional[Dict[str, Any]] = None,
+        synthesize_voices: bool = False,
+    ) -> PreviewTimeline:
+        """会話リストからプレビュー用のタイムラインを組み立てる
+
+        Args:
+            conversations: 会話リスト
+            enable_subtitles: 字幕有効化フラグ
+            voice_settings: speed / pitch / intonation（音声キャッシュのキーに使用）
+            synthesize_voices: キャッシュにないセリフの音声を合成して正確な長さを使うか
+
+        Returns:
+            PreviewTimeline
+        """
+        from app.services.video.section_clip_cache import get_section_clip_cache
+
+        voice_settings = {
+            name: (voice_settings or {}).get(name) for name in ("speed", "pitch", "intonation")
+        }
+        line_cache = get_section_clip_cache().line_cache
+        keys = [line_cache.key(conv, voice_settings) for conv in conversations]
+        analyses: Dict[int, Any] = {}
+        sources: Dict[int, str] = {}
+        unanalyzed: Dict[int, str] = {}
+        for index, key in enumerate(keys):
+            hit = line_cache.get(key)
+            if hit and hit[1]:
+                analyses[index] = hit[1]
+                sources[index] = "cached"
+            elif hit:
+                unanalyzed[index] = hit[0]
+
+        if synthesize_voices and unanalyzed:
+            from app.core.processors.audio_processor import AudioProcessor
+
+            audio_processor = AudioProcessor()
+            for index, wav_path in unanalyzed.items():
+                analysis = audio_processor.analyze_audio_for_mouth_sync(wav_path)
+                if analysis[0] and analysis[1] > 0:
+                    line_cache.put_analysis(keys[index], analysis)
+                    analyses[index] = analysis
+                    sources[index] = "cached"
+
+        if synthesize_voices:
+            missing = [index for index in range(len(conversations)) if index not in analyses]
+            for index, analysis in self._synthesize(
+                conversations, missing, keys, voice_settings
+            ).items():
+                analyses[index] = analysis
+                sources[index] = "synthesized"
+
+        backgrounds = self.resource_manager.load_backgrounds() or {}
+        segments: List[AudioSegmentInfo] = []
+        subtitles: List[SubtitleData] = []
+        duration_sources: List[str] = []
+        start_time = 0.0
+        for index, conv in enumerate(conversations):
+            if index in analyses:
+                intensities, duration = analyses[index]
+            else:
+                intensities, duration = [], estimate_line_duration(
+                    conv, voice_settings.get("speed")
+                )
+            segments.append(
+                AudioSegmentInfo(
+                    start_time=start_time,
+                    intensities=list(intensities),
+                    duration=duration,
+                    actual_frame_count=len(intensities),
+                )
+            )
+            duration_sources.append(sources.get(index, "estimated"))
+
+            text = conv.get("text", "").strip()
+            if enable_subtitles and text:
+                background_name = conv.get("background", "default")
+                if background_name not in backgrounds:
+                    background_name = "default"
+                subtitles.append(
+                    SubtitleData(
+                        text=text,
+                        start_time=start_time,
+                        end_time=start_time + duration,
+                        duration=duration,
+                        speaker=conv.get("speaker", "zundamon"),
+                        background=background_name,
+                    )
+                )
+            start_time += duration
+
+        return PreviewTimeline(
+            conversations=conversations,
+            segments=segments,
+            subtitles=subtitles,
+            duration_sources=duration_sources,
+        )
+
+    def get_timeline(
+        self,
+        conversations: List[Dict[str, Any]],
+        enable_subtitles: bool = True,
+        voice_settings: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[PreviewTimeline, bool]:
+        """組み立て済みのタイムラインを再利用して取得する（スクラブ中の連続呼び出し用）
+
+        Returns:
+            (タイムライン, 再利用したかどうか)
+        """
+        key = hashlib.sha256(
+            json.dumps(
+                [conversations, enable_subtitles, voice_settings or {}],
+                sort_keys=True,
+                ensure_ascii=False,
+            ).encode("utf-8")
+        ).hexdigest()
+        now = time.monotonic()
+        with self._timelines_lock:
+            entry = self._timelines.get(key)
+            if entry is not None:
+                timeline, created = entry
+                if "estimated" not in timeline.duration_sources or (
+                    now - created < ESTIMATED_TIMELINE_TTL
+                ):
+                    self._timelines.move_to_end(key)
+                    return timeline, True
+
+        timeline = self.compile_timeline(conversations, enable_subtitles, voice_settings)
+        with self._timelines_lock:
+            self._timelines[key] = (timeline, now)
+            self._timelines.move_to_end(key)
+            while len(self._timelines) > TIMELINE_CACHE_SIZE:
+                self._timelines.popitem(last=False)
+        return timeline, False
+
+    def render_frame(
+        self,
+        timeline: PreviewTimeline,
+        current_time: float,
+        conversation_mode: str = "duo",
+    ) -> np.ndarray:
+        """タイムライン上の指定時刻のフレームを描画する（瞬きなし）"""
+        character_images = self.resource_manager.load_character_images()
+        backgrounds = self.resource_manager.load_backgrounds()
+        if not self.resource_manager.validate_resources(character_images, backgrounds):
+            raise ValueError("キャラクター画像または背景を読み込めませんでした")
+
+        current_time = min(max(0.0, current_time), max(0.0, timeline.duration - 1e-3))
+        active_speakers, current_background = self.frame_info_builder.get_frame_info(
+            current_time,
+            timeline.conversations,
+            [""] * len(timeline.conversations),
+            timeline.segments,
+            backgrounds,
+        )
+        frame = self.video_processor.composite_conversation_frame_with_item(
+            current_background,
+            character_images,
+            active_speakers,
+            conversation_mode,
+            current_time,
+            [],
+            None,
+        )
+        with self._subtitle_lock:
+            return self.frame_info_builder.add_subtitle_to_frame(
+                frame, timeline.subtitles, current_time
+            )
+
+    def render_storyboard(
+        self,
+        timeline: PreviewTimeline,
+        conversation_mode: str = "duo",
+        line_indices: Optional[List[int]] = None,
+        columns: int = 6,
+        thumbnail_width: int = 320,
+        image_format: str = "jpeg",
+    ) -> Dict[str, Any]:
+        """セリフごとの代表フレームとコンタクトシートを描画する
+
+        Args:
+            timeline: プレビュー用のタイムライン
+            conversation_mode: 会話モード
+            line_indices: 代表フレームを作るセリフ（省略時は全セリフ）
+            columns: コンタクトシートの列数
+            thumbnail_width: サムネイルの幅
+            image_format: jpeg / webp
+
+        Returns:
+            contact_sheet（画像データ）と frames（index, time, image）
+        """
+        if line_indices is None:
+            line_indices = list(range(len(timeline.segments)))
+
+        thumbnails = []
+        frames = []
+        for index in line_indices:
+            segment = timeline.segments[index]
+            frame_time = segment.start_time + segment.duration * REPRESENTATIVE_POSITION
+            frame = self.render_frame(timeline, frame_time, conversation_mode)
+            thumbnail = self._resize_to_width(frame, thumbnail_width)
+            thumbnails.append(thumbnail)
+            frames.append({
+                "index": index,
+                "time": frame_time,
+                "image": encode_image(thumbnail, image_format),
+            })
+
+        contact_sheet = None
+        if thumbnails:
+            contact_sheet = encode_image(
+                self._tile(thumbnails, max(1, columns)), image_format
+            )
+        return {"contact_sheet": contact_sheet, "frames": frames}
+
+    @staticmethod
+    def _resize_to_width(frame: np.ndarray, width: int) -> np.ndarray:
+        height, original_width = frame.shape[:2]
+        if original_width == width:
+            return frame
+        return cv2.resize(
+            frame, (width, round(height * width / original_width)), interpolation=cv2.INTER_AREA
+        )
+
+    @staticmethod
+    def _tile(thumbnails: List[np.ndarray], columns: int) -> np.ndarray:
+        """サムネイルを格子状に並べる（余白は黒）"""
+        height, width = thumbnails[0].shape[:2]
+        rows = (len(thumbnails) + columns - 1) // columns
+        sheet = np.zeros((rows * height, min(columns, len(thumbnails)) * width, 3), dtype=np.uint8)
+        for position, thumbnail in enumerate(thumbnails):
+            row, col = divmod(position, columns)
+            sheet[row * height:(row + 1) * height, col * width:(col + 1) * width] = thumbnail[:, :, :3]
+        return sheet
+
+    def _synthesize(
+        self,
+        conversations: List[Dict[str, Any]],
+        indices: List[int],
+        keys: List[str],
+        voice_settings: Dict[str, Any],
+    ) -> Dict[int, Any]:
+        """指定したセリフの音声を合成・解析し、音声キャッシュに保存する"""
+        if not indices:
+            return {}
+
+        from app.config.app import WORKER_CONFIG
+        from app.core.asset_generators.voice_generator import VoiceGenerator
+        from app.core.processors.audio_processor import AudioProcessor
+        from app.services.video.section_clip_cache import get_section_clip_cache
+        from app.utils_legacy.files import JobWorkspace
+
+        line_cache = get_section_clip_cache().line_cache
+        audio_processor = AudioProcessor()
+        analyses: Dict[int, Any] = {}
+        with JobWorkspace() as workspace:
+            for position, audio_path in VoiceGenerator().stream_conversation_voices(
+                conversations=[conversations[index] for index in indices],
+                output_dir=workspace.subdir("voices"),
+                max_workers=WORKER_CONFIG.voice_parallelism,
+                **voice_settings,
+            ):
+                if not audio_path or not os.path.exists(audio_path):
+                    continue
+                index = indices[position]
+                analysis = audio_processor.analyze_audio_for_mouth_sync(audio_path)
+                if not analysis[0] or analysis[1] <= 0:
+                    continue
+                line_cache.put_audio(keys[index], audio_path)
+                line_cache.put_analysis(keys[index], analysis)
+                analyses[index] = analysis
+        return analyses
+
+
+_renderers: Dict[str, FramePreviewRenderer] = {}
+_lock = threading.Lock()
+
+
+def get_frame_preview_renderer(profile_name: Optional[str] = None) -> FramePreviewRenderer:
+    """プロセス内で共有するプレビューレンダラーを取得（初回のみリソースを読み込む）"""
+    profile = get_render_profile(profile_name)
+    renderer = _renderers.get(profile.name)
+    if renderer is None:
+        with _lock:
+            renderer = _renderers.get(profile.name)
+            if renderer is None:
+                renderer = FramePreviewRenderer(profile)
+                renderer.warm_up()
+                _renderers[profile.name] = renderer
+    return renderer
+
+
+def build_storyboard(
+    conversations: List[Dict[str, Any]],
+    sections: Optional[List[Any]] = None,
+    per: str = "line",
+    enable_subtitles: bool = True,
+    conversation_mode: str = "duo",
+    voice_settings: Optional[Dict[str, Any]] = None,
+    synthesize_voices: bool = False,
+    columns: int = 6,
+    thumbnail_width: int = 320,
+    profile_name: Optional[str] = None,
+) -> Dict[str, Any]:
+    """台本からストーリーボード（代表フレームとコンタクトシート）を作成する
+
+    Args:
+        conversations: 会話リスト
+        sections: セクション情報（per="section" のときに使用）
+        per: "line"（セリフごと） / "section"（セクションの先頭セリフごと）
+        enable_subtitles: 字幕有効化フラグ
+        conversation_mode: 会話モード
+        voice_settings: speed / pitch / intonation
+        synthesize_voices: キャッシュにないセリフの音声を合成するか
+        columns: コンタクトシートの列数
+        thumbnail_width: サムネイルの幅
+        profile_name: 描画プロファイル名（省略時は preview）
+
+    Returns:
+        contact_sheet（data URL）・frames・total_duration・elapsed_ms
+    """
+    started = time.monotonic()
+    renderer = get_frame_preview_renderer(profile_name or "preview")
+    if synthesize_voices:
+        timeline = renderer.compile_timeline(
+            conversations, enable_subtitles, voice_settings, synthesize_voices
+        )
+    else:
+        timeline, _ = renderer.get_timeline(conversations, enable_subtitles, voice_settings)
+
+    # セリフ -> セクションの対応（数が合わない場合はセクション情報を使わない）
+    line_sections: List[Optional[int]] = [None] * len(conversations)
+    if sections and sum(len(section.segments) for section in sections) == len(conversations):
+        start = 0
+        for section_index, section in enumerate(sections):
+            for index in range(start, start + len(section.segments)):
+                line_sections[index] = section_index
+            start += len(section.segments)
+
+    if per == "section" and line_sections and line_sections[0] is not None:
+        line_indices = [
+            index
+            for index, section_index in enumerate(line_sections)
+            if index == 0 or line_sections[index - 1] != section_index
+        ]
+    else:
+        line_indices = list(range(len(conversations)))
+
+    storyboard = renderer.render_storyboard(
+        timeline,
+        conversation_mode=conversation_mode,
+        line_indices=line_indices,
+        columns=columns,
+        thumbnail_width=thumbnail_width,
+    )
+
+    frames = []
+    for frame in storyboard["frames"]:
+        index = frame["index"]
+        conv = conversations[index]
+        segment = timeline.segments[index]
+        frames.append({
+            "index": index,
+            "section_index": line_sections[index],
+            "time": round(frame["time"], 3),
+            "start_time": round(segment.start_time, 3),
+            "duration": round(segment.duration, 3),
+            "speaker": conv.get("speaker", "zundamon"),
+            "text": conv.get("text", ""),
+            "duration_source": timeline.duration_sources[index],
+            "image": to_data_url(frame["image"]),
+        })
+
+    elapsed_ms = (time.monotonic() - started) * 1000
+    logger.info(
+        f"Storyboard rendered: {len(frames)} frames from {len(conversations)} lines "
+        f"in {elapsed_ms:.0f}ms"
+    )
+    return {
+        "contact_sheet": (
+            to_data_url(storyboard["contact_sheet"]) if storyboard["contact_sheet"] else None
+        ),
+        "frames": frames,
+        "total_duration": round(timeline.duration, 3),
+        "elapsed_ms": round(elapsed_ms, 1),
+    }
+
+
+def render_frame_at(
+    conversations: List[Dict[str, Any]],
+    current_time: float,
+    enable_subtitles: bool = True,
+    conversation_mode: str = "duo",
+    voice_settings: Optional[Dict[str, Any]] = None,
+    image_format: str = "jpeg",
+    quality: int = 80,
+    profile_name: Optional[str] = None,
+) -> Dict[str, Any]:
+    """台本の指定時刻のフレームを1枚描画する
+
+    Args:
+        conversations: 会話リスト
+        current_time: 描画する時刻（秒）
+        enable_subtitles: 字幕有効化フラグ
+        conversation_mode: 会話モード
+        voice_settings: speed / pitch / intonation
+        image_format: jpeg / webp
+        quality: 画質（1-100）
+        profile_name: 描画プロファイル名（省略時は preview）
+
+    Returns:
+        image（画像データ）・line_index・total_duration・timeline_cached・elapsed_ms
+    """
+    started = time.monotonic()
+    renderer = get_frame_preview_renderer(profile_name or "preview")
+    timeline, timeline_cached = renderer.get_timeline(
+        conversations, enable_subtitles, voice_settings
+    )
+    frame = renderer.render_frame(timeline, current_time, conversation_mode)
+    image = encode_image(frame, image_format, quality)
+    elapsed_ms = (time.monotonic() - started) * 1000
+    logger.debug(f"Frame rendered at t={current_time:.2f}s in {elapsed_ms:.1f}ms")
+    return {
+        "image": image,
+        "line_index": timeline.line_at(current_time),
+        "total_duration": round(timeline.duration, 3),
+        "timeline_cached": timeline_cached,
+        "elapsed_ms": round(elapsed_ms, 1),
+    }
+
+
+def warm_up_frame_preview(profile_name: Optional[str] = None) -> Dict[str, Any]:
+    """プレビューレンダラーを読み込み済みにする（スクラブ画面を開いたときに呼ぶ）"""
+    started = time.monotonic()
+    renderer = get_frame_preview_renderer(profile_name or "preview")
+    return {
+        "profile": renderer.profile.name,
+        "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+    }
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_frame_render_executor() -> ThreadPoolExecutor:
+    """フレーム描画用のスレッドプールを取得"""
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=FRAME_RENDER_CONCURRENCY, thread_name_prefix="frame"
+                )
+    return _executor
+
+
+async def run_frame_render(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """同期の描画処理をスレッドプールで実行して結果を待つ"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_frame_render_executor(), functools.partial(func, *args, **kwargs)
+    )
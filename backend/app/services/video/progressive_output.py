@@ -0,0 +1,284 @@
+"""描画中の動画を HLS（fMP4 セグメント）として逐次書き出す
+
+音声をすべて合成し終えてから描画する場合（ステージ分割チェーンなど）は、BGMを含む
+最終音声を描画前に作成できる。描画したフレームを ffmpeg へパイプで渡し、その音声と
+一緒に数秒ごとのセグメントへエンコードしてプレイリストに追記していくため、
+描画開始から数秒で冒頭を再生できる。描画完了後はセグメントをストリームコピーで
+faststart の MP4 にまとめる。
+
+プレイリストは outputs/previews/<job_id>/ に置き、/outputs から配信する。
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from moviepy.config import FFMPEG_BINARY
+
+from app.config.app import WORKER_CONFIG, Paths, Rendition, RenderProfile
+from app.services.video.video_generator_utils import (
+    AUDIO_CHANNELS,
+    AUDIO_CODEC,
+    AUDIO_SAMPLE_RATE,
+    VIDEO_CODEC,
+    rendition_codec_args,
+    video_ffmpeg_params,
+)
+
+logger = logging.getLogger(__name__)
+
+PLAYLIST_NAME = "index.m3u8"
+
+
+class ProgressiveHlsWriter:
+    """フレームを ffmpeg に渡して HLS セグメントを書き出すライター
+
+    cv2.VideoWriter と同じ write / release / isOpened を持つため、
+    FrameGenerator.render_frame_range の書き込み先としてそのまま使える。
+    renditions を指定すると、同じフレーム列を split で分岐して追加出力も同時に書き出す。
+    """
+
+    def __init__(
+        self,
+        playlist_path: str,
+        fps: int,
+        resolution: Tuple[int, int],
+        audio_path: Optional[str] = None,
+        profile: Optional[RenderProfile] = None,
+        segment_seconds: Optional[float] = None,
+        renditions: Optional[List[Tuple[Rendition, str]]] = None,
+    ):
+        self.playlist_path = playlist_path
+        self.resolution = resolution
+        self.frames_written = 0
+        segment_seconds = segment_seconds or WORKER_CONFIG.hls_segment_seconds
+        output_dir = os.path.dirname(playlist_path)
+        os.makedirs(output_dir, exist_ok=True)
+
+        width, height = resolution
+        cmd = [
+            FFMPEG_BINARY, "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "bgr24",
+            "-s", f"{width}x{height}", "-r", str(fps),
+            "-i", "pipe:0",
+        ]
+        if audio_path:
+            cmd += ["-i", audio_path]
+        renditions = renditions or []
+        video_map = "0:v"
+        if renditions:
+            count = len(renditions) + 1
+            filters = [f"[0:v]split={count}" + "".join(f"[s{i}]" for i in range(count))]
+            filters.append("[s0]null[v0]")
+            for i, (rendition, _) in enumerate(renditions, start=1):
+                filters.append(f"[s{i}]scale=-2:{rendition.height}:flags=bicubic[v{i}]")
+            cmd += ["-filter_complex", ";".join(filters)]
+            video_map = "[v0]"
+        cmd += ["-map", video_map]
+        if audio_path:
+            cmd += ["-map", "1:a"]
+        cmd += [
+            "-c:v", VIDEO_CODEC, *video_ffmpeg_params(profile),
+            # セグメントの境界でキーフレームを入れ、各セグメントを単独で再生できるようにする
+            "-force_key_frames", f"expr:gte(t,n_forced*{segment_seconds})",
+            "-sc_threshold", "0",
+        ]
+        if audio_path:
+            cmd += [
+                "-c:a", AUDIO_CODEC,
+                "-ar", str(AUDIO_SAMPLE_RATE),
+                "-ac", str(AUDIO_CHANNELS),
+                "-shortest",
+            ]
+        cmd += [
+            "-f", "hls",
+            "-hls_time", str(segment_seconds),
+            "-hls_playlist_type", "event",
+            "-hls_segment_type", "fmp4",
+            "-hls_fmp4_init_filename", "init.mp4",
+            "-hls_segment_filename", os.path.join(output_dir, "segment_%05d.m4s"),
+            "-hls_flags", "independent_segments+temp_file",
+            playlist_path,
+        ]
+        for i, (rendition, output_path) in enumerate(renditions, start=1):
+            cmd += ["-map", f"[v{i}]"]
+            if audio_path:
+                cmd += ["-map", "1:a"]
+            cmd += [*rendition_codec_args(rendition, profile), "-shortest", output_path]
+        self._process = subprocess.Popen(
+            cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+
+    def isOpened(self) -> bool:
+        return self._process.poll() is None
+
+    def write(self, frame: np.ndarray):
+        """1フレームを書き込む（BGR、解像度はプロファイルどおり）"""
+        self._process.stdin.write(np.ascontiguousarray(frame[:, :, :3]).tobytes())
+        self.frames_written += 1
+
+    def release(self):
+        """入力を閉じてエンコードの完了を待つ"""
+        if self._process.stdin and not self._process.stdin.closed:
+            try:
+                self._process.stdin.close()
+            except BrokenPipeError:
+                pass
+        _, stderr = self._process.communicate()
+        if self._process.returncode != 0:
+            raise RuntimeError(
+                f"HLS encoding failed: {stderr.decode('utf-8', 'replace').strip()[:300]}"
+            )
+
+
+def _is_finished_preview(preview_dir: str) -> bool:
+    """プレイリストが閉じられている（描画が完了した）プレビューか"""
+    playlist_path = os.path.join(preview_dir, PLAYLIST_NAME)
+    try:
+        with open(playlist_path, encoding="utf-8") as f:
+            return "#EXT-X-ENDLIST" in f.read()
+    except OSError:
+        return False
+
+
+def _prune_previews(previews_dir: str) -> None:
+    """完了したプレビューを新しい順に preview_keep 件まで残し、古いものを削除する
+
+    描画中のジョブのプレビューは件数に数えず削除しない。ワーカーの異常終了などで
+    閉じられないまま preview_max_age_hours を過ぎたものだけを放置されたとみなして削除する。
+    """
+    now = time.time()
+    finished = []
+    for name in os.listdir(previews_dir):
+        path = os.path.join(previews_dir, name)
+        if not os.path.isdir(path):
+            continue
+        try:
+            modified = os.path.getmtime(path)
+        except OSError:
+            continue
+        if _is_finished_preview(path):
+            finished.append((modified, path))
+        elif now - modified > WORKER_CONFIG.preview_max_age_hours * 3600:
+            shutil.rmtree(path, ignore_errors=True)
+
+    finished.sort()
+    for _, path in finished[: max(0, len(finished) - WORKER_CONFIG.preview_keep + 1)]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def create_preview_dir(job_id: str) -> str:
+    """ジョブのプレビュー用ディレクトリを作成し、古いプレビューを削除する"""
+    previews_dir = Paths.get_previews_dir()
+    os.makedirs(previews_dir, exist_ok=True)
+    _prune_previews(previews_dir)
+
+    preview_dir = os.path.join(previews_dir, job_id)
+    shutil.rmtree(preview_dir, ignore_errors=True)
+    os.makedirs(preview_dir)
+    return preview_dir
+
+
+def playlist_url(playlist_path: str) -> str:
+    """プレイリストの配信URL（/outputs 配下）"""
+    relative = os.path.relpath(playlist_path, Paths.get_outputs_dir())
+    return "/outputs/" + relative.replace(os.sep, "/")
+
+
+def finalize_hls(playlist_path: str, output_path: str) -> str:
+    """HLS セグメントをストリームコピーで faststart の MP4 にまとめる"""
+    subprocess.run(
+        [
+            FFMPEG_BINARY, "-y", "-loglevel", "error",
+            "-i", playlist_path,
+            "-c", "copy", "-movflags", "+faststart",
+            output_path,
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return output_path
+
+
+def render_progressive(
+    video_generator,
+    job_id: str,
+    conversations: List[Dict[str, Any]],
+    audio_paths: List[Optional[str]],
+    sections,
+    output_path: str,
+    work_dir: str,
+    progress_callback=None,
+    on_playlist=None,
+    enable_subtitles: bool = True,
+    conversation_mode: str = "duo",
+    started_at: Optional[float] = None,
+    animation_seed: Optional[int] = None,
+    renditions: Optional[List[Tuple[Rendition, str]]] = None,
+) -> Optional[Dict[str, Any]]:
+    """合成済みの音声から、HLS を逐次書き出しながら動画を描画する
+
+    Args:
+        video_generator: VideoGenerator
+        job_id: ジョブID（プレビューディレクトリ名）
+        conversations: 会話データリスト
+        audio_paths: 会話順の音声パス（生成失敗はNone）
+        sections: セクション情報（VideoSection のリスト）
+        output_path: 最終動画（faststart MP4）の出力先
+        work_dir: ジョブ作業ディレクトリ（最終音声の作成先）
+        progress_callback: 描画の進捗コールバック
+        on_playlist: プレイリストの配信URLを受け取るコールバック（描画開始前に呼ばれる）
+        enable_subtitles, conversation_mode, started_at, animation_seed:
+            render_conversation_timeline を参照
+        renditions: 同時に書き出す追加出力（レンディション, 出力先）のリスト
+
+    Returns:
+        タイムライン情報に video_path・playlist_url を加えたもの。失敗時はNone
+    """
+    analysis_cache: Dict[str, Tuple[List[float], float]] = {}
+    audio_path = video_generator.write_timeline_audio(
+        audio_paths,
+        sections,
+        os.path.join(work_dir, "mixed_audio.m4a"),
+        analysis_cache=analysis_cache,
+    )
+    if audio_path is None:
+        return None
+
+    playlist_path = os.path.join(create_preview_dir(job_id), PLAYLIST_NAME)
+    url = playlist_url(playlist_path)
+    if on_playlist:
+        on_playlist(url)
+
+    writer = ProgressiveHlsWriter(
+        playlist_path,
+        video_generator.fps,
+        video_generator.video_processor.resolution,
+        audio_path=audio_path,
+        profile=video_generator.profile,
+        renditions=renditions,
+    )
+    timeline = video_generator.render_conversation_timeline(
+        conversations=conversations,
+        audio_stream=enumerate(audio_paths),
+        temp_video_path=playlist_path,
+        progress_callback=progress_callback,
+        enable_subtitles=enable_subtitles,
+        conversation_mode=conversation_mode,
+        sections=sections,
+        started_at=started_at,
+        analysis_cache=analysis_cache,
+        animation_seed=animation_seed,
+        writer=writer,
+    )
+    if timeline is None:
+        return None
+
+    finalize_hls(playlist_path, output_path)
+    logger.info(f"Progressive output finalized: {output_path} (playlist={url})")
+    return {**timeline, "video_path": output_path, "playlist_url": url}
@@ -0,0 +1,330 @@
+"""レンダリングせずにジョブのコストを見積もる（ドライラン）
+
+動画生成と同じ入力から、実際の描画・音声合成を行わずに次を求める。
+
+- 動画の長さとフレーム数: キャッシュ済みのセリフ音声があればその長さ、
+  なければ読みの文字数から推定した長さを使う。キャッシュ済みのセクションクリップは
+  クリップ自体の長さ（描画時に保存した情報）を使う
+- 必要なアセット（背景・キャラクターの表情画像・BGM・フォント）と不足しているもの
+- 利用できるキャッシュ（セリフ音声・セクションクリップ・締めくくりクリップ）
+- 所要時間: 記録済みジョブの実時間比（render_stats）から、描画が必要な長さを割って求める
+
+スケジューラーや画面での完了予測・受付判断に使う。
+"""
+
+import logging
+import os
+import time
+import wave
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import Backgrounds, Characters
+from app.config.app import WORKER_CONFIG, Paths, get_render_profile
+from app.config.content_config.closing_section import create_closing_section
+from app.config.resource_config.bgm_library import get_bgm_file_path
+from app.services.video.frame_info_builder import CHARACTER_NAME_MAP
+from app.services.video.frame_preview import estimate_line_duration
+from app.services.video.render_stats import read_render_stats
+from app.services.video.section_clip_cache import (
+    get_section_clip_cache,
+    split_conversations_by_section,
+)
+from app.services.video.template_clip_cache import get_template_clip_cache
+from app.services.video.video_job import (
+    prepare_job_inputs,
+    section_to_conversations,
+    to_renditions,
+    to_video_sections,
+)
+
+logger = logging.getLogger(__name__)
+
+# 字幕の描画に使うフォント（video_processor_subtitle と同じ）
+SUBTITLE_FONT = "NotoSansJP-Black.ttf"
+
+
+def _wav_duration(path: str) -> Optional[float]:
+    """WAVファイルの長さ（秒）をヘッダから取得する"""
+    try:
+        with wave.open(path, "rb") as f:
+            return f.getnframes() / float(f.getframerate())
+    except (OSError, EOFError, wave.Error, ZeroDivisionError):
+        return None
+
+
+def _line_durations(
+    conversations: List[Dict[str, Any]], voice_settings: Dict[str, Any]
+) -> Tuple[List[float], List[str]]:
+    """セリフごとの長さと、その出どころ（cached / estimated）"""
+    line_cache = get_section_clip_cache().line_cache
+    durations: List[float] = []
+    sources: List[str] = []
+    for conv in conversations:
+        duration = None
+        hit = line_cache.peek(line_cache.key(conv, voice_settings))
+        if hit:
+            wav_path, analysis = hit
+            duration = analysis[1] if analysis else _wav_duration(wav_path)
+        if duration:
+            durations.append(duration)
+            sources.append("cached")
+        else:
+            durations.append(estimate_line_duration(conv, voice_settings.get("speed")))
+            sources.append("estimated")
+    return durations, sources
+
+
+def _character_expressions(conv: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """セリフで表示するキャラクターと表情（frame_info_builder と同じ優先順位）"""
+    speaker = CHARACTER_NAME_MAP.get(conv.get("speaker", "zundamon"), conv.get("speaker"))
+    visible = [
+        CHARACTER_NAME_MAP.get(name, name)
+        for name in conv.get("visible_characters") or [speaker, "zundamon"]
+    ]
+    expressions = {
+        CHARACTER_NAME_MAP.get(name, name): value
+        for name, value in (conv.get("character_expressions") or {}).items()
+    }
+    if speaker != "narrator" and speaker not in visible:
+        visible.append(speaker)
+
+    result = []
+    for name in visible:
+        if name == "narrator":
+            continue
+        if name in expressions:
+            expression = expressions[name]
+        elif name == speaker:
+            expression = conv.get("expression", "normal")
+        else:
+            expression = "normal"
+        result.append((name, expression))
+    return result
+
+
+def _required_assets(
+    conversations: List[Dict[str, Any]], sections, enable_subtitles: bool
+) -> List[Dict[str, Any]]:
+    """必要なアセットと利用可否の一覧"""
+    assets: List[Dict[str, Any]] = []
+
+    bg_dir = Paths.get_backgrounds_dir()
+    available_backgrounds = set()
+    if os.path.isdir(bg_dir):
+        extensions = Backgrounds.get_supported_extensions()
+        for filename in os.listdir(bg_dir):
+            stem, ext = os.path.splitext(filename)
+            if ext.lower() in extensions:
+                available_backgrounds.add(stem)
+    backgrounds = {conv.get("background", "default") for conv in conversations}
+    backgrounds.update(section.scene_background for section in sections or [])
+    for name in sorted(backgrounds):
+        available = name in available_backgrounds or (
+            name == "default" and bool(available_backgrounds)
+        )
+        assets.append({
+            "type": "background",
+            "name": name,
+            "available": available,
+            # 見つからない背景は default で描画される
+            "fallback": None if available else "default",
+        })
+
+    characters = Characters.get_all()
+    pairs = sorted({pair for conv in conversations for pair in _character_expressions(conv)})
+    for name, expression in pairs:
+        char_dir = Paths.get_character_dir(name)
+        available = name in characters and os.path.exists(
+            os.path.join(char_dir, expression, f"{expression}_closed.png")
+        )
+        # 見つからない表情は normal で描画される
+        fallback = None
+        if not available and expression != "normal" and os.path.exists(
+            os.path.join(char_dir, "normal", "normal_closed.png")
+        ):
+            fallback = f"{name}/normal"
+        assets.append({
+            "type": "character",
+            "name": f"{name}/{expression}",
+            "available": available,
+            "fallback": fallback,
+        })
+
+    for bgm_id in sorted({section.bgm_id for section in sections or []} - {"none"}):
+        assets.append({
+            "type": "bgm",
+            "name": bgm_id,
+            "available": get_bgm_file_path(bgm_id) is not None,
+            "fallback": None,
+        })
+
+    if enable_subtitles:
+        assets.append({
+            "type": "font",
+            "name": SUBTITLE_FONT,
+            "available": os.path.exists(os.path.join(Paths.get_fonts_dir(), SUBTITLE_FONT)),
+            "fallback": None,
+        })
+    return assets
+
+
+def estimate_render(
+    conversations: List[Dict[str, Any]],
+    sections: Optional[List[Dict[str, Any]]] = None,
+    enable_subtitles: bool = True,
+    conversation_mode: str = "duo",
+    speed: Optional[float] = None,
+    pitch: Optional[float] = None,
+    intonation: Optional[float] = None,
+    animation_seed: Optional[int] = None,
+    render_profile: Optional[str] = None,
+    progressive: bool = False,
+    renditions: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """動画生成ジョブを描画せずに見積もる
+
+    引数は generate_video_task と同じ。締めくくりセクション・セクションクリップの扱いも
+    タスクと同じ条件で判定する。
+
+    Returns:
+        total_duration・frame_count・lines・sections・closing・cache・assets・
+        missing_assets・estimate（所要時間の見積もり）・elapsed_ms
+    """
+    started = time.monotonic()
+    profile = get_render_profile(render_profile)
+    render_settings = {
+        "enable_subtitles": enable_subtitles,
+        "conversation_mode": conversation_mode,
+        "speed": speed,
+        "pitch": pitch,
+        "intonation": intonation,
+        "animation_seed": animation_seed,
+        "render_profile": profile.name,
+    }
+    voice_settings = {"speed": speed, "pitch": pitch, "intonation": intonation}
+    rendition_list = to_renditions(renditions)
+
+    # 締めくくりは、追加出力がなければ事前レンダリング済みクリップを連結する
+    use_closing_clip = WORKER_CONFIG.template_clip_cache and not rendition_list
+    conversations_with_closing, section_dicts = prepare_job_inputs(
+        conversations, sections, include_closing=not use_closing_clip
+    )
+    video_sections = to_video_sections(section_dicts) or []
+
+    durations, sources = _line_durations(conversations_with_closing, voice_settings)
+
+    # セクションクリップは単一タスク・ステージ分割のどちらでも、追加出力・逐次出力がなければ使われる
+    section_results: List[Dict[str, Any]] = []
+    chunks = None
+    if (
+        WORKER_CONFIG.section_render_cache
+        and video_sections
+        and not rendition_list
+        and not progressive
+    ):
+        chunks = split_conversations_by_section(conversations_with_closing, video_sections)
+    if chunks is not None:
+        cache = get_section_clip_cache()
+        start = 0
+        for index, (section, chunk) in enumerate(zip(video_sections, chunks)):
+            clip_path = cache.clip_path(section, render_settings, chunk)
+            cached = os.path.exists(clip_path)
+            duration = cache.clip_info(clip_path, render_settings)["duration"] if cached else 0.0
+            if not duration:
+                duration = sum(durations[start:start + len(chunk)])
+            section_results.append({
+                "index": index,
+                "section_key": section.section_key,
+                "section_name": section.section_name,
+                "duration": round(duration, 3),
+                "cached": cached,
+            })
+            start += len(chunk)
+        main_duration = sum(section["duration"] for section in section_results)
+        render_duration = sum(
+            section["duration"] for section in section_results if not section["cached"]
+        )
+    else:
+        main_duration = render_duration = sum(durations)
+
+    closing = None
+    asset_conversations, asset_sections = conversations_with_closing, list(video_sections)
+    if use_closing_clip:
+        closing_section = create_closing_section()
+        closing_conversations = section_to_conversations(closing_section)
+        asset_conversations = asset_conversations + closing_conversations
+        asset_sections.append(closing_section)
+        template_cache = get_template_clip_cache()
+        clip_path = template_cache.clip_path(closing_section, render_settings)
+        cached = os.path.exists(clip_path)
+        duration = (
+            template_cache.clip_info(clip_path, render_settings)["duration"] if cached else 0.0
+        )
+        if not duration:
+            duration = sum(
+                estimate_line_duration(conv, speed) for conv in closing_conversations
+            )
+        closing = {"duration": round(duration, 3), "cached": cached}
+        if not cached:
+            render_duration += duration
+
+    total_duration = main_duration + (closing["duration"] if closing else 0.0)
+    assets = _required_assets(asset_conversations, asset_sections, enable_subtitles)
+    missing_assets = [asset for asset in assets if not asset["available"]]
+
+    # 記録済みジョブの実時間比（動画の長さ / 処理時間）で描画が必要な長さを割る
+    stats = read_render_stats(profile.name)
+    estimated_seconds = encode_seconds = None
+    if stats["realtime_factor"]:
+        estimated_seconds = render_duration / stats["realtime_factor"]
+        if stats["encode_factor"]:
+            encode_seconds = min(estimated_seconds, render_duration / stats["encode_factor"])
+
+    voices_cached = sources.count("cached")
+    elapsed_ms = (time.monotonic() - started) * 1000
+    logger.info(
+        f"Render estimate: {total_duration:.1f}s video, render={render_duration:.1f}s, "
+        f"voices cached={voices_cached}/{len(sources)}, "
+        f"missing assets={len(missing_assets)}, eta={estimated_seconds} ({elapsed_ms:.0f}ms)"
+    )
+    return {
+        "render_profile": profile.name,
+        "total_duration": round(total_duration, 3),
+        "frame_count": int(round(total_duration * profile.fps)),
+        "fps": profile.fps,
+        "resolution": list(profile.resolution),
+        "duration_source": (
+            "cached" if sources and voices_cached == len(sources) else
+            "estimated" if voices_cached == 0 else "mixed"
+        ),
+        "lines": [
+            {"index": index, "duration": round(duration, 3), "duration_source": source}
+            for index, (duration, source) in enumerate(zip(durations, sources))
+        ],
+        "sections": section_results,
+        "closing": closing,
+        "cache": {
+            "voices_cached": voices_cached,
+            "voices_total": len(sources),
+            "sections_cached": sum(1 for section in section_results if section["cached"]),
+            "sections_total": len(section_results),
+            "closing_cached": closing["cached"] if closing else None,
+        },
+        "assets": assets,
+        "missing_assets": missing_assets,
+        "estimate": {
+            "render_duration": round(render_duration, 3),
+            "estimated_seconds": (
+                round(estimated_seconds, 1) if estimated_seconds is not None else None
+            ),
+            "render_seconds": (
+                round(estimated_seconds - (encode_seconds or 0.0), 1)
+                if estimated_seconds is not None else None
+            ),
+            "encode_seconds": round(encode_seconds, 1) if encode_seconds is not None else None,
+            "realtime_factor": stats["realtime_factor"],
+            "samples": stats["samples"],
+            "calibrated": stats["realtime_factor"] is not None,
+        },
+        "elapsed_ms": round(elapsed_ms, 1),
+    }
@@ -0,0 +1,115 @@
+"""描画プロファイルごとの処理速度の記録
+
+ジョブごとに「動画の長さ / 処理時間」（実時間比）を記録し、プロファイルごとの
+移動平均を保持する。preview などのプロファイルで描画したときに、
+デフォルトプロファイルと比べて何倍速かを結果に含めるために使う。
+エンコード単体の実時間比と記録件数も保持し、レンダリング前の所要時間の見積もりに使う。
+"""
+
+import fcntl
+import json
+import logging
+import os
+from typing import Any, Dict, Optional
+
+from app.config.app import DEFAULT_RENDER_PROFILE, Paths
+
+logger = logging.getLogger(__name__)
+
+# 移動平均の重み（新しいジョブの比率）
+STATS_SMOOTHING = 0.3
+
+# エンコード単体の実時間比・記録件数を保持するキー（プロファイル名と重ならない名前）
+ENCODE_STATS_KEY = "_encode"
+SAMPLES_STATS_KEY = "_samples"
+
+
+def _stats_path() -> str:
+    return os.path.join(Paths.get_temp_dir(), "render_stats.json")
+
+
+def _smooth(previous: Optional[float], value: float) -> float:
+    if previous is None:
+        return value
+    return previous * (1 - STATS_SMOOTHING) + value * STATS_SMOOTHING
+
+
+def record_render(
+    profile_name: str,
+    video_seconds: float,
+    elapsed_seconds: float,
+    encode_seconds: Optional[float] = None,
+) -> Dict[str, Any]:
+    """ジョブの処理速度を記録し、実時間比とデフォルト比の倍率を返す
+
+    Args:
+        profile_name: 描画プロファイル名
+        video_seconds: 生成した動画の長さ（秒）
+        elapsed_seconds: ジョブの処理時間（秒）
+        encode_seconds: 最終エンコードにかかった時間（秒、計測していない場合はNone）
+
+    Returns:
+        realtime_factor（実時間比）, speedup_vs_default（デフォルトの移動平均との比。記録がなければNone）
+    """
+    realtime_factor: Optional[float] = None
+    if video_seconds > 0 and elapsed_seconds > 0:
+        realtime_factor = video_seconds / elapsed_seconds
+
+    speedup = None
+    path = _stats_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a+", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.seek(0)
+            try:
+                stats = json.loads(f.read() or "{}")
+            except ValueError:
+                stats = {}
+
+            if realtime_factor is not None:
+                stats[profile_name] = _smooth(stats.get(profile_name), realtime_factor)
+                samples = stats.setdefault(SAMPLES_STATS_KEY, {})
+                samples[profile_name] = samples.get(profile_name, 0) + 1
+                if encode_seconds and encode_seconds > 0:
+                    encode_stats = stats.setdefault(ENCODE_STATS_KEY, {})
+                    encode_stats[profile_name] = _smooth(
+                        encode_stats.get(profile_name), video_seconds / encode_seconds
+                    )
+                f.seek(0)
+                f.truncate()
+                json.dump(stats, f)
+
+            baseline = stats.get(DEFAULT_RENDER_PROFILE)
+            if realtime_factor is not None and baseline:
+                speedup = realtime_factor / baseline
+    except OSError as e:
+        logger.warning(f"Could not update render stats: {e}")
+
+    return {
+        "realtime_factor": round(realtime_factor, 3) if realtime_factor else None,
+        "speedup_vs_default": round(speedup, 2) if speedup else None,
+    }
+
+
+def read_render_stats(profile_name: str) -> Dict[str, Any]:
+    """記録済みの処理速度を取得する
+
+    Args:
+        profile_name: 描画プロファイル名
+
+    Returns:
+        realtime_factor（ジョブ全体の実時間比）, encode_factor（エンコード単体の実時間比）,
+        samples（記録件数）。記録がない項目はNone / 0
+    """
+    try:
+        with open(_stats_path(), "r", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_SH)
+            stats = json.loads(f.read() or "{}")
+    except (OSError, ValueError):
+        stats = {}
+    return {
+        "realtime_factor": stats.get(profile_name),
+        "encode_factor": stats.get(ENCODE_STATS_KEY, {}).get(profile_name),
+        "samples": stats.get(SAMPLES_STATS_KEY, {}).get(profile_name, 0),
+    }
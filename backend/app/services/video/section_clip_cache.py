@@ -0,0 +1,609 @@
+"""セクション単位のレンダリング成果物キャッシュ
+
+セクションごとに音声合成・口パク解析・描画・エンコードを行い、最終動画と同じ
+エンコード設定のクリップとしてキャッシュする。ジョブは各セクションのクリップを
+ffmpeg の concat（映像はストリームコピー）で連結するため、台本の一部を直した再レンダリングでは
+変更のあったセクションだけを作り直せばよい。
+
+- クリップ: セクション内容・会話・描画設定・エンコード設定と、参照するアセット
+  （背景・キャラクター画像・BGM・フォント）と設定ファイルの更新時刻から計算したキーで保存する。
+  クリップの長さ・フレーム数は描画時にクリップと同じ名前のJSONへ保存し、再利用時はそれを返す
+- セリフ音声: 話者・読み・音声パラメータをキーに、音声ファイルと口パク解析結果を保存する。
+  作り直すセクションでも変更のないセリフは音声合成・解析を省略する
+"""
+
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import time
+import uuid
+from dataclasses import asdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.config.app import SUBTITLE_CONFIG, WORKER_CONFIG, Paths, get_render_profile
+from app.config.content_config import characters, closing_section
+from app.config.resource_config import bgm_library
+from app.config.resource_config.bgm_library import get_bgm_file_path
+from app.models.scripts.common import VideoSection
+from app.services.video.video_generator_utils import (
+    concat_videos,
+    encode_settings,
+    probe_duration,
+)
+from app.services.video.video_job import section_to_conversations
+from app.utils_legacy.files import JobWorkspace
+
+logger = logging.getLogger(__name__)
+
+# 描画処理自体の変更でクリップを作り直したい場合に上げる
+SECTION_CLIP_VERSION = 1
+
+# 音声キャッシュのキーに含める会話の項目
+VOICE_KEY_FIELDS = ("speaker", "text", "text_for_voicevox")
+
+
+def _file_fingerprint(paths: List[str]) -> List[List[Any]]:
+    """ファイルの (パス, サイズ, 更新時刻) の一覧"""
+    fingerprint = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            fingerprint.append([path, stat.st_size, stat.st_mtime_ns])
+        except OSError:
+            fingerprint.append([path, None, None])
+    return fingerprint
+
+
+def _hash_payload(payload: Dict[str, Any]) -> str:
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+def _safe_name(name: Optional[str]) -> str:
+    """ファイル名に使えるよう記号を置き換える"""
+    return re.sub(r"[^\w-]", "_", name or "section")
+
+
+def _clip_info_path(clip_path: str) -> str:
+    """クリップの長さ・フレーム数を保存するファイル"""
+    return os.path.splitext(clip_path)[0] + ".json"
+
+
+def _evict_oldest(paths: List[str], max_entries: int, companions=()) -> None:
+    """最終利用時刻の古い順に削除して上限内に収める"""
+    paths.sort(key=lambda path: os.path.getmtime(path), reverse=True)
+    for path in paths[max_entries:]:
+        for target in (path, *(path + suffix for suffix in companions)):
+            if not os.path.exists(target):
+                continue
+            try:
+                os.remove(target)
+            except OSError as e:
+                logger.warning(f"Could not evict cache file {target}: {e}")
+
+
+class LineAudioCache:
+    """セリフ単位の音声・口パク解析結果のキャッシュ"""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: Optional[int] = None):
+        self.cache_dir = cache_dir or os.path.join(Paths.get_section_clips_dir(), "lines")
+        self.max_entries = max_entries or WORKER_CONFIG.line_audio_cache_max
+
+    def key(self, conversation: Dict[str, Any], voice_settings: Dict[str, Any]) -> str:
+        """セリフの読み・話者・音声パラメータからキーを計算"""
+        return _hash_payload({
+            "line": {field: conversation.get(field) for field in VOICE_KEY_FIELDS},
+            "voice": voice_settings,
+            "characters": _file_fingerprint([characters.__file__]),
+        })
+
+    def get(self, key: str) -> Optional[Tuple[str, Optional[Tuple[List[float], float]]]]:
+        """キャッシュ済みの (音声パス, 口パク解析結果) を取得（最終利用時刻を更新する）"""
+        hit = self.peek(key)
+        if hit:
+            os.utime(hit[0])
+        return hit
+
+    def peek(self, key: str) -> Optional[Tuple[str, Optional[Tuple[List[float], float]]]]:
+        """最終利用時刻を更新せずに (音声パス, 口パク解析結果) を取得（見積もり用）"""
+        wav_path = os.path.join(self.cache_dir, f"{key}.wav")
+        if not os.path.exists(wav_path):
+            return None
+        analysis = None
+        try:
+            with open(os.path.join(self.cache_dir, f"{key}.json"), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            analysis = (data["intensities"], data["duration"])
+        except (OSError, ValueError, KeyError):
+            pass
+        return wav_path, analysis
+
+    def put_audio(self, key: str, audio_path: str) -> None:
+        """合成した音声を保存"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = os.path.join(self.cache_dir, f"{key}.{uuid.uuid4().hex[:8]}.tmp")
+        shutil.copyfile(audio_path, tmp_path)
+        os.replace(tmp_path, os.path.join(self.cache_dir, f"{key}.wav"))
+
+    def put_analysis(self, key: str, analysis: Tuple[List[float], float]) -> None:
+        """口パク解析結果を保存"""
+        intensities, duration = analysis
+        if not intensities or duration <= 0:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = os.path.join(self.cache_dir, f"{key}.{uuid.uuid4().hex[:8]}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"intensities": intensities, "duration": duration}, f)
+        os.replace(tmp_path, os.path.join(self.cache_dir, f"{key}.json"))
+
+    def prune(self) -> None:
+        """古い音声を削除して上限内に収める"""
+        try:
+            wavs = [
+                os.path.join(self.cache_dir, name)
+                for name in os.listdir(self.cache_dir)
+                if name.endswith(".wav")
+            ]
+        except OSError:
+            return
+        _evict_oldest(wavs, self.max_entries)
+        # 音声が削除された解析結果を片付ける
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                stem = os.path.join(self.cache_dir, name[: -len(".json")])
+                if not os.path.exists(stem + ".wav"):
+                    try:
+                        os.remove(stem + ".json")
+                    except OSError:
+                        pass
+
+
+class SectionClipCache:
+    """セクション単位のレンダリング済みクリップのキャッシュ"""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        line_cache: Optional[LineAudioCache] = None,
+    ):
+        self.cache_dir = cache_dir or Paths.get_section_clips_dir()
+        self.max_entries = max_entries or WORKER_CONFIG.section_clip_cache_max
+        self.line_cache = line_cache
+
+    def cache_key(
+        self,
+        section: VideoSection,
+        render_settings: Dict[str, Any],
+        conversations: Optional[List[Dict[str, Any]]] = None,
+    ) -> str:
+        """セクション内容・設定・アセットからキャッシュキーを計算"""
+        profile = get_render_profile(render_settings.get("render_profile"))
+        return _hash_payload({
+            "version": SECTION_CLIP_VERSION,
+            "section": section.model_dump(),
+            "conversations": conversations,
+            "render": render_settings,
+            "profile": asdict(profile),
+            "subtitle": SUBTITLE_CONFIG.__dict__,
+            "encode": encode_settings(profile),
+            "assets": self._asset_fingerprint(section),
+        })
+
+    def clip_path(
+        self,
+        section: VideoSection,
+        render_settings: Dict[str, Any],
+        conversations: Optional[List[Dict[str, Any]]] = None,
+    ) -> str:
+        """セクションのクリップの保存先（存在するとは限らない）"""
+        key = self.cache_key(section, render_settings, conversations)
+        return os.path.join(self.cache_dir, f"{_safe_name(section.section_key)}_{key}.mp4")
+
+    def clip_info(self, clip_path: str, render_settings: Dict[str, Any]) -> Dict[str, Any]:
+        """クリップの長さ（秒）とフレーム数
+
+        描画時に保存した情報を読む。ない場合（旧バージョンのクリップ）は動画ファイルから求める。
+        """
+        try:
+            with open(_clip_info_path(clip_path), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {"duration": float(data["duration"]), "frames": int(data["frames"])}
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        duration = probe_duration(clip_path)
+        fps = get_render_profile(render_settings.get("render_profile")).fps
+        return {"duration": duration, "frames": int(round(duration * fps))}
+
+    def get_or_render(
+        self,
+        section: VideoSection,
+        render_settings: Dict[str, Any],
+        video_generator,
+        conversations: Optional[List[Dict[str, Any]]] = None,
+        progress_callback=None,
+    ) -> Optional[Dict[str, Any]]:
+        """キャッシュ済みクリップを取得し、なければレンダリングする
+
+        複数ワーカーが同時に同じクリップを作らないよう、キーごとのファイルロックで排他する。
+        長さ・フレーム数はクリップ自身の情報を返す（VideoGenerator の状態には依存しない）。
+
+        Args:
+            section: セクション
+            render_settings: enable_subtitles, conversation_mode, speed, pitch, intonation,
+                animation_seed, render_profile
+            video_generator: レンダリングに使う VideoGenerator（render_profile と同じプロファイル）
+            conversations: セクションの会話リスト（省略時はセクションのセグメントから作成）
+            progress_callback: レンダリング時の進捗コールバック
+
+        Returns:
+            {'clip_path', 'duration', 'frames', 'reused'}。レンダリングに失敗した場合はNone
+        """
+        clip_path = self.clip_path(section, render_settings, conversations)
+        if os.path.exists(clip_path):
+            os.utime(clip_path)
+            return {
+                "clip_path": clip_path,
+                **self.clip_info(clip_path, render_settings),
+                "reused": True,
+            }
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(clip_path + ".lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                if os.path.exists(clip_path):
+                    # 他のワーカーがレンダリングし終えていた
+                    return {
+                        "clip_path": clip_path,
+                        **self.clip_info(clip_path, render_settings),
+                        "reused": True,
+                    }
+
+                started = time.monotonic()
+                rendered = self._render(
+                    section,
+                    conversations or section_to_conversations(section),
+                    render_settings,
+                    video_generator,
+                    clip_path,
+                    progress_callback,
+                )
+                if rendered is None:
+                    return None
+                logger.info(
+                    f"Section clip rendered: {section.section_key} "
+                    f"({time.monotonic() - started:.1f}s) -> {clip_path}"
+                )
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+        self._prune()
+        return {"clip_path": clip_path, **rendered, "reused": False}
+
+    def lines_to_synthesize(
+        self,
+        sections: List[VideoSection],
+        chunks: List[List[Dict[str, Any]]],
+        render_settings: Dict[str, Any],
+    ) -> List[Tuple[Dict[str, Any], str]]:
+        """描画が必要なセクションのセリフのうち、音声キャッシュにないもの
+
+        ステージ分割チェーンでは音声合成ステージがこれを合成して音声キャッシュへ入れておき、
+        描画ステージの get_or_render はキャッシュ済みの音声を使う。
+
+        Returns:
+            (会話, 音声キャッシュのキー) のリスト（会話順、同じセリフは1つにまとめる）
+        """
+        if not self.line_cache:
+            return []
+        voice_settings = {
+            name: render_settings.get(name) for name in ("speed", "pitch", "intonation")
+        }
+        lines: Dict[str, Dict[str, Any]] = {}
+        for section, conversations in zip(sections, chunks):
+            if os.path.exists(self.clip_path(section, render_settings, conversations)):
+                continue
+            for conv in conversations:
+                key = self.line_cache.key(conv, voice_settings)
+                if key not in lines and not self.line_cache.peek(key):
+                    lines[key] = conv
+        return [(conv, key) for key, conv in lines.items()]
+
+    def _render(
+        self,
+        section: VideoSection,
+        conversations: List[Dict[str, Any]],
+        render_settings: Dict[str, Any],
+        video_generator,
+        clip_path: str,
+        progress_callback=None,
+    ) -> Optional[Dict[str, Any]]:
+        """セクション単体を最終動画と同じ設定でレンダリングする
+
+        Returns:
+            このクリップの {'duration', 'frames'}。失敗した場合はNone
+        """
+        tmp_path = f"{clip_path}.{uuid.uuid4().hex[:8]}.tmp.mp4"
+        analysis_cache: Dict[str, Tuple[List[float], float]] = {}
+        line_keys: Dict[str, str] = {}
+        with JobWorkspace(f"section_{_safe_name(section.section_key)}_{uuid.uuid4().hex[:8]}") as workspace:
+            audio_stream = self._voice_stream(
+                conversations,
+                render_settings,
+                workspace.subdir("voices"),
+                analysis_cache,
+                line_keys,
+            )
+            video_generator.last_timeline = None
+            rendered = video_generator.generate_conversation_video_streaming(
+                conversations=conversations,
+                audio_stream=audio_stream,
+                output_path=tmp_path,
+                progress_callback=progress_callback,
+                enable_subtitles=render_settings.get("enable_subtitles", True),
+                conversation_mode=render_settings.get("conversation_mode", "duo"),
+                sections=[section],
+                work_dir=workspace.root,
+                analysis_cache=analysis_cache,
+                animation_seed=render_settings.get("animation_seed"),
+            )
+            # この描画で作られたタイムライン（呼び出し直後に取り出し、以降は共有状態を参照しない）
+            timeline = video_generator.last_timeline or {}
+
+        if self.line_cache:
+            for audio_path, key in line_keys.items():
+                if audio_path in analysis_cache:
+                    self.line_cache.put_analysis(key, analysis_cache[audio_path])
+            self.line_cache.prune()
+
+        if not rendered or not os.path.exists(tmp_path):
+            logger.error(f"Section clip rendering failed: {section.section_key}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+
+        duration = timeline.get("duration") or probe_duration(tmp_path)
+        frames = timeline.get("frames")
+        if frames is None:
+            frames = int(round(duration * video_generator.profile.fps))
+        info = {"duration": float(duration), "frames": int(frames)}
+        info_tmp_path = f"{_clip_info_path(clip_path)}.{uuid.uuid4().hex[:8]}.tmp"
+        with open(info_tmp_path, "w", encoding="utf-8") as f:
+            json.dump(info, f)
+        # 情報を先に置き、クリップが見えた時点で情報も揃っているようにする
+        os.replace(info_tmp_path, _clip_info_path(clip_path))
+        os.replace(tmp_path, clip_path)
+        return info
+
+    def _voice_stream(
+        self,
+        conversations: List[Dict[str, Any]],
+        render_settings: Dict[str, Any],
+        output_dir: str,
+        analysis_cache: Dict[str, Tuple[List[float], float]],
+        line_keys: Dict[str, str],
+    ) -> Iterator[Tuple[int, Optional[str]]]:
+        """キャッシュ済みのセリフは再利用し、残りだけを音声合成して会話順に返す"""
+        from app.core.asset_generators.voice_generator import VoiceGenerator
+
+        voice_settings = {
+            name: render_settings.get(name) for name in ("speed", "pitch", "intonation")
+        }
+        keys = [
+            self.line_cache.key(conv, voice_settings) if self.line_cache else None
+            for conv in conversations
+        ]
+        cached = {
+            index: hit
+            for index, key in enumerate(keys)
+            if key and (hit := self.line_cache.get(key))
+        }
+        missing = [index for index in range(len(conversations)) if index not in cached]
+        if cached:
+            logger.info(f"Reusing cached voices: {len(cached)}/{len(conversations)} lines")
+
+        synthesized = iter(())
+        if missing:
+            synthesized = VoiceGenerator().stream_conversation_voices(
+                conversations=[conversations[index] for index in missing],
+                output_dir=output_dir,
+                max_workers=WORKER_CONFIG.voice_parallelism,
+                **voice_settings,
+            )
+
+        try:
+            for index in range(len(conversations)):
+                if index in cached:
+                    # 後片付けで削除されるため作業ディレクトリへ複製して渡す
+                    wav_path, analysis = cached[index]
+                    audio_path = os.path.join(output_dir, f"cached_{index:04d}.wav")
+                    shutil.copyfile(wav_path, audio_path)
+                    if analysis:
+                        analysis_cache[audio_path] = analysis
+                    else:
+                        line_keys[audio_path] = keys[index]
+                    yield index, audio_path
+                    continue
+
+                _, audio_path = next(synthesized)
+                if audio_path and keys[index]:
+                    self.line_cache.put_audio(keys[index], audio_path)
+                    line_keys[audio_path] = keys[index]
+                yield index, audio_path
+        finally:
+            close_stream = getattr(synthesized, "close", None)
+            if close_stream:
+                close_stream()
+
+    def _prune(self):
+        """古いクリップを最終利用時刻順に削除して上限内に収める"""
+        try:
+            clips = [
+                os.path.join(self.cache_dir, name)
+                for name in os.listdir(self.cache_dir)
+                if name.endswith(".mp4") and not name.endswith(".tmp.mp4")
+            ]
+        except OSError:
+            return
+        _evict_oldest(clips, self.max_entries, companions=(".lock",))
+        # クリップが削除された情報ファイルを片付ける
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                stem = os.path.join(self.cache_dir, name[: -len(".json")])
+                if not os.path.exists(stem + ".mp4"):
+                    try:
+                        os.remove(stem + ".json")
+                    except OSError:
+                        pass
+
+    @staticmethod
+    def _asset_fingerprint(section: VideoSection) -> List[List[Any]]:
+        """セクションが参照するアセット・設定ファイルの (パス, サイズ, 更新時刻)"""
+        paths: List[str] = []
+
+        bg_dir = Paths.get_backgrounds_dir()
+        if os.path.isdir(bg_dir):
+            for filename in sorted(os.listdir(bg_dir)):
+                stem = os.path.splitext(filename)[0]
+                if stem in (section.scene_background, "default"):
+                    paths.append(os.path.join(bg_dir, filename))
+
+        character_names = {segment.speaker for segment in section.segments}
+        for segment in section.segments:
+            character_names.update(segment.visible_characters)
+        for name in sorted(character_names):
+            char_dir = Paths.get_character_dir(name)
+            if os.path.isdir(char_dir):
+                for root, _, files in os.walk(char_dir):
+                    paths.extend(os.path.join(root, f) for f in sorted(files))
+
+        bgm_path = get_bgm_file_path(section.bgm_id)
+        if bgm_path:
+            paths.append(bgm_path)
+
+        fonts_dir = Paths.get_fonts_dir()
+        if os.path.isdir(fonts_dir):
+            paths.extend(os.path.join(fonts_dir, f) for f in sorted(os.listdir(fonts_dir)))
+
+        paths.extend(
+            module.__file__ for module in (closing_section, characters, bgm_library)
+        )
+        return _file_fingerprint(paths)
+
+
+def split_conversations_by_section(
+    conversations: List[Dict[str, Any]], sections: List[VideoSection]
+) -> Optional[List[List[Dict[str, Any]]]]:
+    """会話リストをセクションのセグメント数で分割（数が合わない場合はNone）"""
+    if sum(len(section.segments) for section in sections) != len(conversations):
+        return None
+    chunks, start = [], 0
+    for section in sections:
+        end = start + len(section.segments)
+        chunks.append(conversations[start:end])
+        start = end
+    return chunks
+
+
+def render_video_by_section(
+    video_generator,
+    conversations: List[Dict[str, Any]],
+    sections: List[VideoSection],
+    render_settings: Dict[str, Any],
+    output_path: str,
+    tail_clips: Optional[List[str]] = None,
+    progress_callback=None,
+) -> Optional[Dict[str, Any]]:
+    """セクションごとのクリップを用意して連結し、最終動画を書き出す
+
+    変更のないセクションはキャッシュ済みクリップをそのまま使い、
+    変更のあったセクションだけをレンダリングする。
+
+    Args:
+        video_generator: レンダリングに使う VideoGenerator
+        conversations: 会話リスト（セクション順）
+        sections: セクション情報
+        render_settings: enable_subtitles, conversation_mode, speed, pitch, intonation
+        output_path: 出力先パス
+        tail_clips: 末尾に連結する事前レンダリング済みクリップ（締めくくりなど）
+        progress_callback: 進捗コールバック（0.0〜1.0、キーワード引数 frames_done 付き）
+
+    Returns:
+        {'video_path', 'sections': [{index, section_key, section_name, reused, duration}],
+        'duration', 'frames'}（長さ・フレーム数は本編のクリップの合計）。
+        セクションと会話の数が合わない場合・失敗時はNone
+    """
+    chunks = split_conversations_by_section(conversations, sections)
+    if chunks is None:
+        logger.warning("Section/conversation count mismatch, skipping per-section render")
+        return None
+
+    cache = get_section_clip_cache()
+    total = max(1, len(sections))
+    frames_offset = 0
+    total_frames = 0
+    total_duration = 0.0
+    clip_paths: List[str] = []
+    results: List[Dict[str, Any]] = []
+
+    for index, (section, section_conversations) in enumerate(zip(sections, chunks)):
+
+        def section_progress(progress: float, frames_done: int = 0, **kwargs):
+            if progress_callback:
+                progress_callback(
+                    (index + min(1.0, progress)) / total,
+                    frames_done=frames_offset + frames_done,
+                )
+
+        clip = cache.get_or_render(
+            section,
+            render_settings,
+            video_generator,
+            conversations=section_conversations,
+            progress_callback=section_progress,
+        )
+        if clip is None:
+            return None
+        if not clip["reused"]:
+            frames_offset += clip["frames"]
+        total_frames += clip["frames"]
+        total_duration += clip["duration"]
+
+        clip_paths.append(clip["clip_path"])
+        results.append({
+            "index": index,
+            "section_key": section.section_key,
+            "section_name": section.section_name,
+            "reused": clip["reused"],
+            "duration": round(clip["duration"], 3),
+        })
+        if progress_callback:
+            progress_callback((index + 1) / total, frames_done=frames_offset)
+
+    concat_videos(clip_paths + list(tail_clips or []), output_path, video_generator.profile)
+    reused_count = sum(1 for result in results if result["reused"])
+    logger.info(
+        f"Per-section render completed: reused={reused_count}/{len(results)} sections"
+    )
+    return {
+        "video_path": output_path,
+        "sections": results,
+        "duration": total_duration,
+        "frames": total_frames,
+    }
+
+
+_section_clip_cache: Optional[SectionClipCache] = None
+
+
+def get_section_clip_cache() -> SectionClipCache:
+    """プロセス内で共有するセクションクリップキャッシュを取得"""
+    global _section_clip_cache
+    if _section_clip_cache is None:
+        _section_clip_cache = SectionClipCache(line_cache=LineAudioCache())
+    return _section_clip_cache
@@ -0,0 +1,63 @@
+"""固定セクション（締めくくりなど）の事前レンダリングクリップ
+
+毎回同じ内容になるセクションは、音声合成・解析・描画・エンコードを一度だけ行い、
+最終動画と同じエンコード設定のクリップとしてキャッシュする。ジョブでは本編のみを
+描画し、キャッシュ済みクリップを ffmpeg の concat（映像はストリームコピー）で末尾に連結する。
+
+キャッシュの仕組みはセクション単位の再レンダリングと共通（section_clip_cache）で、
+テンプレートは本編セクションのクリップに押し出されないよう別ディレクトリに保存する。
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+from app.config.app import WORKER_CONFIG, Paths
+from app.config.content_config.closing_section import create_closing_section
+from app.services.video.section_clip_cache import SectionClipCache
+from app.services.video.video_generator_utils import concat_videos
+
+logger = logging.getLogger(__name__)
+
+
+class TemplateClipCache(SectionClipCache):
+    """固定セクションのレンダリング済みクリップのキャッシュ"""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: Optional[int] = None):
+        super().__init__(
+            cache_dir=cache_dir or Paths.get_template_clips_dir(),
+            max_entries=max_entries or WORKER_CONFIG.template_clip_cache_max,
+        )
+
+    def append_clip(
+        self, main_video_path: str, clip_path: str, output_path: str, profile=None
+    ) -> str:
+        """本編動画の末尾にクリップを連結する"""
+        return concat_videos([main_video_path, clip_path], output_path, profile)
+
+
+_template_clip_cache: Optional[TemplateClipCache] = None
+
+
+def get_template_clip_cache() -> TemplateClipCache:
+    """プロセス内で共有するテンプレートクリップキャッシュを取得"""
+    global _template_clip_cache
+    if _template_clip_cache is None:
+        _template_clip_cache = TemplateClipCache()
+    return _template_clip_cache
+
+
+def get_closing_clip(video_generator, render_settings: Dict[str, Any]) -> Optional[str]:
+    """締めくくりセクションのクリップを取得（無効化されている場合・失敗時はNone）
+
+    None の場合、呼び出し側は締めくくりセクションを本編に含めて描画する。
+    """
+    if not WORKER_CONFIG.template_clip_cache:
+        return None
+    try:
+        clip = get_template_clip_cache().get_or_render(
+            create_closing_section(), render_settings, video_generator
+        )
+        return clip["clip_path"] if clip else None
+    except Exception as e:
+        logger.warning(f"Closing clip unavailable, rendering inline: {e}")
+        return None
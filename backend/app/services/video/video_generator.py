@@ -1,10 +1,11 @@
 import os
 import logging
 import gc
-from typing import List, Dict, Optional
+import time
+from typing import List, Dict, Optional, Iterable, Tuple
 from moviepy import VideoFileClip
 
-from app.config.app import Paths
+from app.config.app import Paths, Rendition, RenderProfile, get_render_profile
 from app.core.processors.audio_processor import AudioProcessor
 from app.core.processors.video_processor import VideoProcessor
 from app.services.resource_manager import ResourceManager
@@ -13,17 +14,26 @@ from app.services.subtitle_generator import SubtitleGenerator
 from app.services.video.frame_generator import FrameGenerator
 from app.services.bgm_mixer import BGMMixer
 from app.services.video.video_generator_utils import (
+    AUDIO_CHANNELS,
+    AUDIO_CODEC,
+    AUDIO_SAMPLE_RATE,
     combine_video_with_audio,
+    encode_renditions,
     calculate_section_durations,
+    compute_animation_seed,
 )
 from app.models.scripts.common import VideoSection
+from app.models.video_models import AudioSegmentInfo, SubtitleData
 from app.utils_legacy.files import FileManager
 
 logger = logging.getLogger(__name__)
 
+# ストリーミング生成時、セクション境界を待たずに描画を進めるタイムライン長（秒）
+STREAM_FLUSH_SECONDS = 20.0
+
 
 class VideoGenerator:
-    def __init__(self):
+    def __init__(self, profile: Optional[RenderProfile] = None):
         # 口パクデバッグ用: ログレベルを一時的にINFOに設定
         for logger_name in [
             "src.services.audio_combiner",
@@ -35,8 +45,11 @@ class VideoGenerator:
         ]:
             logging.getLogger(logger_name).setLevel(logging.INFO)
 
+        # 描画プロファイル（解像度・フレームレート・エンコード設定）
+        self.profile = profile or get_render_profile()
+
         self.audio_processor = AudioProcessor()
-        self.video_processor = VideoProcessor()
+        self.video_processor = VideoProcessor(self.profile)
         self.fps = self.video_processor.fps
 
         # 各処理クラスの初期化
@@ -46,6 +59,11 @@ class VideoGenerator:
         self.frame_generator = FrameGenerator(self.video_processor, self.fps)
         self.bgm_mixer = BGMMixer()
 
+        # 直近のストリーミング生成のタイムライン情報
+        self.last_timeline: Optional[Dict] = None
+        # 直近のレンディション同時エンコードの結果（出力数・所要時間）
+        self.last_encode: Optional[Dict] = None
+
     def generate_conversation_video(
         self,
         conversations: List[Dict],
@@ -55,8 +73,14 @@ class VideoGenerator:
         enable_subtitles: bool = True,
         conversation_mode: str = "duo",
         sections: Optional[List[VideoSection]] = None,
+        work_dir: Optional[str] = None,
+        animation_seed: Optional[int] = None,
     ) -> Optional[str]:
-        """会話動画生成（メイン機能）"""
+        """会話動画生成（メイン機能）
+
+        work_dir を指定した場合、一時動画ファイルはその中に作成される。
+        animation_seed を省略した場合は会話内容から計算する。
+        """
         if not output_path:
             output_path = os.path.join(
                 Paths.get_outputs_dir(), "conversation_video.mp4"
@@ -103,11 +127,13 @@ class VideoGenerator:
                 audio_file_list
             )
 
+            if animation_seed is None:
+                animation_seed = compute_animation_seed(conversations)
             blink_timings = self.resource_manager.generate_blink_timings(
-                actual_total_duration
+                actual_total_duration, seed=animation_seed
             )
 
-            temp_video_path = output_path.replace(".mp4", "_temp.mp4")
+            temp_video_path = self._temp_video_path(output_path, work_dir)
 
             success = self.frame_generator.generate_video_frames(
                 total_frames=total_frames,
@@ -129,7 +155,7 @@ class VideoGenerator:
                 return None
 
             final_output_path = combine_video_with_audio(
-                temp_video_path, combined_audio, output_path
+                temp_video_path, combined_audio, output_path, profile=self.profile
             )
 
             self.audio_combiner.cleanup_audio_clips(combined_audio, audio_clips)
@@ -162,9 +188,622 @@ class VideoGenerator:
                 logger.warning(f"Failed to cleanup audio files on error: {cleanup_error}")
             return None
 
+    def generate_conversation_video_streaming(
+        self,
+        conversations: List[Dict],
+        audio_stream: Iterable[Tuple[int, Optional[str]]],
+        output_path: str = None,
+        progress_callback=None,
+        enable_subtitles: bool = True,
+        conversation_mode: str = "duo",
+        sections: Optional[List[VideoSection]] = None,
+        work_dir: Optional[str] = None,
+        started_at: Optional[float] = None,
+        analysis_cache: Optional[Dict[str, Tuple[List[float], float]]] = None,
+        animation_seed: Optional[int] = None,
+        renditions: Optional[List[Tuple[Rendition, str]]] = None,
+    ) -> Optional[str]:
+        """会話動画生成（ストリーミング版）
+
+        音声が1セリフ生成されるごとに解析してタイムラインへ追加し、
+        確定したセクション分のフレームを後続セリフの音声合成と並行して描画する。
+
+        Args:
+            conversations: 会話データリスト
+            audio_stream: (会話インデックス, 音声パス) を会話順に返すイテラブル
+            output_path: 出力先パス
+            progress_callback: 進捗コールバック（0.0〜1.0、キーワード引数 frames_done 付き）
+            enable_subtitles: 字幕有効化フラグ
+            conversation_mode: 会話モード
+            sections: セクション情報
+            work_dir: ジョブ作業ディレクトリ（一時動画・一時音声の作成先）
+            started_at: ジョブ開始時刻（time.monotonic()）
+            analysis_cache: 音声パス → 口パク解析結果。render_conversation_timeline を参照
+            animation_seed: アニメーションのシード。render_conversation_timeline を参照
+            renditions: 追加出力。encode_conversation_video を参照
+
+        Returns:
+            生成した動画のパス。失敗時はNone。
+            タイムライン情報は self.last_timeline に保持される
+        """
+        if not output_path:
+            output_path = os.path.join(
+                Paths.get_outputs_dir(), "conversation_video.mp4"
+            )
+
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+        temp_video_path = self._temp_video_path(output_path, work_dir)
+        timeline = None
+        self.last_encode = None
+
+        try:
+            timeline = self.render_conversation_timeline(
+                conversations=conversations,
+                audio_stream=audio_stream,
+                temp_video_path=temp_video_path,
+                progress_callback=progress_callback,
+                enable_subtitles=enable_subtitles,
+                conversation_mode=conversation_mode,
+                sections=sections,
+                started_at=started_at,
+                analysis_cache=analysis_cache,
+                animation_seed=animation_seed,
+            )
+            self.last_timeline = timeline
+            if timeline is None:
+                return None
+
+            final_output_path = self.encode_conversation_video(
+                temp_video_path=temp_video_path,
+                audio_file_list=timeline["audio_file_list"],
+                line_section_indices=timeline["line_section_indices"],
+                output_path=output_path,
+                sections=sections,
+                renditions=renditions,
+            )
+
+            if progress_callback:
+                progress_callback(1.0, frames_done=timeline["frames"])
+
+            return final_output_path
+
+        finally:
+            if os.path.exists(temp_video_path):
+                os.remove(temp_video_path)
+            if timeline:
+                try:
+                    FileManager.cleanup_audio_files(timeline["audio_file_list"])
+                except Exception as cleanup_error:
+                    logger.warning(f"Failed to cleanup audio files: {cleanup_error}")
+
+    def render_conversation_timeline(
+        self,
+        conversations: List[Dict],
+        audio_stream: Iterable[Tuple[int, Optional[str]]],
+        temp_video_path: str,
+        progress_callback=None,
+        enable_subtitles: bool = True,
+        conversation_mode: str = "duo",
+        sections: Optional[List[VideoSection]] = None,
+        started_at: Optional[float] = None,
+        analysis_cache: Optional[Dict[str, Tuple[List[float], float]]] = None,
+        animation_seed: Optional[int] = None,
+        writer=None,
+    ) -> Optional[Dict]:
+        """音声を受け取りながらタイムラインを構築し、音声なしの一時動画を描画する
+
+        Args:
+            conversations: 会話データリスト
+            audio_stream: (会話インデックス, 音声パス) を会話順に返すイテラブル
+            temp_video_path: 一時動画の出力先
+            progress_callback: 進捗コールバック（0.0〜1.0、キーワード引数 frames_done 付き）
+            enable_subtitles: 字幕有効化フラグ
+            conversation_mode: 会話モード
+            sections: セクション情報
+            started_at: ジョブ開始時刻（time.monotonic()）。最初のフレームまでの時間計測に使用
+            analysis_cache: 音声パス → (口パク強度, 長さ)。登録済みの音声は解析を省略し、
+                新たに解析した結果は追記する
+            animation_seed: 瞬きなどのアニメーションのシード。省略時は会話内容から計算するため、
+                同じ入力からは常に同じフレームが描画される
+            writer: フレームの書き込み先（write / release を持つもの）。指定時は
+                temp_video_path に一時動画を作らず、このライターに書き込む
+
+        Returns:
+            タイムライン情報（audio_file_list, line_section_indices, duration, frames,
+            time_to_first_frame）。失敗時はNone
+        """
+        out = None
+        if started_at is None:
+            started_at = time.monotonic()
+        time_to_first_frame = None
+        if animation_seed is None:
+            animation_seed = compute_animation_seed(conversations)
+
+        try:
+            character_images = self.resource_manager.load_character_images()
+            backgrounds = self.resource_manager.load_backgrounds()
+
+            if not self.resource_manager.validate_resources(
+                character_images, backgrounds
+            ):
+                return None
+
+            # 会話インデックス -> セクションインデックス
+            section_index_of = []
+            if sections:
+                for section_idx, section in enumerate(sections):
+                    section_index_of.extend([section_idx] * len(section.segments))
+
+            out = writer or self.frame_generator.open_writer(temp_video_path)
+            if out is None:
+                return None
+
+            # タイムライン（音声が確定したセリフのみを保持し、インデックスを揃える）
+            timeline_conversations: List[Dict] = []
+            audio_file_list: List[str] = []
+            segment_audio_intensities: List[AudioSegmentInfo] = []
+            subtitle_lines: List[SubtitleData] = []
+            blink_timings: List = []
+            section_segment_ranges: List[Dict] = []
+            render_state: Dict = {}
+            line_section_indices: List[Optional[int]] = []
+
+            timeline_end = 0.0
+            rendered_until = 0.0
+            rendered_frames = 0
+            total_lines = max(1, len(conversations))
+            lines_done = 0
+            render_seconds = 0.0
+
+            def report(frames_done: Optional[int] = None):
+                """進捗を通知（セリフ単位の進捗 + 描画済みフレーム数）"""
+                if progress_callback:
+                    progress_callback(
+                        min(0.95, lines_done / total_lines),
+                        frames_done=rendered_frames if frames_done is None else frames_done,
+                    )
+
+            def frame_callback(frames_done: int):
+                report(frames_done)
+
+            def flush(until_time: float):
+                """until_timeまでのフレームを描画"""
+                nonlocal rendered_until, rendered_frames, time_to_first_frame, render_seconds
+                end_frame = int(until_time * self.fps)
+                if end_frame <= rendered_frames:
+                    return
+
+                blink_timings.extend(
+                    self.resource_manager.generate_blink_timings(
+                        until_time, start_time=rendered_until, seed=animation_seed
+                    )
+                )
+                flush_started = time.monotonic()
+                rendered_frames += self.frame_generator.render_frame_range(
+                    out,
+                    start_frame=rendered_frames,
+                    end_frame=end_frame,
+                    conversations=timeline_conversations,
+                    audio_file_list=audio_file_list,
+                    segment_audio_intensities=segment_audio_intensities,
+                    backgrounds=backgrounds,
+                    character_images=character_images,
+                    blink_timings=blink_timings,
+                    subtitle_lines=subtitle_lines,
+                    conversation_mode=conversation_mode,
+                    section_segment_ranges=section_segment_ranges,
+                    render_state=render_state,
+                    frame_callback=frame_callback,
+                )
+                render_seconds += time.monotonic() - flush_started
+                rendered_until = until_time
+                if time_to_first_frame is None:
+                    time_to_first_frame = time.monotonic() - started_at
+                    logger.info(f"Time to first rendered frames: {time_to_first_frame:.2f}s")
+
+            for conv_index, audio_path in audio_stream:
+                section_idx = (
+                    section_index_of[conv_index]
+                    if conv_index < len(section_index_of)
+                    else None
+                )
+
+                if audio_path and os.path.exists(audio_path):
+                    if analysis_cache is not None and audio_path in analysis_cache:
+                        intensities, duration = analysis_cache[audio_path]
+                    else:
+                        intensities, duration = (
+                            self.audio_processor.analyze_audio_for_mouth_sync(audio_path)
+                        )
+                        if analysis_cache is not None:
+                            analysis_cache[audio_path] = (intensities, duration)
+                    if intensities and duration > 0:
+                        conv = conversations[conv_index]
+                        self._append_to_timeline(
+                            conv,
+                            audio_path,
+                            intensities,
+                            duration,
+                            timeline_end,
+                            backgrounds,
+                            enable_subtitles,
+                            timeline_conversations,
+                            audio_file_list,
+                            segment_audio_intensities,
+                            subtitle_lines,
+                        )
+                        line_section_indices.append(section_idx)
+                        self._update_section_ranges(
+                            section_segment_ranges,
+                            sections,
+                            section_idx,
+                            len(timeline_conversations) - 1,
+                        )
+                        timeline_end += duration
+                    else:
+                        logger.warning(
+                            f"Skipping line {conv_index}: audio analysis failed ({audio_path})"
+                        )
+                else:
+                    logger.warning(f"Skipping line {conv_index}: no audio generated")
+
+                # セクション境界、または一定長たまった時点で描画を進める
+                next_section_idx = (
+                    section_index_of[conv_index + 1]
+                    if conv_index + 1 < len(section_index_of)
+                    else None
+                )
+                if (
+                    next_section_idx != section_idx
+                    or timeline_end - rendered_until >= STREAM_FLUSH_SECONDS
+                ):
+                    flush(timeline_end)
+
+                lines_done = conv_index + 1
+                report()
+
+            if not audio_file_list:
+                logger.error("No valid audio generated for streaming video")
+                return None
+
+            # 残りのフレームを描画
+            flush(timeline_end)
+            out.release()
+            out = None
+
+            render_fps = rendered_frames / render_seconds if render_seconds > 0 else 0.0
+            logger.info(
+                f"Timeline rendered: frames={rendered_frames}, "
+                f"duration={timeline_end:.3f}s, "
+                f"lines={len(audio_file_list)}/{len(conversations)}, "
+                f"render_fps={render_fps:.1f}"
+            )
+            return {
+                "audio_file_list": audio_file_list,
+                "line_section_indices": line_section_indices,
+                "duration": timeline_end,
+                "frames": rendered_frames,
+                "time_to_first_frame": time_to_first_frame,
+                "render_fps": render_fps,
+            }
+
+        except Exception as e:
+            logger.error(f"Timeline rendering failed: {e}")
+            return None
+
+        finally:
+            # 音声生成を途中で打ち切った場合も先行リクエストを停止させる
+            close_stream = getattr(audio_stream, "close", None)
+            if close_stream:
+                close_stream()
+            if out is not None:
+                out.release()
+
+    def encode_conversation_video(
+        self,
+        temp_video_path: str,
+        audio_file_list: List[str],
+        line_section_indices: List[Optional[int]],
+        output_path: str,
+        sections: Optional[List[VideoSection]] = None,
+        renditions: Optional[List[Tuple[Rendition, str]]] = None,
+    ) -> Optional[str]:
+        """描画済みの一時動画に音声・BGMを合成して最終動画を書き出す
+
+        Args:
+            temp_video_path: 音声なしの一時動画
+            audio_file_list: タイムライン順の音声ファイルリスト
+            line_section_indices: 各音声が属するセクションのインデックス
+            output_path: 出力先パス
+            sections: セクション情報
+            renditions: 追加出力（レンディション, 出力先）のリスト。指定時は最終動画と
+                一緒に、一時動画を1回デコードするだけで全て書き出す
+
+        Returns:
+            生成した動画のパス。失敗時はNone
+        """
+        if renditions:
+            mixed_audio_path = os.path.splitext(temp_video_path)[0] + "_mixed.m4a"
+            try:
+                if not self.write_mixed_audio(
+                    audio_file_list, line_section_indices, sections, mixed_audio_path
+                ):
+                    return None
+                self.last_encode = encode_renditions(
+                    temp_video_path,
+                    mixed_audio_path,
+                    [(None, output_path)] + list(renditions),
+                    self.profile,
+                )
+                logger.info(f"Conversation video generated: {output_path}")
+                return output_path
+            except Exception as e:
+                logger.error(f"Video encoding failed: {e}")
+                return None
+            finally:
+                if os.path.exists(mixed_audio_path):
+                    os.remove(mixed_audio_path)
+
+        combined_audio = None
+        audio_clips = []
+
+        try:
+            combined_audio, audio_clips = self._mix_audio(
+                audio_file_list, line_section_indices, sections
+            )
+            if combined_audio is None:
+                return None
+
+            final_output_path = combine_video_with_audio(
+                temp_video_path, combined_audio, output_path, profile=self.profile
+            )
+
+            logger.info(f"Conversation video generated: {final_output_path}")
+            return final_output_path
+
+        except Exception as e:
+            logger.error(f"Video encoding failed: {e}")
+            return None
+
+        finally:
+            if combined_audio is not None:
+                self.audio_combiner.cleanup_audio_clips(combined_audio, audio_clips)
+            if sections:
+                # 読み込み済みBGMは次のジョブで再利用し、上限を超えた分だけ破棄する
+                try:
+                    self.bgm_mixer.trim_cache()
+                except Exception:
+                    pass
+
+    def write_timeline_audio(
+        self,
+        audio_paths: List[Optional[str]],
+        sections: Optional[List[VideoSection]],
+        output_path: str,
+        analysis_cache: Optional[Dict[str, Tuple[List[float], float]]] = None,
+    ) -> Optional[str]:
+        """描画前に、タイムラインと同じ並びの最終音声（音声+BGM）を書き出す
+
+        口パク解析に失敗したセリフは render_conversation_timeline と同様に除外する。
+        解析結果は analysis_cache に保存するため、続けて描画する際に再解析されない。
+
+        Args:
+            audio_paths: 会話順の音声パス（生成失敗はNone）
+            sections: セクション情報
+            output_path: 出力先（.m4a）
+            analysis_cache: 音声パス → (口パク強度, 長さ)
+
+        Returns:
+            出力した音声のパス。失敗時はNone
+        """
+        if analysis_cache is None:
+            analysis_cache = {}
+
+        section_index_of: List[int] = []
+        if sections:
+            for section_idx, section in enumerate(sections):
+                section_index_of.extend([section_idx] * len(section.segments))
+
+        audio_file_list: List[str] = []
+        line_section_indices: List[Optional[int]] = []
+        for conv_index, audio_path in enumerate(audio_paths):
+            if not audio_path or not os.path.exists(audio_path):
+                continue
+            if audio_path not in analysis_cache:
+                analysis_cache[audio_path] = (
+                    self.audio_processor.analyze_audio_for_mouth_sync(audio_path)
+                )
+            intensities, duration = analysis_cache[audio_path]
+            if intensities and duration > 0:
+                audio_file_list.append(audio_path)
+                line_section_indices.append(
+                    section_index_of[conv_index] if conv_index < len(section_index_of) else None
+                )
+
+        if not audio_file_list:
+            logger.error("No valid audio to mix")
+            return None
+
+        return self.write_mixed_audio(
+            audio_file_list, line_section_indices, sections, output_path
+        )
+
+    def write_mixed_audio(
+        self,
+        audio_file_list: List[str],
+        line_section_indices: List[Optional[int]],
+        sections: Optional[List[VideoSection]],
+        output_path: str,
+    ) -> Optional[str]:
+        """タイムライン順の音声にBGMを重ねた最終音声を書き出す
+
+        Args:
+            audio_file_list: タイムライン順の音声ファイルリスト
+            line_section_indices: 各音声が属するセクションのインデックス
+            sections: セクション情報
+            output_path: 出力先（.m4a）
+
+        Returns:
+            出力した音声のパス。失敗時はNone
+        """
+        combined_audio = None
+        audio_clips = []
+        try:
+            combined_audio, audio_clips = self._mix_audio(
+                audio_file_list, line_section_indices, sections
+            )
+            if combined_audio is None:
+                return None
+            combined_audio.write_audiofile(
+                output_path,
+                fps=AUDIO_SAMPLE_RATE,
+                codec=AUDIO_CODEC,
+                ffmpeg_params=["-ac", str(AUDIO_CHANNELS)],
+                logger=None,
+            )
+            return output_path
+
+        except Exception as e:
+            logger.error(f"Audio mixing failed: {e}")
+            return None
+
+        finally:
+            if combined_audio is not None:
+                self.audio_combiner.cleanup_audio_clips(combined_audio, audio_clips)
+            if sections:
+                try:
+                    self.bgm_mixer.trim_cache()
+                except Exception:
+                    pass
+
+    def _mix_audio(
+        self,
+        audio_file_list: List[str],
+        line_section_indices: List[Optional[int]],
+        sections: Optional[List[VideoSection]],
+    ):
+        """セリフ音声を連結し、セクションごとのBGMを重ねる
+
+        Returns:
+            (合成した音声, 後片付けが必要な音声クリップ)。失敗時は音声がNone
+        """
+        combined_audio, audio_clips, audio_durations = (
+            self.audio_combiner.combine_audio_files(audio_file_list)
+        )
+        if combined_audio is None or not sections:
+            return combined_audio, audio_clips
+
+        section_durations = [0.0] * len(sections)
+        for audio_path, section_idx in zip(audio_file_list, line_section_indices):
+            if section_idx is not None:
+                section_durations[section_idx] += audio_durations.get(audio_path, 0.0)
+        combined_audio = self.bgm_mixer.mix_bgm_with_voiceover(
+            combined_audio, sections, section_durations
+        )
+        return combined_audio, audio_clips
+
+    @staticmethod
+    def _temp_video_path(output_path: str, work_dir: Optional[str]) -> str:
+        """一時動画ファイルのパスを取得"""
+        if work_dir:
+            os.makedirs(work_dir, exist_ok=True)
+            return os.path.join(work_dir, "video_temp.mp4")
+        return output_path.replace(".mp4", "_temp.mp4")
+
+    def _append_to_timeline(
+        self,
+        conv: Dict,
+        audio_path: str,
+        intensities: List[float],
+        duration: float,
+        start_time: float,
+        backgrounds: Dict,
+        enable_subtitles: bool,
+        timeline_conversations: List[Dict],
+        audio_file_list: List[str],
+        segment_audio_intensities: List[AudioSegmentInfo],
+        subtitle_lines: List[SubtitleData],
+    ):
+        """解析済みのセリフをタイムライン末尾に追加"""
+        timeline_conversations.append(conv)
+        audio_file_list.append(audio_path)
+        segment_audio_intensities.append(
+            AudioSegmentInfo(
+                start_time=start_time,
+                intensities=intensities,
+                duration=duration,
+                actual_frame_count=len(intensities),
+            )
+        )
+
+        text = conv.get("text", "").strip()
+        if enable_subtitles and text:
+            background_name = conv.get("background", "default")
+            if background_name not in backgrounds:
+                background_name = "default"
+            subtitle_lines.append(
+                SubtitleData(
+                    text=text,
+                    start_time=start_time,
+                    end_time=start_time + duration,
+                    duration=duration,
+                    speaker=conv.get("speaker", "zundamon"),
+                    background=background_name,
+                )
+            )
+
+    @staticmethod
+    def _update_section_ranges(
+        section_segment_ranges: List[Dict],
+        sections: Optional[List[VideoSection]],
+        section_idx: Optional[int],
+        timeline_index: int,
+    ):
+        """タイムライン上のセリフ位置でセクション範囲を更新"""
+        if not sections or section_idx is None:
+            return
+        if (
+            section_segment_ranges
+            and section_segment_ranges[-1]["section_idx"] == section_idx
+        ):
+            section_segment_ranges[-1]["end"] = timeline_index + 1
+            return
+        section_segment_ranges.append({
+            "section_idx": section_idx,
+            "key": getattr(sections[section_idx], "section_key", None),
+            "start": timeline_index,
+            "end": timeline_index + 1,
+        })
+
+    def warm_up(self):
+        """ワーカー常駐用にフォント・画像・BGMを事前に読み込む"""
+        started = time.monotonic()
+        self.video_processor.get_japanese_font()
+        self.resource_manager.load_character_images()
+        self.resource_manager.load_backgrounds()
+        bgm_count = self.bgm_mixer.preload()
+        logger.info(
+            f"VideoGenerator warmed up in {time.monotonic() - started:.2f}s "
+            f"(bgm={bgm_count})"
+        )
+
+    def release_job_resources(self):
+        """ジョブ終了時の後片付け（常駐用）
+
+        読み込み済みリソースは次のジョブで再利用するため破棄せず、
+        キャッシュを上限内に収めるだけにする。
+        """
+        try:
+            self.bgm_mixer.trim_cache()
+        except Exception as e:
+            logger.warning(f"Failed to trim BGM cache: {e}")
+
     def cleanup(self):
         """メモリリソースのクリーンアップ"""
         try:
+            self.resource_manager.clear_cache()
+
             # BGMキャッシュのクリア
             if hasattr(self, "bgm_mixer") and self.bgm_mixer:
                 self.bgm_mixer.clear_cache()
@@ -1,15 +1,46 @@
 """動画生成ユーティリティ関数"""
 
+import hashlib
+import json
+import logging
 import os
-from typing import List, Dict
+import subprocess
+import time
+from typing import List, Dict, Optional, Tuple
 from moviepy import VideoFileClip
+from moviepy.config import FFMPEG_BINARY
+from app.config.app import Rendition, RenderProfile, get_render_profile
 from app.models.scripts.common import VideoSection
 
+logger = logging.getLogger(__name__)
+
+# 最終動画のエンコード設定
+# テンプレートクリップと本編の映像をストリームコピーで連結できるよう、全ての出力で揃える
+# （画質・速度は描画プロファイルの crf / preset で決まる）
+VIDEO_CODEC = "libx264"
+AUDIO_CODEC = "aac"
+AUDIO_SAMPLE_RATE = 44100
+AUDIO_CHANNELS = 2
+
+
+def video_ffmpeg_params(profile: Optional[RenderProfile] = None) -> List[str]:
+    """描画プロファイルに応じた映像エンコードのffmpegパラメータ"""
+    profile = profile or get_render_profile()
+    return ["-crf", str(profile.crf), "-preset", profile.preset, "-pix_fmt", "yuv420p"]
+
 
 def combine_video_with_audio(
-    temp_video_path: str, combined_audio, output_path: str
+    temp_video_path: str,
+    combined_audio,
+    output_path: str,
+    profile: Optional[RenderProfile] = None,
 ) -> str:
-    """動画と音声を結合する"""
+    """動画と音声を結合する
+
+    エンコード用の一時音声ファイルは一時動画と同じディレクトリに作成し、
+    並行ジョブ間でカレントディレクトリのファイルを共有しないようにする。
+    """
+    temp_audiofile = os.path.splitext(temp_video_path)[0] + "_audio.m4a"
     video_clip = VideoFileClip(temp_video_path)
 
     video_duration = video_clip.duration
@@ -23,11 +54,12 @@ def combine_video_with_audio(
 
     final_clip.write_videofile(
         output_path,
-        codec="libx264",
-        audio_codec="aac",
-        temp_audiofile="temp-audio.m4a",
+        codec=VIDEO_CODEC,
+        audio_codec=AUDIO_CODEC,
+        audio_fps=AUDIO_SAMPLE_RATE,
+        temp_audiofile=temp_audiofile,
         remove_temp=True,
-        ffmpeg_params=["-crf", "18", "-preset", "medium"],
+        ffmpeg_params=video_ffmpeg_params(profile) + ["-ac", str(AUDIO_CHANNELS)],
     )
 
     video_clip.close()
@@ -39,6 +71,222 @@ def combine_video_with_audio(
     return output_path
 
 
+def compute_animation_seed(conversations: List[Dict]) -> int:
+    """会話内容からアニメーション（瞬きなど）のシードを計算する
+
+    同じ台本からは常に同じシードになるため、描画結果が再現可能になる。
+    """
+    raw = json.dumps(conversations, sort_keys=True, ensure_ascii=False, default=str)
+    return int.from_bytes(hashlib.sha256(raw.encode("utf-8")).digest()[:8], "big")
+
+
+def probe_duration(video_path: str) -> float:
+    """動画ファイルの長さ（秒）を取得する。取得できない場合は0"""
+    from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+
+    try:
+        return float(ffmpeg_parse_infos(video_path).get("duration") or 0.0)
+    except Exception:
+        return 0.0
+
+
+def encode_settings(profile: Optional[RenderProfile] = None) -> Dict:
+    """連結可否の判定に使うエンコード設定"""
+    return {
+        "video_codec": VIDEO_CODEC,
+        "audio_codec": AUDIO_CODEC,
+        "audio_sample_rate": AUDIO_SAMPLE_RATE,
+        "audio_channels": AUDIO_CHANNELS,
+        "video_params": video_ffmpeg_params(profile),
+    }
+
+
+def probe_video_duration(video_path: str) -> float:
+    """映像ストリームの長さ（秒）をフレーム数から取得する。取得できない場合は全体の長さ"""
+    from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+
+    try:
+        infos = ffmpeg_parse_infos(video_path)
+    except Exception:
+        return 0.0
+    if infos.get("video_n_frames") and infos.get("video_fps"):
+        return infos["video_n_frames"] / infos["video_fps"]
+    return float(infos.get("duration") or 0.0)
+
+
+def concat_videos(
+    input_paths: List[str], output_path: str, profile: Optional[RenderProfile] = None
+) -> str:
+    """同じエンコード設定の動画をffmpegのconcatで連結する
+
+    映像は concat demuxer のストリームコピーで連結する。音声は個別にエンコードされた
+    AAC をそのままつなぐと、境目ごとにエンコーダーの先頭・末尾の余白が入り映像とずれていくため、
+    各クリップの音声を映像の長さに揃えてから concat フィルタで1本につなぎ、1回だけエンコードする。
+    失敗した場合のみ映像も再エンコードして連結する。
+    """
+    list_path = os.path.splitext(output_path)[0] + "_concat.txt"
+    with open(list_path, "w", encoding="utf-8") as f:
+        for path in input_paths:
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+
+    base_cmd = [
+        FFMPEG_BINARY, "-y", "-loglevel", "error",
+        "-f", "concat", "-safe", "0", "-i", list_path,
+    ]
+    audio_filters = [
+        f"[{index + 1}:a]apad,atrim=end={probe_video_duration(path):.6f},"
+        f"asetpts=N/SR/TB[a{index}]"
+        for index, path in enumerate(input_paths)
+    ]
+    audio_filter = ";".join(audio_filters) + ";" + "".join(
+        f"[a{index}]" for index in range(len(input_paths))
+    ) + f"concat=n={len(input_paths)}:v=0:a=1[a]"
+    audio_args = [
+        "-c:a", AUDIO_CODEC,
+        "-ar", str(AUDIO_SAMPLE_RATE),
+        "-ac", str(AUDIO_CHANNELS),
+    ]
+    try:
+        inputs = [arg for path in input_paths for arg in ("-i", path)]
+        result = subprocess.run(
+            base_cmd
+            + inputs
+            + [
+                "-filter_complex", audio_filter,
+                "-map", "0:v", "-map", "[a]",
+                "-c:v", "copy",
+                *audio_args,
+                "-movflags", "+faststart",
+                output_path,
+            ],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            logger.warning(
+                f"Stream copy concat failed, re-encoding: {result.stderr.strip()[:300]}"
+            )
+            subprocess.run(
+                base_cmd
+                + [
+                    "-c:v", VIDEO_CODEC, *video_ffmpeg_params(profile),
+                    *audio_args,
+                    "-movflags", "+faststart",
+                    output_path,
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+    finally:
+        if os.path.exists(list_path):
+            os.remove(list_path)
+
+    return output_path
+
+
+def rendition_path(output_path: str, rendition: Rendition) -> str:
+    """最終動画のパスからレンディションの出力先を作る（例: video_480p.mp4）"""
+    return f"{os.path.splitext(output_path)[0]}_{rendition.name}.{rendition.container}"
+
+
+def rendition_codec_args(
+    rendition: Optional[Rendition], profile: Optional[RenderProfile]
+) -> List[str]:
+    """出力ごとのエンコード引数（None は描画プロファイルどおりの最終動画）"""
+    if rendition is None:
+        return [
+            "-c:v", VIDEO_CODEC, *video_ffmpeg_params(profile),
+            "-c:a", AUDIO_CODEC,
+            "-ar", str(AUDIO_SAMPLE_RATE), "-ac", str(AUDIO_CHANNELS),
+            "-movflags", "+faststart",
+        ]
+
+    profile = profile or get_render_profile()
+    if rendition.container == "webm":
+        args = ["-c:v", "libvpx-vp9", "-row-mt", "1", "-deadline", "good", "-cpu-used", "4"]
+        if rendition.video_bitrate:
+            args += ["-b:v", rendition.video_bitrate]
+        else:
+            args += ["-crf", str(rendition.crf or 33), "-b:v", "0"]
+        return args + ["-pix_fmt", "yuv420p", "-c:a", "libopus", "-ac", str(AUDIO_CHANNELS)]
+
+    args = ["-c:v", VIDEO_CODEC, "-preset", profile.preset, "-pix_fmt", "yuv420p"]
+    if rendition.video_bitrate:
+        args += [
+            "-b:v", rendition.video_bitrate,
+            "-maxrate", rendition.video_bitrate,
+            "-bufsize", rendition.video_bitrate,
+        ]
+    else:
+        args += ["-crf", str(rendition.crf or profile.crf)]
+    args += [
+        "-c:a", AUDIO_CODEC,
+        "-ar", str(AUDIO_SAMPLE_RATE), "-ac", str(AUDIO_CHANNELS),
+    ]
+    if rendition.container == "mp4":
+        args += ["-movflags", "+faststart"]
+    return args
+
+
+def encode_renditions(
+    video_path: str,
+    audio_path: Optional[str],
+    outputs: List[Tuple[Optional[Rendition], str]],
+    profile: Optional[RenderProfile] = None,
+) -> Dict:
+    """1回のデコードから複数の出力をエンコードする
+
+    映像は split フィルタで分岐し、レンディションごとに scale で縮小する。
+    合成済みの映像を出力の数だけ読み直したり、最終動画から再変換したりしない。
+
+    Args:
+        video_path: 入力動画（描画済みの一時動画など）
+        audio_path: 最終音声。None の場合は入力動画の音声を使う
+        outputs: (レンディション, 出力先) のリスト。レンディションが None の出力は
+            描画プロファイルの解像度・エンコード設定で書き出す
+        profile: 描画プロファイル
+
+    Returns:
+        outputs（出力先のリスト）と encode_seconds（所要時間）
+    """
+    count = len(outputs)
+    cmd = [FFMPEG_BINARY, "-y", "-loglevel", "error", "-i", video_path]
+    if audio_path:
+        cmd += ["-i", audio_path]
+    audio_map = "1:a" if audio_path else "0:a?"
+
+    filters = [f"[0:v]split={count}" + "".join(f"[s{i}]" for i in range(count))]
+    for i, (rendition, _) in enumerate(outputs):
+        if rendition is None:
+            filters.append(f"[s{i}]null[v{i}]")
+        else:
+            filters.append(f"[s{i}]scale=-2:{rendition.height}:flags=bicubic[v{i}]")
+    cmd += ["-filter_complex", ";".join(filters)]
+
+    for i, (rendition, output_path) in enumerate(outputs):
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        cmd += [
+            "-map", f"[v{i}]", "-map", audio_map,
+            *rendition_codec_args(rendition, profile),
+            "-shortest",
+            output_path,
+        ]
+
+    started = time.monotonic()
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Rendition encoding failed: {result.stderr.strip()[:300]}")
+    elapsed = time.monotonic() - started
+
+    logger.info(f"Encoded {count} outputs from one decode in {elapsed:.1f}s")
+    return {
+        "outputs": [output_path for _, output_path in outputs],
+        "encode_seconds": round(elapsed, 2),
+    }
+
+
 def calculate_section_durations(
     sections: List[VideoSection],
     audio_durations: Dict[str, float],
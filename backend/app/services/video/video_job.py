@@ -0,0 +1,219 @@
+"""動画生成ジョブの入力準備とジョブマニフェスト
+
+単一タスク実行・ステージ分割実行の両方から利用される。ステージ間では
+データ本体ではなく、ジョブ作業ディレクトリ内のマニフェストへの参照を受け渡す。
+"""
+
+import json
+import logging
+import os
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config.app import RENDITION_PRESETS, Paths, Rendition
+from app.config.content_config.closing_section import create_closing_section
+from app.models.scripts.common import ConversationSegment, VideoSection
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "manifest.json"
+
+
+def section_to_conversations(section: VideoSection) -> List[Dict[str, Any]]:
+    """セクションのセグメントを会話リスト形式に変換"""
+    return [
+        {
+            "speaker": segment.speaker,
+            "text": segment.text,
+            "text_for_voicevox": segment.text_for_voicevox,
+            "expression": segment.expression,
+            "background": section.scene_background,
+            "visible_characters": segment.visible_characters,
+            "character_expressions": segment.character_expressions,
+        }
+        for segment in section.segments
+    ]
+
+
+def prepare_job_inputs(
+    conversations: List[Dict[str, Any]],
+    sections: Optional[List[Dict[str, Any]]] = None,
+    include_closing: bool = True,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """締めくくりセクションを付与した会話リストとセクションリストを作成
+
+    Args:
+        conversations: 会話リスト
+        sections: セクション情報（辞書形式）
+        include_closing: 締めくくりセクションを付与するか。
+            事前レンダリング済みの締めくくりクリップを後から連結する場合は False
+
+    Returns:
+        (締めくくりを含む会話リスト, 締めくくりを含むセクションリスト)
+    """
+    if not include_closing:
+        if sections:
+            return list(conversations), list(sections)
+        return list(conversations), [_build_main_section(conversations).model_dump()]
+
+    # 締めくくりセクションを自動追加
+    closing_section = create_closing_section()
+
+    # 締めくくりセクションのセグメントをconversationsに追加
+    closing_conversations = section_to_conversations(closing_section)
+
+    # conversationsリストに締めくくりセクションを追加
+    conversations_with_closing = conversations + closing_conversations
+    logger.info(
+        f"締めくくりセクションを追加: "
+        f"元の会話数={len(conversations)}, "
+        f"締めくくりセリフ数={len(closing_conversations)}, "
+        f"合計={len(conversations_with_closing)}"
+    )
+
+    # sectionsが指定されている場合は、締めくくりセクションをsectionsの最後に追加
+    if sections:
+        sections_dict = [section for section in sections]
+        sections_dict.append(closing_section.model_dump())
+        logger.info("締めくくりセクションをsectionsに追加しました")
+        return conversations_with_closing, sections_dict
+
+    # sectionsが指定されていない場合、元の会話を1つのセクションとして扱い、
+    # その後に締めくくりセクションを追加
+    main_section = _build_main_section(conversations)
+
+    # メインセクションと締めくくりセクションを結合
+    sections_dict = [main_section.model_dump(), closing_section.model_dump()]
+    logger.info(
+        f"sectionsが指定されていないため、"
+        f"元の会話をメインセクションとして作成し、"
+        f"締めくくりセクションを追加しました "
+        f"(メインセクション: {len(main_section.segments)}セグメント, "
+        f"締めくくりセクション: {len(closing_section.segments)}セグメント)"
+    )
+    return conversations_with_closing, sections_dict
+
+
+def _build_main_section(conversations: List[Dict[str, Any]]) -> VideoSection:
+    """セクション情報のない会話を1つのメインセクションにまとめる"""
+    main_section_segments = []
+    # デフォルトの背景を取得（最初の会話の背景を使用、なければ"default"）
+    default_background = "default"
+    if conversations:
+        default_background = conversations[0].get("background", "default")
+
+    for conv in conversations:
+        segment = ConversationSegment(
+            speaker=conv.get("speaker", "zundamon"),
+            text=conv.get("text", ""),
+            text_for_voicevox=conv.get("text_for_voicevox", conv.get("text", "")),
+            expression=conv.get("expression", "normal"),
+            visible_characters=conv.get("visible_characters", ["zundamon"]),
+            character_expressions=conv.get("character_expressions", {}),
+        )
+        main_section_segments.append(segment)
+
+    return VideoSection(
+        section_name="メイン",
+        section_key="main",
+        scene_background=default_background if conversations else "default",
+        bgm_id="none",
+        bgm_volume=0.0,
+        segments=main_section_segments,
+    )
+
+
+def to_video_sections(sections: Optional[List[Dict[str, Any]]]) -> Optional[List[VideoSection]]:
+    """辞書形式のセクション情報をVideoSectionに変換"""
+    if not sections:
+        return None
+    video_sections = [VideoSection(**section) for section in sections]
+    total_segments = sum(len(section.segments) for section in video_sections)
+    logger.info(
+        f"セクション情報変換完了: "
+        f"セクション数={len(video_sections)}, "
+        f"総セグメント数={total_segments}"
+    )
+    return video_sections
+
+
+def to_renditions(renditions: Optional[List[Dict[str, Any]]]) -> Optional[List[Rendition]]:
+    """辞書形式のレンディション指定をRenditionに変換（height 省略時はプリセット名として解決）"""
+    if not renditions:
+        return None
+    resolved = []
+    for rendition in renditions:
+        if rendition.get("height") is None:
+            preset = RENDITION_PRESETS.get(rendition.get("name"))
+            if preset is None:
+                raise ValueError(f"不明なレンディションです: {rendition.get('name')}")
+            overrides = {key: value for key, value in rendition.items() if value is not None}
+            resolved.append(replace(preset, **overrides))
+        else:
+            resolved.append(Rendition(**rendition))
+    return resolved
+
+
+def write_job_manifest(workspace_root: str, manifest: Dict[str, Any]) -> str:
+    """ジョブマニフェストを書き込む
+
+    Returns:
+        マニフェストファイルのパス
+    """
+    manifest_path = os.path.join(workspace_root, MANIFEST_FILENAME)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp_path, manifest_path)
+    return manifest_path
+
+
+def read_job_manifest(workspace_root: str) -> Dict[str, Any]:
+    """ジョブマニフェストを読み込む"""
+    manifest_path = os.path.join(workspace_root, MANIFEST_FILENAME)
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_job_result(
+    output_path: str,
+    render_profile: str,
+    animation_seed: Optional[int],
+    time_to_first_frame: Optional[float],
+    playlist_url: Optional[str],
+    rendition_paths: List[str],
+    encode_seconds: Optional[float],
+    render_stats: Dict[str, Any],
+    section_results: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """動画生成ジョブの結果を作成する（単一タスク・ステージ分割で同じ形にする）
+
+    Args:
+        output_path: 最終動画のパス
+        render_profile: 描画プロファイル名
+        animation_seed: ジョブで指定されたアニメーションのシード
+        time_to_first_frame: 最初のフレームを書き出すまでの時間（秒）
+        playlist_url: 描画中の動画のHLSプレイリスト
+        rendition_paths: 追加出力のパス
+        encode_seconds: 最終エンコードにかかった時間（秒）
+        render_stats: record_render の戻り値（realtime_factor, speedup_vs_default）
+        section_results: セクション単位で描画した場合のセクションごとの結果
+    """
+    outputs_dir = Paths.get_outputs_dir()
+    return {
+        "status": "completed",
+        "video_path": output_path,
+        "relative_path": os.path.relpath(output_path, outputs_dir),
+        "time_to_first_frame": time_to_first_frame,
+        "animation_seed": animation_seed,
+        "render_profile": render_profile,
+        "playlist_url": playlist_url,
+        "renditions": [os.path.relpath(path, outputs_dir) for path in rendition_paths],
+        "encode_seconds": encode_seconds,
+        **render_stats,
+        "sections": section_results,
+        "reused_sections": [
+            result["section_key"] for result in section_results or [] if result["reused"]
+        ],
+        "message": "動画生成が完了しました"
+    }
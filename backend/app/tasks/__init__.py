@@ -1,6 +1,4 @@
 """Celery tasks"""
-# タスクを明示的にインポートしてCeleryに登録
-# 動画生成タスクのみをインポート（script_tasksは別途必要に応じてインポート）
-from app.tasks import video_tasks
-
-__all__ = ['video_tasks']
+# タスクモジュールは celery_app の include で登録する。
+# ここでインポートするとAPIプロセスにも動画処理の依存が読み込まれるため、
+# パッケージ自体は軽量に保つ。
@@ -2,11 +2,19 @@
 from celery import Celery
 import os
 
+from app.config.app import WORKER_CONFIG
+
 # Celeryアプリケーションの作成
 celery_app = Celery(
     'zundan_studio',
     broker=os.getenv('CELERY_BROKER_URL', 'redis://redis:6379/0'),
-    backend=os.getenv('CELERY_RESULT_BACKEND', 'redis://redis:6379/0')
+    backend=os.getenv('CELERY_RESULT_BACKEND', 'redis://redis:6379/0'),
+    # ワーカー起動時にのみタスクモジュールを読み込む（APIは登録名で投入する）
+    include=[
+        'app.tasks.video_tasks',
+        'app.tasks.video_pipeline_tasks',
+        'app.tasks.comedy_script_tasks',
+    ],
 )
 
 # Celery設定
@@ -21,8 +29,13 @@ celery_app.conf.update(
     task_soft_time_limit=3300,  # 55分
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=50,
+    task_default_queue=WORKER_CONFIG.default_queue,
+    # ステージ分割パイプラインの各タスクを専用キューへ振り分ける
+    task_routes={
+        'app.tasks.video.synthesize_voices': {'queue': WORKER_CONFIG.voice_queue},
+        'app.tasks.video.render_frames': {'queue': WORKER_CONFIG.render_queue},
+        'app.tasks.video.encode_video': {'queue': WORKER_CONFIG.encode_queue},
+        # 台本生成はLLM専用キューで処理し、動画生成とは独立して並列数を調整する
+        'app.tasks.scripts.*': {'queue': WORKER_CONFIG.llm_queue},
+    },
 )
-
-# タスクの自動検出
-# app.tasksパッケージ内のすべてのタスクを自動検出
-celery_app.autodiscover_tasks(['app.tasks'])
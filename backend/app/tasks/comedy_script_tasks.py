@@ -0,0 +1,191 @@
+"""お笑い台本生成Celeryタスク
+
+タイトル・アウトライン・台本・ショート台本の生成をHTTPリクエスト外で実行する。
+生成器の進捗コールバックはタスクの PROGRESS 状態として保存・配信されるため、
+クライアントは動画生成と同じ WebSocket（/ws/progress, /ws/tasks）で進捗を受け取れる。
+"""
+from typing import Dict, Any, Optional, Callable
+import logging
+
+from app.tasks.celery_app import celery_app
+from app.tasks.progress import ProgressPublishingTask
+from app.models.script_models import ScriptMode, ComedyTitle, ComedyOutline
+
+logger = logging.getLogger(__name__)
+
+
+class ComedyScriptTask(ProgressPublishingTask):
+    """お笑い台本生成タスクの基底クラス"""
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        """タスク失敗時の処理"""
+        logger.error(f"台本生成タスク失敗 (task_id={task_id}): {exc}")
+        super().on_failure(exc, task_id, args, kwargs, einfo)
+
+    def on_success(self, retval, task_id, args, kwargs):
+        """タスク成功時の処理"""
+        logger.info(f"台本生成タスク成功 (task_id={task_id})")
+        super().on_success(retval, task_id, args, kwargs)
+
+
+def _progress_callback(task) -> Callable[..., None]:
+    """
+    生成器の進捗コールバックをタスク状態の更新に変換する
+
+    タイトル・アウトライン生成のコールバックは message のみ、台本生成は
+    (message, progress) で呼ばれるため、進捗が省略された場合は直前の値を使う。
+    """
+    state = {'progress': 0.0}
+
+    def callback(message: str, progress: Optional[float] = None) -> None:
+        if progress is not None:
+            state['progress'] = progress
+        task.update_state(
+            state='PROGRESS',
+            meta={'progress': state['progress'], 'message': message}
+        )
+
+    return callback
+
+
+def _model_info(model_info: Dict[str, Any]) -> Dict[str, Any]:
+    """結果に含めるモデル情報（JSONに保存できる項目のみ）"""
+    return {'model': model_info['model'], 'temperature': model_info['temperature']}
+
+
+@celery_app.task(bind=True, base=ComedyScriptTask, name='app.tasks.scripts.generate_title')
+def generate_title_task(
+    self,
+    input_text: str,
+    model: Optional[str] = None,
+    temperature: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    タイトル生成タスク
+
+    Returns:
+        title, reference_info, model, temperature を含む結果
+    """
+    from app.core.script_generators.unified_script_generator import UnifiedScriptGenerator
+
+    logger.info(f"タイトル生成タスク開始 (task_id={self.request.id}): テーマ={input_text}")
+    generator = UnifiedScriptGenerator(ScriptMode.COMEDY)
+    title, reference_info, model_info = generator.generate_title(
+        input_text=input_text,
+        model=model,
+        temperature=temperature,
+        progress_callback=_progress_callback(self),
+    )
+    return {
+        'status': 'completed',
+        'title': title.model_dump(mode='json'),
+        'reference_info': reference_info,
+        **_model_info(model_info),
+        'message': 'タイトル生成が完了しました'
+    }
+
+
+@celery_app.task(bind=True, base=ComedyScriptTask, name='app.tasks.scripts.generate_outline')
+def generate_outline_task(
+    self,
+    title_data: Dict[str, Any],
+    model: Optional[str] = None,
+    temperature: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    アウトライン生成タスク
+
+    Returns:
+        outline, youtube_metadata, model, temperature を含む結果
+    """
+    from app.core.script_generators.unified_script_generator import UnifiedScriptGenerator
+
+    title = ComedyTitle(**title_data)
+    logger.info(f"アウトライン生成タスク開始 (task_id={self.request.id}): タイトル={title.title}")
+    generator = UnifiedScriptGenerator(ScriptMode.COMEDY)
+    outline, youtube_metadata, model_info = generator.generate_outline(
+        title_data=title,
+        model=model,
+        temperature=temperature,
+        progress_callback=_progress_callback(self),
+    )
+    return {
+        'status': 'completed',
+        'outline': outline.model_dump(mode='json'),
+        'youtube_metadata': youtube_metadata.model_dump(mode='json') if youtube_metadata else None,
+        **_model_info(model_info),
+        'message': 'アウトライン生成が完了しました'
+    }
+
+
+@celery_app.task(bind=True, base=ComedyScriptTask, name='app.tasks.scripts.generate_script')
+def generate_script_task(
+    self,
+    outline_data: Dict[str, Any],
+    model: Optional[str] = None,
+    temperature: Optional[float] = None,
+    parallel_sections: Optional[bool] = None
+) -> Dict[str, Any]:
+    """
+    台本生成タスク
+
+    Returns:
+        script, model, temperature を含む結果
+    """
+    from app.core.script_generators.unified_script_generator import UnifiedScriptGenerator
+
+    outline = ComedyOutline(**outline_data)
+    logger.info(f"台本生成タスク開始 (task_id={self.request.id}): タイトル={outline.title}")
+    generator = UnifiedScriptGenerator(ScriptMode.COMEDY)
+    script, model_info = generator.generate_script(
+        outline_data=outline,
+        model=model,
+        temperature=temperature,
+        progress_callback=_progress_callback(self),
+        parallel_sections=parallel_sections,
+    )
+    return {
+        'status': 'completed',
+        'script': script.model_dump(mode='json'),
+        **_model_info(model_info),
+        'message': '台本生成が完了しました'
+    }
+
+
+@celery_app.task(bind=True, base=ComedyScriptTask, name='app.tasks.scripts.generate_short_script')
+def generate_short_script_task(
+    self,
+    title_data: Dict[str, Any],
+    model: Optional[str] = None,
+    temperature: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    ショート動画台本生成タスク（60秒）
+
+    Returns:
+        script, model, temperature を含む結果
+    """
+    from app.core.script_generators.comedy.comedy_short_generator import ComedyShortGenerator
+    from app.core.script_generators.generate_food_over import create_llm_instance
+    from app.config.models import get_model_config, get_default_model_config
+
+    title = ComedyTitle(**title_data)
+    logger.info(f"ショート台本生成タスク開始 (task_id={self.request.id}): タイトル={title.title}")
+
+    model_config = get_model_config(model) if model else get_default_model_config()
+    model = model_config["id"]
+    temperature = temperature if temperature is not None else 0.9
+    llm = create_llm_instance(model, temperature, model_config)
+
+    script = ComedyShortGenerator().generate_short_script(
+        title=title,
+        llm=llm,
+        progress_callback=_progress_callback(self),
+    )
+    return {
+        'status': 'completed',
+        'script': script.model_dump(mode='json'),
+        'model': model,
+        'temperature': temperature,
+        'message': 'ショート台本生成が完了しました'
+    }
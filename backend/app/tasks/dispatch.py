@@ -0,0 +1,81 @@
+"""タスク投入ヘルパー
+
+APIプロセスからはタスクモジュール（動画処理の依存を含む）をインポートせず、
+登録名でシグネチャを作成して投入する。
+"""
+from typing import Any, Dict
+import logging
+import uuid
+
+from celery import chain
+
+from app.tasks.celery_app import celery_app
+from app.config.app import WORKER_CONFIG
+
+logger = logging.getLogger(__name__)
+
+GENERATE_VIDEO_TASK = 'app.tasks.generate_video'
+SYNTHESIZE_VOICES_TASK = 'app.tasks.video.synthesize_voices'
+RENDER_FRAMES_TASK = 'app.tasks.video.render_frames'
+ENCODE_VIDEO_TASK = 'app.tasks.video.encode_video'
+
+# 台本生成タスク（種類 → 登録名）
+SCRIPT_TASKS = {
+    'title': 'app.tasks.scripts.generate_title',
+    'outline': 'app.tasks.scripts.generate_outline',
+    'script': 'app.tasks.scripts.generate_script',
+    'short_script': 'app.tasks.scripts.generate_short_script',
+}
+
+
+def enqueue_video_generation(**params: Dict[str, Any]) -> str:
+    """
+    動画生成ジョブを投入する
+
+    WORKER_CONFIG.pipeline_mode に応じて、単一タスクまたはステージ分割チェーンで実行する。
+
+    Args:
+        params: generate_video_task と同じ引数
+
+    Returns:
+        ジョブID（進捗・結果の取得に使うタスクID）
+    """
+    if not WORKER_CONFIG.is_staged:
+        return celery_app.send_task(GENERATE_VIDEO_TASK, kwargs=params).id
+
+    job_id = str(uuid.uuid4())
+    workflow = chain(
+        celery_app.signature(
+            SYNTHESIZE_VOICES_TASK,
+            kwargs={'job_id': job_id, **params},
+            queue=WORKER_CONFIG.voice_queue,
+        ),
+        celery_app.signature(RENDER_FRAMES_TASK, queue=WORKER_CONFIG.render_queue),
+        celery_app.signature(
+            ENCODE_VIDEO_TASK, queue=WORKER_CONFIG.encode_queue, task_id=job_id
+        ),
+    )
+    workflow.apply_async()
+    logger.info(f"ステージ分割ジョブを投入: job_id={job_id}")
+    return job_id
+
+
+def enqueue_script_generation(kind: str, **params: Any) -> str:
+    """
+    台本生成タスクをLLMキューへ投入する
+
+    Args:
+        kind: 生成の種類（title / outline / script / short_script）
+        params: 各タスクの引数
+
+    Returns:
+        タスクID
+    """
+    task_name = SCRIPT_TASKS.get(kind)
+    if task_name is None:
+        raise ValueError(f"不明な台本生成タスクです: {kind}")
+    task_id = celery_app.send_task(
+        task_name, kwargs=params, queue=WORKER_CONFIG.llm_queue
+    ).id
+    logger.info(f"台本生成タスクを投入: kind={kind}, task_id={task_id}")
+    return task_id
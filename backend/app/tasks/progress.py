@@ -0,0 +1,248 @@
+"""タスク進捗の配信
+
+ワーカーがタスク状態を更新したとき、同じ内容を Redis pub/sub のタスク別チャンネルへ配信する。
+APIはこれを購読してWebSocketへ中継するため、ポーリングが不要になる。
+描画ループからの高頻度な更新は ProgressReporter で間引いてから配信する。
+"""
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from celery import Task
+
+from app.utils.redis_client import get_sync_redis, progress_channel
+
+logger = logging.getLogger(__name__)
+
+
+def publish_progress(task_id: str, state: str, info: Optional[Any] = None) -> None:
+    """
+    タスク状態を pub/sub チャンネルへ配信する
+
+    配信に失敗してもタスク自体は継続させる（結果バックエンドには保存済みのため）。
+
+    Args:
+        task_id: 配信対象のタスクID（ステージ分割時はジョブID）
+        state: Celeryのタスク状態（PROGRESS / SUCCESS / FAILURE など）
+        info: 状態に付随するメタ情報または結果
+    """
+    if not task_id:
+        return
+    try:
+        payload = json.dumps(
+            {"task_id": task_id, "state": state, "info": info},
+            ensure_ascii=False,
+            default=str,
+        )
+        get_sync_redis().publish(progress_channel(task_id), payload)
+    except Exception as e:
+        logger.warning(f"進捗の配信に失敗しました (task_id={task_id}): {e}")
+
+
+def exception_info(exc: BaseException) -> Dict[str, Any]:
+    """例外を配信用のメタ情報に変換"""
+    return {
+        "error": str(exc),
+        "error_type": type(exc).__name__,
+        "message": "タスクが失敗しました",
+    }
+
+
+class ProgressPublishingTask(Task):
+    """状態更新を pub/sub チャンネルにも配信するタスクの基底クラス"""
+
+    def update_state(self, task_id=None, state=None, meta=None, **kwargs):
+        """タスク状態を保存し、進捗チャンネルへ配信する"""
+        super().update_state(task_id=task_id, state=state, meta=meta, **kwargs)
+        publish_progress(task_id or self.request.id, state, meta)
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        """タスク失敗時に失敗状態を配信する"""
+        publish_progress(task_id, 'FAILURE', exception_info(exc))
+        super().on_failure(exc, task_id, args, kwargs, einfo)
+
+    def on_success(self, retval, task_id, args, kwargs):
+        """タスク成功時に結果を配信する"""
+        publish_progress(task_id, 'SUCCESS', retval)
+        super().on_success(retval, task_id, args, kwargs)
+
+
+class ProgressReporter:
+    """
+    進捗更新をまとめて配信するレポーター
+
+    描画ループからは update() で最新値を記録するだけにし、結果バックエンドへの保存と
+    pub/sub 配信は別スレッドで間引いて行う（時間間隔・進捗差分の両方で間引く）。
+    エンコード中など update() が途絶えた間も、max_interval ごとに最後の進捗を再配信する。
+    配信するメタ情報には stage / frames_done / total_frames / fps / eta_seconds を含む。
+
+    使用例:
+        with ProgressReporter(self, stage='render', progress_range=(0.1, 0.9)) as reporter:
+            generator.run(progress_callback=reporter.update)
+    """
+
+    def __init__(
+        self,
+        task,
+        task_id: Optional[str] = None,
+        stage: Optional[str] = None,
+        progress_range: Tuple[float, float] = (0.0, 1.0),
+        message_template: str = "処理中... ({percent}%)",
+        min_interval: float = 0.5,
+        min_delta: float = 0.005,
+        max_interval: float = 5.0,
+        meta: Optional[Dict[str, Any]] = None,
+    ):
+        self.task = task
+        self.task_id = task_id or task.request.id
+        self.stage = stage
+        self.progress_range = progress_range
+        self.message_template = message_template
+        self.min_interval = min_interval
+        self.min_delta = min_delta
+        self.max_interval = max_interval
+        # 毎回の配信に含めるメタ情報（途中で追加してもよい）
+        self.meta: Dict[str, Any] = dict(meta or {})
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self._pending: Optional[Dict[str, Any]] = None
+        self._last_sent: Optional[Dict[str, Any]] = None
+        self._started_at = time.monotonic()
+        self._last_sent_at = 0.0
+        self._last_sent_progress: Optional[float] = None
+        self.published_count = 0
+        self.update_count = 0
+
+    def __enter__(self) -> "ProgressReporter":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.close(flush=exc_type is None)
+        return False
+
+    def start(self) -> None:
+        """配信スレッドを開始"""
+        if self._thread is not None:
+            return
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(
+            target=self._run, name=f"progress-{self.task_id}", daemon=True
+        )
+        self._thread.start()
+
+    def update(
+        self,
+        progress: float,
+        message: Optional[str] = None,
+        frames_done: Optional[int] = None,
+        total_frames: Optional[int] = None,
+        **extra: Any,
+    ) -> None:
+        """最新の進捗を記録する（描画スレッドから頻繁に呼ばれても軽量）
+
+        Args:
+            progress: ステージ内の進捗（0.0〜1.0）
+            message: 表示メッセージ（省略時は message_template から生成）
+            frames_done: 描画済みフレーム数
+            total_frames: 総フレーム数（分かっている場合）
+            extra: メタ情報に追加するフィールド
+        """
+        self.update_count += 1
+        with self._lock:
+            self._pending = {
+                "progress": min(1.0, max(0.0, progress)),
+                "message": message,
+                "frames_done": frames_done,
+                "total_frames": total_frames,
+                "extra": extra,
+                "at": time.monotonic(),
+            }
+        self._wakeup.set()
+
+    def close(self, flush: bool = True) -> None:
+        """配信スレッドを停止する（flush=True なら最後の進捗を必ず配信する）"""
+        self._stopped = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+        if flush:
+            with self._lock:
+                pending, self._pending = self._pending, None
+            if pending is not None:
+                self._publish(pending)
+
+    def _run(self) -> None:
+        """配信ループ"""
+        while not self._stopped:
+            timeout = self.max_interval
+            if self._last_sent is not None:
+                timeout = max(0.05, self.max_interval - (time.monotonic() - self._last_sent_at))
+            self._wakeup.wait(timeout=timeout)
+            if self._stopped:
+                break
+
+            # 最短配信間隔を守る
+            wait = self.min_interval - (time.monotonic() - self._last_sent_at)
+            if wait > 0:
+                time.sleep(wait)
+                if self._stopped:
+                    break
+
+            with self._lock:
+                self._wakeup.clear()
+                pending = self._pending
+                since_last = time.monotonic() - self._last_sent_at
+                if pending is None:
+                    if self._last_sent is None or since_last < self.max_interval:
+                        continue
+                    # 新しい更新がなくても最後の進捗を再配信する（ハートビート）
+                    pending = self._last_sent
+                elif (
+                    self._last_sent_progress is not None
+                    and abs(pending["progress"] - self._last_sent_progress) < self.min_delta
+                    and since_last < self.max_interval
+                ):
+                    # 変化が小さい場合は次回にまとめる
+                    continue
+                self._pending = None
+
+            self._publish(pending)
+
+    def _publish(self, pending: Dict[str, Any]) -> None:
+        """結果バックエンドへ保存し pub/sub へ配信する"""
+        start, end = self.progress_range
+        progress = pending["progress"]
+        elapsed = max(1e-6, pending["at"] - self._started_at)
+
+        meta: Dict[str, Any] = {
+            "progress": start + (end - start) * progress,
+            "message": pending["message"]
+            or self.message_template.format(percent=int(progress * 100)),
+        }
+        if self.stage:
+            meta["stage"] = self.stage
+        if pending["frames_done"] is not None:
+            meta["frames_done"] = pending["frames_done"]
+            meta["fps"] = round(pending["frames_done"] / elapsed, 2)
+        if pending["total_frames"] is not None:
+            meta["total_frames"] = pending["total_frames"]
+        if 0.0 < progress < 1.0:
+            meta["eta_seconds"] = round(elapsed * (1.0 - progress) / progress, 1)
+        meta.update(self.meta)
+        meta.update(pending["extra"])
+
+        try:
+            self.task.update_state(task_id=self.task_id, state="PROGRESS", meta=meta)
+            self.published_count += 1
+        except Exception as e:
+            logger.warning(f"進捗の保存に失敗しました (task_id={self.task_id}): {e}")
+        self._last_sent = pending
+        self._last_sent_at = time.monotonic()
+        self._last_sent_progress = progress
@@ -0,0 +1,417 @@
+"""ステージ分割された動画生成Celeryタスク
+
+voice（音声合成, I/Oバウンド） → render（音声解析・フレーム描画） → encode（音声合成・エンコード）
+の順にチェーン実行する。各ステージは専用キューで処理されるため、キューごとに
+ワーカーの並列数を変えられる。ステージ間ではジョブ作業ディレクトリのパスのみを受け渡し、
+成果物（音声・一時動画）とマニフェストは共有ボリューム上に置く。
+
+セクション単位のクリップキャッシュが使える場合（SECTION_RENDER_CACHE、追加出力・逐次出力なし）は、
+voice で描画が必要なセクションのセリフだけを合成して音声キャッシュに入れ、render で
+変更のあったセクションだけを描画してキャッシュ済みクリップと連結する（encode は再エンコードしない）。
+
+ジョブIDはチェーン最終タスク（encode）のタスクIDで、各ステージはこのIDに対して
+進捗を書き込むため、クライアントは単一タスクと同じ方法で進捗を取得できる。
+"""
+from typing import Dict, Any, List, Optional
+import logging
+import os
+import shutil
+import time
+
+from app.tasks.celery_app import celery_app
+from app.tasks.video_tasks import VideoGenerationTask
+from app.config.app import WORKER_CONFIG, DEFAULT_RENDER_PROFILE
+from app.services.video.video_job import (
+    build_job_result,
+    prepare_job_inputs,
+    to_renditions,
+    to_video_sections,
+    read_job_manifest,
+    write_job_manifest,
+)
+from app.services.video.template_clip_cache import get_closing_clip, get_template_clip_cache
+from app.services.video.section_clip_cache import (
+    get_section_clip_cache,
+    render_video_by_section,
+    split_conversations_by_section,
+)
+from app.services.video.progressive_output import render_progressive
+from app.services.video.render_stats import record_render
+from app.services.video.video_generator_utils import probe_duration, rendition_path
+from app.utils_legacy.files import FileManager, JobWorkspace
+from app.tasks.worker_state import get_video_generator
+from app.tasks.progress import ProgressReporter
+
+logger = logging.getLogger(__name__)
+
+# 各ステージが担当する全体進捗の範囲
+VOICE_PROGRESS_RANGE = (0.05, 0.4)
+RENDER_PROGRESS_RANGE = (0.4, 0.85)
+ENCODE_PROGRESS_RANGE = (0.85, 1.0)
+
+
+def _report_progress(task, job_id: str, progress_range, progress: float, message: str):
+    """ジョブIDに対して全体進捗を書き込む"""
+    start, end = progress_range
+    task.update_state(
+        task_id=job_id,
+        state='PROGRESS',
+        meta={
+            'progress': start + (end - start) * progress,
+            'message': message
+        }
+    )
+
+
+def _fail_job(task, job_id: str, workspace_root: Optional[str], exc: Exception, message: str):
+    """ジョブを失敗状態にして作業ディレクトリを削除する"""
+    logger.error(f"{message} (job_id={job_id}): {exc}", exc_info=True)
+    if workspace_root:
+        JobWorkspace(job_id, base_dir=os.path.dirname(workspace_root)).cleanup()
+    task.update_state(
+        task_id=job_id,
+        state='FAILURE',
+        meta={
+            'error': str(exc),
+            'error_type': type(exc).__name__,
+            'message': message
+        }
+    )
+
+
+@celery_app.task(bind=True, base=VideoGenerationTask, name='app.tasks.video.synthesize_voices')
+def synthesize_voices_stage(
+    self,
+    job_id: str,
+    conversations: List[Dict[str, Any]],
+    title: Optional[str] = None,
+    enable_subtitles: bool = True,
+    conversation_mode: str = "duo",
+    sections: Optional[List[Dict[str, Any]]] = None,
+    speed: Optional[float] = None,
+    pitch: Optional[float] = None,
+    intonation: Optional[float] = None,
+    animation_seed: Optional[int] = None,
+    render_profile: str = "default",
+    progressive: bool = False,
+    renditions: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """
+    音声合成ステージ
+
+    Returns:
+        次ステージへ渡すジョブ参照（job_id, workspace）
+    """
+    workspace = JobWorkspace(job_id)
+    try:
+        from app.core.asset_generators.voice_generator import VoiceGenerator
+
+        logger.info(f"音声合成ステージ開始 (job_id={job_id})")
+        # ステージをまたいで処理時間を求めるため、壁時計の時刻を記録する
+        started_at = time.time()
+        workspace.create()
+
+        # 締めくくりセクションは事前レンダリング済みクリップをエンコードステージで連結する
+        # （未作成なら描画ステージで一度だけレンダリングする。ここでは連結するかだけを決める）
+        render_settings = {
+            'enable_subtitles': enable_subtitles,
+            'conversation_mode': conversation_mode,
+            'speed': speed,
+            'pitch': pitch,
+            'intonation': intonation,
+            'animation_seed': animation_seed,
+            'render_profile': render_profile,
+        }
+        # 追加出力がある場合は全体を1つのフレーム列からエンコードするため本編に含めて描画する
+        use_closing_clip = WORKER_CONFIG.template_clip_cache and not renditions
+
+        conversations_with_closing, sections = prepare_job_inputs(
+            conversations, sections, include_closing=not use_closing_clip
+        )
+
+        # セクション単位のクリップキャッシュを使う場合は、描画が必要なセクションの
+        # 未キャッシュのセリフだけを合成して音声キャッシュへ入れる
+        video_sections = to_video_sections(sections)
+        section_chunks = None
+        if (
+            WORKER_CONFIG.section_render_cache
+            and video_sections
+            and not renditions
+            and not progressive
+        ):
+            section_chunks = split_conversations_by_section(
+                conversations_with_closing, video_sections
+            )
+        section_cache = get_section_clip_cache()
+        if section_chunks is not None:
+            lines = section_cache.lines_to_synthesize(
+                video_sections, section_chunks, render_settings
+            )
+            targets = [conv for conv, _ in lines]
+        else:
+            targets = conversations_with_closing
+
+        _report_progress(self, job_id, VOICE_PROGRESS_RANGE, 0.0, '音声を生成中...')
+
+        voice_generator = VoiceGenerator()
+        audio_paths: List[Optional[str]] = []
+        total = max(1, len(targets))
+        with ProgressReporter(
+            self, task_id=job_id, stage='voice', progress_range=VOICE_PROGRESS_RANGE
+        ) as reporter:
+            for index, audio_path in voice_generator.stream_conversation_voices(
+                conversations=targets,
+                speed=speed,
+                pitch=pitch,
+                intonation=intonation,
+                output_dir=workspace.subdir("voices"),
+                max_workers=WORKER_CONFIG.voice_parallelism
+            ):
+                audio_paths.append(audio_path)
+                if section_chunks is not None and audio_path:
+                    section_cache.line_cache.put_audio(lines[index][1], audio_path)
+                reporter.update(
+                    (index + 1) / total,
+                    message=f'音声を生成中... ({index + 1}/{total})'
+                )
+
+        if section_chunks is not None:
+            section_cache.line_cache.prune()
+            # 描画ステージは音声キャッシュから読むため、作業ディレクトリの音声は使わない
+            audio_paths = []
+        elif not any(audio_paths):
+            raise ValueError("音声生成に失敗しました")
+
+        write_job_manifest(workspace.root, {
+            'job_id': job_id,
+            'title': title,
+            'enable_subtitles': enable_subtitles,
+            'conversation_mode': conversation_mode,
+            'conversations': conversations_with_closing,
+            'sections': sections,
+            'audio_paths': audio_paths,
+            'animation_seed': animation_seed,
+            'render_profile': render_profile,
+            'progressive': progressive,
+            'renditions': renditions,
+            'closing_settings': render_settings if use_closing_clip else None,
+            'render_settings': render_settings,
+            'section_render': section_chunks is not None,
+            'started_at': started_at,
+        })
+
+        logger.info(
+            f"音声合成ステージ完了 (job_id={job_id}): "
+            f"{sum(1 for p in audio_paths if p)}/{len(targets)}件"
+            + (" (セクション単位で描画)" if section_chunks is not None else "")
+        )
+        return {'job_id': job_id, 'workspace': workspace.root}
+
+    except Exception as e:
+        _fail_job(self, job_id, workspace.root, e, '音声生成に失敗しました')
+        raise
+
+
+@celery_app.task(bind=True, base=VideoGenerationTask, name='app.tasks.video.render_frames')
+def render_frames_stage(self, job_ref: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    フレーム描画ステージ
+
+    マニフェストの音声を解析してタイムラインを構築し、音声なしの一時動画を描画する。
+    """
+    job_id = job_ref['job_id']
+    workspace_root = job_ref['workspace']
+    try:
+        logger.info(f"フレーム描画ステージ開始 (job_id={job_id})")
+        manifest = read_job_manifest(workspace_root)
+
+        _report_progress(self, job_id, RENDER_PROGRESS_RANGE, 0.0, '動画を生成中...')
+
+        temp_video_path = os.path.join(workspace_root, "video_temp.mp4")
+        started_at = time.monotonic()
+        video_generator = get_video_generator(manifest.get('render_profile'))
+        with ProgressReporter(
+            self,
+            task_id=job_id,
+            stage='render',
+            progress_range=RENDER_PROGRESS_RANGE,
+            message_template='動画を生成中... ({percent}%)'
+        ) as reporter:
+            if manifest.get('section_render'):
+                # 変更のあったセクションだけを描画し、キャッシュ済みクリップと連結する
+                section_video_path = os.path.join(workspace_root, "sections.mp4")
+                rendered = render_video_by_section(
+                    video_generator,
+                    manifest['conversations'],
+                    to_video_sections(manifest['sections']),
+                    manifest['render_settings'],
+                    section_video_path,
+                    progress_callback=reporter.update,
+                )
+                timeline = None
+                if rendered is not None:
+                    temp_video_path = rendered['video_path']
+                    manifest['section_results'] = rendered['sections']
+                    timeline = {'duration': rendered['duration'], 'frames': rendered['frames']}
+            elif manifest.get('progressive'):
+                # 音声は合成済みのため、最終音声を作ってからHLSを書き出しながら描画する
+                def on_playlist(url: str):
+                    reporter.meta['playlist_url'] = url
+                    reporter.update(0.0)
+
+                progressive_path = os.path.join(workspace_root, "progressive.mp4")
+                timeline = render_progressive(
+                    video_generator,
+                    job_id,
+                    manifest['conversations'],
+                    manifest['audio_paths'],
+                    to_video_sections(manifest['sections']),
+                    output_path=progressive_path,
+                    work_dir=workspace_root,
+                    progress_callback=reporter.update,
+                    on_playlist=on_playlist,
+                    enable_subtitles=manifest['enable_subtitles'],
+                    conversation_mode=manifest['conversation_mode'],
+                    started_at=started_at,
+                    animation_seed=manifest.get('animation_seed'),
+                    renditions=[
+                        (rendition, rendition_path(progressive_path, rendition))
+                        for rendition in to_renditions(manifest.get('renditions')) or []
+                    ],
+                )
+                temp_video_path = timeline['video_path'] if timeline else temp_video_path
+            else:
+                timeline = video_generator.render_conversation_timeline(
+                    conversations=manifest['conversations'],
+                    audio_stream=enumerate(manifest['audio_paths']),
+                    temp_video_path=temp_video_path,
+                    progress_callback=reporter.update,
+                    enable_subtitles=manifest['enable_subtitles'],
+                    conversation_mode=manifest['conversation_mode'],
+                    sections=to_video_sections(manifest['sections']),
+                    started_at=started_at,
+                    animation_seed=manifest.get('animation_seed'),
+                )
+        # 締めくくりクリップが未作成ならここでレンダリングしておく（エンコードステージはキャッシュから取得する）
+        closing_clip = None
+        if timeline is not None and manifest.get('closing_settings'):
+            closing_clip = get_closing_clip(video_generator, manifest['closing_settings'])
+        video_generator.release_job_resources()
+
+        if timeline is None or not os.path.exists(temp_video_path):
+            raise ValueError("動画生成に失敗しました")
+        if manifest.get('closing_settings') and closing_clip is None:
+            raise ValueError("締めくくりクリップの取得に失敗しました")
+
+        manifest['temp_video_path'] = temp_video_path
+        manifest['timeline'] = timeline
+        write_job_manifest(workspace_root, manifest)
+
+        logger.info(f"フレーム描画ステージ完了 (job_id={job_id}): frames={timeline['frames']}")
+        return job_ref
+
+    except Exception as e:
+        _fail_job(self, job_id, workspace_root, e, '動画生成に失敗しました')
+        raise
+
+
+@celery_app.task(bind=True, base=VideoGenerationTask, name='app.tasks.video.encode_video')
+def encode_video_stage(self, job_ref: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    エンコードステージ
+
+    一時動画に音声・BGMを合成して最終動画を書き出し、作業ディレクトリを削除する。
+    このタスクのIDがジョブIDとなり、戻り値がジョブの結果になる。
+    """
+    job_id = job_ref['job_id']
+    workspace_root = job_ref['workspace']
+    try:
+        logger.info(f"エンコードステージ開始 (job_id={job_id})")
+        manifest = read_job_manifest(workspace_root)
+        timeline = manifest['timeline']
+
+        _report_progress(self, job_id, ENCODE_PROGRESS_RANGE, 0.0, '動画をエンコード中...')
+
+        video_generator = get_video_generator(manifest.get('render_profile'))
+        final_output_path = FileManager.create_video_output_path(manifest['title'])
+        if video_generator.profile.name != DEFAULT_RENDER_PROFILE:
+            final_output_path = final_output_path.replace(
+                ".mp4", f"_{video_generator.profile.name}.mp4"
+            )
+        closing_settings = manifest.get('closing_settings')
+        output_path = (
+            os.path.join(workspace_root, "main.mp4") if closing_settings else final_output_path
+        )
+        rendition_outputs = [
+            (rendition, rendition_path(final_output_path, rendition))
+            for rendition in to_renditions(manifest.get('renditions')) or []
+        ]
+        encode_seconds = None
+        if manifest.get('section_render'):
+            # 描画ステージでエンコード済みのセクションクリップを連結済み
+            shutil.move(manifest['temp_video_path'], output_path)
+        elif manifest.get('progressive'):
+            # 描画ステージで音声入りの faststart MP4（と追加出力）まで作成済み
+            shutil.move(manifest['temp_video_path'], output_path)
+            for rendition, path in rendition_outputs:
+                shutil.move(rendition_path(manifest['temp_video_path'], rendition), path)
+        else:
+            video_generator.last_encode = None
+            output_path = video_generator.encode_conversation_video(
+                temp_video_path=manifest['temp_video_path'],
+                audio_file_list=timeline['audio_file_list'],
+                line_section_indices=timeline['line_section_indices'],
+                output_path=output_path,
+                sections=to_video_sections(manifest['sections']),
+                renditions=rendition_outputs,
+            )
+            encode_seconds = (video_generator.last_encode or {}).get('encode_seconds')
+        video_generator.release_job_resources()
+
+        if not output_path or not os.path.exists(output_path):
+            raise ValueError("動画生成に失敗しました")
+
+        if closing_settings:
+            closing_clip = get_closing_clip(video_generator, closing_settings)
+            if closing_clip is None:
+                raise ValueError("締めくくりクリップの取得に失敗しました")
+            output_path = get_template_clip_cache().append_clip(
+                output_path, closing_clip, final_output_path, video_generator.profile
+            )
+
+        JobWorkspace(job_id, base_dir=os.path.dirname(workspace_root)).cleanup()
+
+        self.update_state(
+            state='PROGRESS',
+            meta={'progress': 1.0, 'message': '動画生成完了！'}
+        )
+
+        # 実時間比を記録し、デフォルトプロファイルと比べた速度を求める（単一タスクと同じ）
+        render_stats = record_render(
+            video_generator.profile.name,
+            probe_duration(output_path),
+            time.time() - manifest.get('started_at', time.time()),
+            encode_seconds=encode_seconds,
+        )
+
+        logger.info(
+            f"エンコードステージ完了 (job_id={job_id}): {output_path} "
+            f"(実時間比={render_stats['realtime_factor']}, "
+            f"デフォルト比={render_stats['speedup_vs_default']})"
+        )
+
+        return build_job_result(
+            output_path=output_path,
+            render_profile=video_generator.profile.name,
+            animation_seed=manifest.get('animation_seed'),
+            time_to_first_frame=timeline.get('time_to_first_frame'),
+            playlist_url=timeline.get('playlist_url'),
+            rendition_paths=[path for _, path in rendition_outputs],
+            encode_seconds=encode_seconds,
+            render_stats=render_stats,
+            section_results=manifest.get('section_results'),
+        )
+
+    except Exception as e:
+        _fail_job(self, job_id, workspace_root, e, '動画生成に失敗しました')
+        raise
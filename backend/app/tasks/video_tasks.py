@@ -1,21 +1,36 @@
 """Video generation Celery tasks"""
-from celery import Task
 from typing import Dict, Any, List, Optional
 import logging
 import os
+import shutil
+import time
 
 from app.tasks.celery_app import celery_app
-from app.services.video.video_generator import VideoGenerator
 from app.core.asset_generators.voice_generator import VoiceGenerator
-from app.models.scripts.common import VideoSection
-from app.config.content_config.closing_section import create_closing_section
-from app.utils_legacy.files import FileManager
+from app.config.app import WORKER_CONFIG, DEFAULT_RENDER_PROFILE
+from app.services.video.video_job import (
+    build_job_result,
+    prepare_job_inputs,
+    to_renditions,
+    to_video_sections,
+)
+from app.services.video.template_clip_cache import get_closing_clip, get_template_clip_cache
+from app.services.video.section_clip_cache import render_video_by_section
+from app.services.video.render_stats import record_render
+from app.services.video.progressive_output import render_progressive
+from app.services.video.video_generator_utils import probe_duration, rendition_path
+from app.utils_legacy.files import FileManager, JobWorkspace
+from app.tasks.worker_state import get_video_generator
+from app.tasks.progress import ProgressPublishingTask, ProgressReporter
 
 logger = logging.getLogger(__name__)
 
 
-class VideoGenerationTask(Task):
-    """動画生成タスクの基底クラス"""
+class VideoGenerationTask(ProgressPublishingTask):
+    """動画生成タスクの基底クラス
+
+    状態更新は結果バックエンドへの保存に加えて pub/sub チャンネルにも配信する。
+    """
     
     def on_failure(self, exc, task_id, args, kwargs, einfo):
         """タスク失敗時の処理"""
@@ -38,7 +53,11 @@ def generate_video_task(
     sections: Optional[List[Dict[str, Any]]] = None,
     speed: Optional[float] = None,
     pitch: Optional[float] = None,
-    intonation: Optional[float] = None
+    intonation: Optional[float] = None,
+    animation_seed: Optional[int] = None,
+    render_profile: str = "default",
+    progressive: bool = False,
+    renditions: Optional[List[Dict[str, Any]]] = None
 ) -> Dict[str, Any]:
     """
     動画生成タスク
@@ -52,171 +71,193 @@ def generate_video_task(
         speed: 話速
         pitch: 音高
         intonation: 抑揚
+        animation_seed: アニメーションのシード（省略時は台本の内容から決定）
+        render_profile: 描画プロファイル（default / preview）
+        progressive: 描画中の動画をHLSで逐次出力するか（音声をすべて合成してから描画する）
+        renditions: 最終動画と同時に書き出す追加出力（name, height, crf, video_bitrate, container）
     
     Returns:
         生成結果
     """
+    started_at = time.monotonic()
     try:
         logger.info(f"動画生成タスク開始 (task_id={self.request.id})")
         
-        # 締めくくりセクションを自動追加
-        closing_section = create_closing_section()
-        
-        # 締めくくりセクションのセグメントをconversationsに追加
-        closing_conversations = []
-        for segment in closing_section.segments:
-            closing_conversations.append({
-                "speaker": segment.speaker,
-                "text": segment.text,
-                "text_for_voicevox": segment.text_for_voicevox,
-                "expression": segment.expression,
-                "background": closing_section.scene_background,
-                "visible_characters": segment.visible_characters,
-                "character_expressions": segment.character_expressions,
-            })
-        
-        # conversationsリストに締めくくりセクションを追加
-        conversations_with_closing = conversations + closing_conversations
-        logger.info(
-            f"締めくくりセクションを追加: "
-            f"元の会話数={len(conversations)}, "
-            f"締めくくりセリフ数={len(closing_conversations)}, "
-            f"合計={len(conversations_with_closing)}"
-        )
-        
-        # sectionsが指定されている場合は、締めくくりセクションをsectionsの最後に追加
-        if sections:
-            sections_dict = [section for section in sections]
-            # VideoSectionオブジェクトを辞書に変換
-            closing_section_dict = closing_section.model_dump()
-            sections_dict.append(closing_section_dict)
-            sections = sections_dict
-            logger.info("締めくくりセクションをsectionsに追加しました")
-        else:
-            # sectionsが指定されていない場合、元の会話を1つのセクションとして扱い、
-            # その後に締めくくりセクションを追加
-            from app.models.scripts.common import ConversationSegment
-            
-            # 元の会話を1つのセクションとして作成
-            main_section_segments = []
-            # デフォルトの背景を取得（最初の会話の背景を使用、なければ"default"）
-            default_background = "default"
-            if conversations:
-                default_background = conversations[0].get("background", "default")
-            
-            for conv in conversations:
-                segment = ConversationSegment(
-                    speaker=conv.get("speaker", "zundamon"),
-                    text=conv.get("text", ""),
-                    text_for_voicevox=conv.get("text_for_voicevox", conv.get("text", "")),
-                    expression=conv.get("expression", "normal"),
-                    visible_characters=conv.get("visible_characters", ["zundamon"]),
-                    character_expressions=conv.get("character_expressions", {}),
-                )
-                main_section_segments.append(segment)
-            
-            main_section = VideoSection(
-                section_name="メイン",
-                section_key="main",
-                scene_background=default_background if conversations else "default",
-                bgm_id="none",
-                bgm_volume=0.0,
-                segments=main_section_segments,
-            )
-            
-            # メインセクションと締めくくりセクションを結合
-            closing_section_dict = closing_section.model_dump()
-            sections = [main_section.model_dump(), closing_section_dict]
-            logger.info(
-                f"sectionsが指定されていないため、"
-                f"元の会話をメインセクションとして作成し、"
-                f"締めくくりセクションを追加しました "
-                f"(メインセクション: {len(main_section_segments)}セグメント, "
-                f"締めくくりセクション: {len(closing_section.segments)}セグメント)"
-            )
-        
-        # 進捗更新: 音声生成開始
-        self.update_state(
-            state='PROGRESS',
-            meta={'progress': 0.1, 'message': '音声を生成中...'}
+        # ワーカープロセスに常駐する VideoGenerator を再利用する（プロファイルごと）
+        video_generator = get_video_generator(render_profile)
+        # 常駐インスタンスのため、前のジョブの結果が残らないようにする
+        video_generator.last_encode = None
+        video_generator.last_timeline = None
+
+        # 締めくくりセクションは事前レンダリング済みクリップを連結する（初回のみレンダリング）
+        # 利用できない場合は従来どおり本編に含めて描画する
+        render_settings = {
+            'enable_subtitles': enable_subtitles,
+            'conversation_mode': conversation_mode,
+            'speed': speed,
+            'pitch': pitch,
+            'intonation': intonation,
+            'animation_seed': animation_seed,
+            'render_profile': video_generator.profile.name,
+        }
+        # 追加出力は全体を1つのフレーム列からエンコードするため、締めくくりも本編に含めて描画する
+        rendition_list = to_renditions(renditions)
+        closing_clip = (
+            None if rendition_list else get_closing_clip(video_generator, render_settings)
         )
-        
-        # 音声生成（締めくくりセクションを含む）
-        voice_generator = VoiceGenerator()
-        audio_file_list = None
-        try:
-            audio_file_list = voice_generator.generate_conversation_voices(
-                conversations=conversations_with_closing,
-                speed=speed,
-                pitch=pitch,
-                intonation=intonation
-            )
-            
-            if not audio_file_list:
-                raise ValueError("音声生成に失敗しました")
-            
-            logger.info(
-                f"音声生成完了: "
-                f"会話数={len(conversations_with_closing)}, "
-                f"音声ファイル数={len(audio_file_list)}"
-            )
-        except Exception as e:
-            # 音声生成失敗時は既に生成されたファイルがあれば削除
-            if audio_file_list:
-                try:
-                    FileManager.cleanup_audio_files(audio_file_list)
-                except Exception:
-                    pass
-            raise
-        
-        # 進捗更新: 動画生成開始
-        self.update_state(
-            state='PROGRESS',
-            meta={'progress': 0.4, 'message': '動画を生成中...'}
+
+        # 締めくくりセクションを付与し、セクション情報を変換
+        conversations_with_closing, sections = prepare_job_inputs(
+            conversations, sections, include_closing=closing_clip is None
         )
-        
-        # セクション情報の変換
-        video_sections = None
-        if sections:
-            from app.models.scripts.common import VideoSection
-            video_sections = [VideoSection(**section) for section in sections]
-            total_segments = sum(len(section.segments) for section in video_sections)
-            logger.info(
-                f"セクション情報変換完了: "
-                f"セクション数={len(video_sections)}, "
-                f"総セグメント数={total_segments}, "
-                f"音声ファイル数={len(audio_file_list)}"
-            )
+        video_sections = to_video_sections(sections)
         
         # 出力パスを生成
         output_path = FileManager.create_video_output_path(title)
+        if video_generator.profile.name != DEFAULT_RENDER_PROFILE:
+            output_path = output_path.replace(".mp4", f"_{video_generator.profile.name}.mp4")
         logger.info(f"動画出力パス: {output_path}")
+        rendition_outputs = [
+            (rendition, rendition_path(output_path, rendition))
+            for rendition in rendition_list or []
+        ]
         
-        # 動画生成
-        video_generator = VideoGenerator()
-        
-        def progress_callback(progress: float):
-            """進捗コールバック"""
-            self.update_state(
-                state='PROGRESS',
-                meta={
-                    'progress': 0.4 + (progress * 0.5),  # 40%から90%まで
-                    'message': f'動画を生成中... ({int(progress * 100)}%)'
-                }
-            )
-        
-        output_path = video_generator.generate_conversation_video(
-            conversations=conversations_with_closing,
-            audio_file_list=audio_file_list,
-            output_path=output_path,
-            enable_subtitles=enable_subtitles,
-            conversation_mode=conversation_mode,
-            sections=video_sections,
-            progress_callback=progress_callback
+        # 進捗更新: 音声生成・動画生成開始
+        self.update_state(
+            state='PROGRESS',
+            meta={'progress': 0.1, 'message': '音声を生成しながら動画を生成中...'}
         )
         
-        if not output_path or not os.path.exists(output_path):
-            raise ValueError("動画生成に失敗しました")
+        section_results = None
+        playlist = None
+        if progressive:
+            # 音声をすべて合成して最終音声を作ってから、HLSを書き出しながら描画する
+            with JobWorkspace(self.request.id) as workspace:
+                audio_paths = [
+                    audio_path
+                    for _, audio_path in VoiceGenerator().stream_conversation_voices(
+                        conversations=conversations_with_closing,
+                        speed=speed,
+                        pitch=pitch,
+                        intonation=intonation,
+                        output_dir=workspace.subdir("voices"),
+                        max_workers=WORKER_CONFIG.voice_parallelism
+                    )
+                ]
+                with ProgressReporter(
+                    self,
+                    stage='render',
+                    progress_range=(0.1, 0.9),
+                    message_template='動画を生成中... ({percent}%)'
+                ) as reporter:
+                    def on_playlist(url: str):
+                        reporter.meta['playlist_url'] = url
+                        reporter.update(0.0)
+
+                    rendered = render_progressive(
+                        video_generator,
+                        self.request.id,
+                        conversations_with_closing,
+                        audio_paths,
+                        video_sections,
+                        output_path=workspace.path("progressive.mp4"),
+                        work_dir=workspace.root,
+                        progress_callback=reporter.update,
+                        on_playlist=on_playlist,
+                        enable_subtitles=enable_subtitles,
+                        conversation_mode=conversation_mode,
+                        started_at=started_at,
+                        animation_seed=animation_seed,
+                        renditions=rendition_outputs,
+                    )
+                if rendered is None:
+                    raise ValueError("動画生成に失敗しました")
+                video_generator.last_timeline = rendered
+                playlist = rendered['playlist_url']
+
+                if closing_clip:
+                    output_path = get_template_clip_cache().append_clip(
+                        rendered['video_path'], closing_clip, output_path, video_generator.profile
+                    )
+                else:
+                    shutil.move(rendered['video_path'], output_path)
+
+        # セクション単位のクリップキャッシュを使い、変更のあったセクションのみ描画して連結する
+        elif WORKER_CONFIG.section_render_cache and video_sections and not rendition_list:
+            with ProgressReporter(
+                self,
+                stage='render',
+                progress_range=(0.1, 0.9),
+                message_template='動画を生成中... ({percent}%)'
+            ) as reporter:
+                rendered = render_video_by_section(
+                    video_generator,
+                    conversations_with_closing,
+                    video_sections,
+                    render_settings,
+                    output_path,
+                    tail_clips=[closing_clip] if closing_clip else None,
+                    progress_callback=reporter.update,
+                )
+            if rendered:
+                output_path = rendered['video_path']
+                section_results = rendered['sections']
+                # 最後に描画したセクションではなく、連結した本編全体のタイムライン
+                video_generator.last_timeline = {
+                    'duration': rendered['duration'],
+                    'frames': rendered['frames'],
+                }
+
+        # 音声生成（締めくくりセクションを含む）をセリフ単位でストリーミングし、
+        # 確定したセクションから順にフレームを描画する
+        # 一時ファイルはジョブ専用の作業ディレクトリに閉じ込め、終了時に必ず削除する
+        if section_results is None and not progressive:
+            with JobWorkspace(self.request.id) as workspace:
+                voice_generator = VoiceGenerator()
+                audio_stream = voice_generator.stream_conversation_voices(
+                    conversations=conversations_with_closing,
+                    speed=speed,
+                    pitch=pitch,
+                    intonation=intonation,
+                    output_dir=workspace.subdir("voices"),
+                    max_workers=WORKER_CONFIG.voice_parallelism
+                )
+
+                final_output_path = output_path
+                if closing_clip:
+                    output_path = workspace.path("main.mp4")
+
+                # 進捗はレポーターで間引いて別スレッドから配信する（10%から90%まで）
+                with ProgressReporter(
+                    self,
+                    stage='render',
+                    progress_range=(0.1, 0.9),
+                    message_template='動画を生成中... ({percent}%)'
+                ) as reporter:
+                    output_path = video_generator.generate_conversation_video_streaming(
+                        conversations=conversations_with_closing,
+                        audio_stream=audio_stream,
+                        output_path=output_path,
+                        enable_subtitles=enable_subtitles,
+                        conversation_mode=conversation_mode,
+                        sections=video_sections,
+                        progress_callback=reporter.update,
+                        work_dir=workspace.root,
+                        started_at=started_at,
+                        animation_seed=animation_seed,
+                        renditions=rendition_outputs
+                    )
+                logger.info(
+                    f"進捗更新: 記録={reporter.update_count}回, 配信={reporter.published_count}回"
+                )
+
+                if not output_path or not os.path.exists(output_path):
+                    raise ValueError("動画生成に失敗しました")
+
+                if closing_clip:
+                    output_path = get_template_clip_cache().append_clip(
+                        output_path, closing_clip, final_output_path, video_generator.profile
+                    )
         
         # 進捗更新: 完了
         self.update_state(
@@ -224,34 +265,40 @@ def generate_video_task(
             meta={'progress': 1.0, 'message': '動画生成完了！'}
         )
         
-        video_generator.cleanup()
-        
-        try:
-            FileManager.cleanup_temp_files()
-        except Exception as cleanup_error:
-            logger.warning(f"Failed to cleanup temp files: {cleanup_error}")
-        
-        logger.info(f"動画生成タスク完了 (task_id={self.request.id}): {output_path}")
+        timeline = video_generator.last_timeline or {}
+        video_generator.release_job_resources()
+
+        # 実時間比を記録し、デフォルトプロファイルと比べた速度を求める
+        render_stats = record_render(
+            video_generator.profile.name,
+            probe_duration(output_path),
+            time.monotonic() - started_at,
+            encode_seconds=(video_generator.last_encode or {}).get('encode_seconds'),
+        )
         
-        # 相対パスを計算
-        from app.config.app import Paths
-        relative_path = os.path.relpath(output_path, Paths.get_outputs_dir())
+        logger.info(
+            f"動画生成タスク完了 (task_id={self.request.id}): {output_path} "
+            f"(最初のフレームまで={timeline.get('time_to_first_frame')}s, "
+            f"合計={time.monotonic() - started_at:.1f}s, "
+            f"プロファイル={video_generator.profile.name}, "
+            f"実時間比={render_stats['realtime_factor']}, "
+            f"デフォルト比={render_stats['speedup_vs_default']})"
+        )
         
-        return {
-            'status': 'completed',
-            'video_path': output_path,
-            'relative_path': relative_path,
-            'message': '動画生成が完了しました'
-        }
+        return build_job_result(
+            output_path=output_path,
+            render_profile=video_generator.profile.name,
+            animation_seed=animation_seed,
+            time_to_first_frame=timeline.get('time_to_first_frame'),
+            playlist_url=playlist,
+            rendition_paths=[path for _, path in rendition_outputs],
+            encode_seconds=(video_generator.last_encode or {}).get('encode_seconds'),
+            render_stats=render_stats,
+            section_results=section_results,
+        )
         
     except Exception as e:
         logger.error(f"動画生成タスクエラー (task_id={self.request.id}): {str(e)}", exc_info=True)
-        # エラー時も音声ファイルをクリーンアップ
-        if 'audio_file_list' in locals() and audio_file_list:
-            try:
-                FileManager.cleanup_audio_files(audio_file_list)
-            except Exception as cleanup_error:
-                logger.warning(f"Failed to cleanup audio files on task error: {cleanup_error}")
         # Celeryの例外情報を正しく設定
         self.update_state(
             state='FAILURE',
@@ -290,13 +337,21 @@ def generate_voice_task(
     try:
         logger.info(f"音声生成タスク開始 (task_id={self.request.id})")
         
+        # 並行実行時に上書きし合わないよう、タスクごとに一意なファイル名にする
+        from app.config.app import Paths
+        output_path = os.path.join(
+            Paths.get_temp_dir(),
+            FileManager.generate_unique_filename("voice", "wav")
+        )
+        
         voice_generator = VoiceGenerator()
         audio_path = voice_generator.generate_voice(
             text=text,
             speaker=speaker,
             speed=speed,
             pitch=pitch,
-            intonation=intonation
+            intonation=intonation,
+            output_path=output_path
         )
         
         if not audio_path or not os.path.exists(audio_path):
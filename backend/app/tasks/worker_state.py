@@ -0,0 +1,56 @@
+"""ワーカープロセス常駐リソース
+
+Celeryワーカーの子プロセス起動時（worker_process_init）に VideoGenerator を生成して
+フォント・budouxパーサー・キャラクター画像・背景・BGMを事前に読み込み、
+以降のタスクで使い回す。プロセス外（API側など）から呼ばれた場合は初回呼び出し時に生成する。
+描画プロファイル（default / preview）ごとに別のインスタンスを保持する。
+"""
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from celery.signals import worker_process_init
+
+logger = logging.getLogger(__name__)
+
+_video_generators: Dict[str, object] = {}
+_lock = threading.Lock()
+
+
+def get_video_generator(profile_name: Optional[str] = None):
+    """プロセス内で共有する VideoGenerator を取得
+
+    Args:
+        profile_name: 描画プロファイル名（省略時はデフォルト）
+    """
+    from app.config.app import get_render_profile
+
+    profile = get_render_profile(profile_name)
+    generator = _video_generators.get(profile.name)
+    if generator is None:
+        with _lock:
+            generator = _video_generators.get(profile.name)
+            if generator is None:
+                from app.services.video.video_generator import VideoGenerator
+
+                generator = VideoGenerator(profile)
+                _video_generators[profile.name] = generator
+    return generator
+
+
+@worker_process_init.connect
+def warm_up_worker_process(**kwargs):
+    """ワーカー子プロセス起動時に動画生成リソースを事前読み込みする"""
+    from app.config.app import WORKER_CONFIG
+
+    if not WORKER_CONFIG.warm_up:
+        return
+
+    started = time.monotonic()
+    try:
+        get_video_generator().warm_up()
+        logger.info(f"ワーカープロセスのウォームアップ完了 ({time.monotonic() - started:.2f}s)")
+    except Exception as e:
+        # ウォームアップに失敗してもタスク実行時に改めて読み込まれる
+        logger.warning(f"ワーカープロセスのウォームアップに失敗: {e}")
@@ -0,0 +1,57 @@
+"""LLM呼び出しの非同期実行
+
+LangChain の同期 API（llm.invoke）を専用スレッドプールで実行し、APIハンドラーが
+イベントループをブロックせずに待てるようにする。プールのスレッド数が
+プロセス内で同時に実行できるLLM呼び出しの上限になる。
+"""
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# プロセス内で同時に実行するLLM呼び出しの上限
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def get_llm_executor() -> ThreadPoolExecutor:
+    """LLM呼び出し用のスレッドプールを取得"""
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=LLM_MAX_CONCURRENCY, thread_name_prefix="llm"
+                )
+                logger.info(f"LLM実行プールを作成しました: max_workers={LLM_MAX_CONCURRENCY}")
+    return _executor
+
+
+async def run_llm_call(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    同期のLLM処理をスレッドプールで実行して結果を待つ
+
+    Args:
+        func: 実行する同期関数（内部で llm.invoke を呼ぶ生成処理など）
+        args: 位置引数
+        kwargs: キーワード引数
+
+    Returns:
+        func の戻り値
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_llm_executor(), functools.partial(func, *args, **kwargs)
+    )
+
@@ -1,13 +1,71 @@
-"""LLMファクトリーモジュール"""
+"""LLMファクトリーモジュール
+
+boto3 の bedrock-runtime クライアント（認証情報の解決・エンドポイント解決・HTTP接続プール）は
+生成コストが高いため、(リージョン, タイムアウト) ごとにプロセス内で1つだけ作って共有する。
+ChatBedrock インスタンスは (モデルID, リージョン, タイムアウト, temperature, max_tokens) ごとに
+再利用し、呼び出しごとの temperature / max_tokens の違いは別インスタンスとして扱う。
+langchain_aws は読み込みが重いため、APIプロセスの起動時には読み込まず最初の生成時に読み込む。
+"""
 
 import os
-from typing import Dict, Any, Optional
+import threading
+from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple
+import boto3
 from botocore.config import Config
-from langchain_aws import ChatBedrock
 from app.utils.logger import get_logger
 
+if TYPE_CHECKING:
+    from langchain_aws import ChatBedrock
+
 logger = get_logger(__name__)
 
+# 共有クライアントのHTTP接続プールの大きさ（同時LLM呼び出し数以上にする）
+BEDROCK_MAX_POOL_CONNECTIONS = int(os.getenv("BEDROCK_MAX_POOL_CONNECTIONS", "20"))
+
+_bedrock_clients: Dict[Tuple[str, int], Any] = {}
+_bedrock_llms: Dict[Tuple[str, str, int, float, int], "ChatBedrock"] = {}
+_registry_lock = threading.Lock()
+
+
+def get_bedrock_runtime_client(region_name: str, request_timeout: int = 600):
+    """プロセス内で共有する bedrock-runtime クライアントを取得
+
+    boto3 クライアントはスレッドセーフなため、同じ設定の呼び出し間で使い回す。
+
+    Args:
+        region_name: AWSリージョン名
+        request_timeout: 読み込みタイムアウト（秒）
+    """
+    key = (region_name, request_timeout)
+    client = _bedrock_clients.get(key)
+    if client is not None:
+        return client
+
+    with _registry_lock:
+        client = _bedrock_clients.get(key)
+        if client is None:
+            config = Config(
+                read_timeout=request_timeout,
+                connect_timeout=10,
+                retries={"max_attempts": 3, "mode": "standard"},
+                max_pool_connections=BEDROCK_MAX_POOL_CONNECTIONS,
+            )
+            client = boto3.session.Session().client(
+                "bedrock-runtime", region_name=region_name, config=config
+            )
+            _bedrock_clients[key] = client
+            logger.info(
+                f"Bedrockクライアントを作成しました: region={region_name}, timeout={request_timeout}s"
+            )
+    return client
+
+
+def clear_llm_registry() -> None:
+    """共有しているクライアントとLLMインスタンスを破棄する（認証情報の更新時など）"""
+    with _registry_lock:
+        _bedrock_llms.clear()
+        _bedrock_clients.clear()
+
 
 def create_bedrock_llm(
     model_id: str,
@@ -15,8 +73,10 @@ def create_bedrock_llm(
     max_tokens: int = 8192,
     region_name: Optional[str] = None,
     request_timeout: int = 600,
-) -> ChatBedrock:
-    """AWS Bedrock LLMインスタンスを生成する
+) -> "ChatBedrock":
+    """AWS Bedrock LLMインスタンスを取得する
+
+    同じ設定のインスタンスは再利用し、boto3クライアントは (リージョン, タイムアウト) ごとに共有する。
 
     Args:
         model_id: BedrockモデルID
@@ -51,24 +111,27 @@ def create_bedrock_llm(
             "AWS_DEFAULT_REGION を .env ファイルに設定してください（例: us-east-1）"
         )
 
-    # boto3 Configを使用してタイムアウトを設定
-    config = Config(
-        read_timeout=request_timeout,
-        connect_timeout=10,
-        retries={"max_attempts": 3, "mode": "standard"},
-    )
+    key = (model_id, region_name, request_timeout, float(temperature), max_tokens)
+    llm = _bedrock_llms.get(key)
+    if llm is not None:
+        return llm
+
+    from langchain_aws import ChatBedrock
 
-    return ChatBedrock(
+    client = get_bedrock_runtime_client(region_name, request_timeout)
+    llm = ChatBedrock(
+        client=client,
         model_id=model_id,
         model_kwargs={"temperature": temperature, "max_tokens": max_tokens},
         region_name=region_name,
-        config=config,
     )
+    with _registry_lock:
+        return _bedrock_llms.setdefault(key, llm)
 
 
 def create_llm_from_model_config(
     model_config: Dict[str, Any], temperature: Optional[float] = None
-) -> ChatBedrock:
+) -> "ChatBedrock":
     """モデル設定からLLMインスタンスを生成する
 
     Args:
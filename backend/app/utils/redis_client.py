@@ -0,0 +1,54 @@
+"""Redisクライアントユーティリティ
+
+Celeryの結果バックエンドと同じRedisに接続する。
+ワーカー側は同期クライアント、API側はイベントループをブロックしない非同期クライアントを使う。
+"""
+
+import os
+import threading
+from typing import Optional
+
+import redis
+import redis.asyncio as aioredis
+
+# タスク進捗の pub/sub チャンネル名の接頭辞
+PROGRESS_CHANNEL_PREFIX = "task-progress:"
+
+_sync_client: Optional[redis.Redis] = None
+_async_client: Optional[aioredis.Redis] = None
+_lock = threading.Lock()
+
+
+def get_redis_url() -> str:
+    """接続先RedisのURLを取得"""
+    return os.getenv(
+        "REDIS_URL",
+        os.getenv("CELERY_RESULT_BACKEND", "redis://redis:6379/0"),
+    )
+
+
+def get_sync_redis() -> redis.Redis:
+    """プロセス内で共有する同期Redisクライアントを取得"""
+    global _sync_client
+    if _sync_client is None:
+        with _lock:
+            if _sync_client is None:
+                _sync_client = redis.Redis.from_url(
+                    get_redis_url(), decode_responses=True
+                )
+    return _sync_client
+
+
+def get_async_redis() -> aioredis.Redis:
+    """プロセス内で共有する非同期Redisクライアントを取得"""
+    global _async_client
+    if _async_client is None:
+        _async_client = aioredis.Redis.from_url(
+            get_redis_url(), decode_responses=True
+        )
+    return _async_client
+
+
+def progress_channel(task_id: str) -> str:
+    """タスク進捗を配信する pub/sub チャンネル名"""
+    return f"{PROGRESS_CHANNEL_PREFIX}{task_id}"
@@ -1,4 +1,5 @@
 import os
+import shutil
 import uuid
 from datetime import datetime
 from typing import Optional, Dict, Tuple
@@ -64,6 +65,58 @@ class FileOperations:
         return count, total_size
 
 
+class JobWorkspace:
+    """ジョブ（タスク）単位で分離された作業ディレクトリ
+
+    同一ホストで複数ジョブを並行実行しても一時ファイルが衝突しないよう、
+    temp/jobs/<job_id>/ 配下にのみ書き込む。with文を抜けると成功・失敗に
+    関わらずディレクトリごと削除される。
+    """
+
+    def __init__(self, job_id: Optional[str] = None, base_dir: Optional[str] = None):
+        self.job_id = job_id or uuid.uuid4().hex
+        self.base_dir = base_dir or Paths.get_jobs_dir()
+        self.root = os.path.join(self.base_dir, self.job_id)
+
+    def __enter__(self) -> "JobWorkspace":
+        self.create()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.cleanup()
+        return False
+
+    def create(self) -> str:
+        """作業ディレクトリを作成"""
+        os.makedirs(self.root, exist_ok=True)
+        logger.info(f"Job workspace created: {self.root}")
+        return self.root
+
+    def path(self, *parts: str) -> str:
+        """作業ディレクトリ内のパスを取得（親ディレクトリは作成済み）"""
+        target = os.path.join(self.root, *parts)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        return target
+
+    def subdir(self, name: str) -> str:
+        """作業ディレクトリ内のサブディレクトリを作成して取得"""
+        target = os.path.join(self.root, name)
+        os.makedirs(target, exist_ok=True)
+        return target
+
+    def cleanup(self) -> bool:
+        """作業ディレクトリを削除"""
+        if not os.path.exists(self.root):
+            return True
+        try:
+            shutil.rmtree(self.root)
+            logger.info(f"Job workspace removed: {self.root}")
+            return True
+        except OSError as e:
+            logger.warning(f"Could not remove job workspace {self.root}: {e}")
+            return False
+
+
 class FileManager:
     @staticmethod
     def generate_unique_filename(
@@ -0,0 +1,52 @@
+"""APIプロセスの起動時間と重いモジュールの遅延読み込み"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# app.main を読み込み、かかった時間と読み込まれたモジュールを出力する
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app.main as main
+print(json.dumps({
+    "elapsed": time.perf_counter() - started,
+    "budget": main.STARTUP_BUDGET_SECONDS,
+    "heavy_modules": list(main.HEAVY_MODULES),
+    "loaded": sorted({name.split(".")[0] for name in sys.modules}),
+}))
+"""
+
+
+@pytest.fixture(scope="module")
+def startup():
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_heavy_modules_not_imported(startup):
+    """API起動時に動画処理・LLMの重いモジュールを読み込まない"""
+    assert set(startup["heavy_modules"]) >= {"moviepy", "cv2", "librosa", "scipy", "langchain_aws"}
+    loaded = [name for name in startup["heavy_modules"] if name in startup["loaded"]]
+    assert loaded == []
+
+
+def test_startup_within_budget(startup):
+    """app.main のインポートが起動時間の予算内に収まる"""
+    assert startup["elapsed"] <= startup["budget"], (
+        f"{startup['elapsed']:.2f}s > {startup['budget']:.2f}s"
+    )
@@ -0,0 +1,69 @@
+"""クリップ連結時の音声と映像のずれ"""
+
+import os
+import subprocess
+
+import pytest
+
+utils = pytest.importorskip("app.services.video.video_generator_utils")
+
+CLIP_SECONDS = 1.0
+CLIPS = 5
+FPS = 30
+
+
+def _make_clip(path: str, frequency: int) -> None:
+    """最終動画と同じコーデックの短いクリップ（音声は個別にAACエンコード）"""
+    subprocess.run(
+        [
+            utils.FFMPEG_BINARY, "-y", "-loglevel", "error",
+            "-f", "lavfi", "-i", f"testsrc=size=160x120:rate={FPS}:duration={CLIP_SECONDS}",
+            "-f", "lavfi",
+            "-i", f"sine=frequency={frequency}:sample_rate={utils.AUDIO_SAMPLE_RATE}:duration={CLIP_SECONDS}",
+            "-c:v", utils.VIDEO_CODEC, "-pix_fmt", "yuv420p",
+            "-c:a", utils.AUDIO_CODEC,
+            "-ar", str(utils.AUDIO_SAMPLE_RATE), "-ac", str(utils.AUDIO_CHANNELS),
+            "-shortest", path,
+        ],
+        check=True,
+    )
+
+
+def _audio_seconds(path: str) -> float:
+    """音声をデコードした長さ（秒）"""
+    pcm = subprocess.run(
+        [
+            utils.FFMPEG_BINARY, "-loglevel", "error", "-i", path,
+            "-map", "0:a", "-f", "s16le", "-ac", "1", "-ar", str(utils.AUDIO_SAMPLE_RATE), "-",
+        ],
+        capture_output=True,
+        check=True,
+    ).stdout
+    return len(pcm) / 2 / utils.AUDIO_SAMPLE_RATE
+
+
+@pytest.fixture(scope="module")
+def clips(tmp_path_factory):
+    if not os.path.exists(utils.FFMPEG_BINARY) and subprocess.run(
+        ["which", utils.FFMPEG_BINARY], capture_output=True
+    ).returncode != 0:
+        pytest.skip("ffmpeg が見つかりません")
+    directory = tmp_path_factory.mktemp("clips")
+    paths = []
+    for index in range(CLIPS):
+        path = str(directory / f"clip_{index}.mp4")
+        _make_clip(path, 220 * (index + 1))
+        paths.append(path)
+    return paths
+
+
+def test_audio_does_not_drift_across_boundaries(clips, tmp_path):
+    """連結しても音声が境目ごとに伸びず、映像の長さと揃う"""
+    output = utils.concat_videos(clips, str(tmp_path / "joined.mp4"))
+
+    video_seconds = utils.probe_video_duration(output)
+    assert video_seconds == pytest.approx(CLIPS * CLIP_SECONDS, abs=1 / FPS)
+    # 音声は1回だけエンコードするため、余白はAACの1フレーム分（約23ms）まで
+    assert _audio_seconds(output) - CLIPS * CLIP_SECONDS < 0.03
+    assert not os.path.exists(str(tmp_path / "joined_concat.txt"))
+
@@ -0,0 +1,104 @@
+"""1回のデコードからの複数出力エンコード"""
+
+import dataclasses
+import os
+import re
+import resource
+import subprocess
+import time
+
+import pytest
+
+utils = pytest.importorskip("app.services.video.video_generator_utils")
+app_config = pytest.importorskip("app.config.app")
+
+FPS = 30
+SECONDS = 4
+RENDITIONS = [
+    app_config.RENDITION_PRESETS["720p"],
+    app_config.RENDITION_PRESETS["480p"],
+    app_config.Rendition(name="360p", height=360, video_bitrate="800k"),
+]
+
+
+def _video_height(path: str) -> int:
+    """ffmpeg の入力情報から映像の高さを読む"""
+    stderr = subprocess.run(
+        [utils.FFMPEG_BINARY, "-hide_banner", "-i", path], capture_output=True, text=True
+    ).stderr
+    return int(re.search(r"Video: .*?, (\d+)x(\d+)", stderr).group(2))
+
+
+@pytest.fixture(scope="module")
+def source(tmp_path_factory):
+    """描画済みの一時動画（cv2.VideoWriter の mp4v）に見立てた短い動画"""
+    if not os.path.exists(utils.FFMPEG_BINARY) and subprocess.run(
+        ["which", utils.FFMPEG_BINARY], capture_output=True
+    ).returncode != 0:
+        pytest.skip("ffmpeg が見つかりません")
+    path = str(tmp_path_factory.mktemp("source") / "rendered.mp4")
+    width, height = app_config.APP_CONFIG.resolution
+    subprocess.run(
+        [
+            utils.FFMPEG_BINARY, "-y", "-loglevel", "error",
+            "-f", "lavfi", "-i", f"testsrc2=size={width}x{height}:rate={FPS}:duration={SECONDS}",
+            "-f", "lavfi",
+            "-i", f"sine=frequency=440:sample_rate={utils.AUDIO_SAMPLE_RATE}:duration={SECONDS}",
+            "-c:v", "mpeg4", "-q:v", "2",
+            "-c:a", utils.AUDIO_CODEC, "-shortest", path,
+        ],
+        check=True,
+    )
+    return path
+
+
+def _outputs(directory):
+    output_path = os.path.join(directory, "video.mp4")
+    return [(None, output_path)] + [
+        (rendition, utils.rendition_path(output_path, rendition)) for rendition in RENDITIONS
+    ]
+
+
+def test_one_pass_writes_every_rendition(source, tmp_path):
+    """最終動画と各レンディションを1回で書き出し、それぞれ指定の高さになる"""
+    outputs = _outputs(str(tmp_path))
+    profile = dataclasses.replace(app_config.get_render_profile(None), preset="ultrafast")
+    result = utils.encode_renditions(source, None, outputs, profile)
+
+    assert result["outputs"] == [path for _, path in outputs]
+    assert _video_height(outputs[0][1]) == app_config.APP_CONFIG.resolution[1]
+    for rendition, path in outputs[1:]:
+        assert _video_height(path) == rendition.height
+        assert utils.probe_video_duration(path) == pytest.approx(SECONDS, abs=1 / FPS)
+
+
+@pytest.mark.benchmark
+def test_benchmark_one_pass_vs_separate_encodes(source, tmp_path):
+    """1回のデコードで分岐する場合と、出力ごとに入力を読み直してエンコードする場合を比べる"""
+    profile = app_config.get_render_profile(None)
+
+    def measure(run):
+        """経過時間と ffmpeg（子プロセス）の CPU 時間"""
+        before = resource.getrusage(resource.RUSAGE_CHILDREN)
+        started = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started
+        after = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu = (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+        return elapsed, cpu
+
+    def separate_encodes():
+        for output in _outputs(str(tmp_path / "separate")):
+            utils.encode_renditions(source, None, [output], profile)
+
+    one_pass = measure(
+        lambda: utils.encode_renditions(source, None, _outputs(str(tmp_path / "one_pass")), profile)
+    )
+    separate = measure(separate_encodes)
+
+    print(
+        f"\n{len(RENDITIONS) + 1} 出力: 1回のデコード {one_pass[0] * 1000:.0f}ms (CPU {one_pass[1] * 1000:.0f}ms)"
+        f" / 出力ごとにエンコード {separate[0] * 1000:.0f}ms (CPU {separate[1] * 1000:.0f}ms)"
+    )
+    # コア数が少ないと経過時間の差はデコードを省いた分だけになるため、CPU 時間で比べる
+    assert one_pass[1] < separate[1]
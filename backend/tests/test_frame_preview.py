@@ -0,0 +1,93 @@
+"""常駐プレビューレンダラーによる単一フレーム描画"""
+
+import os
+import threading
+import time
+
+import pytest
+
+frame_preview = pytest.importorskip("app.services.video.frame_preview")
+image_loader = pytest.importorskip("app.core.processors.video_processor.video_processor_image_loader")
+app_config = pytest.importorskip("app.config.app")
+Image = pytest.importorskip("PIL.Image")
+
+CONVERSATIONS = [
+    {
+        "speaker": speaker,
+        "text": f"{index}番目のセリフなのだ",
+        "text_for_voicevox": f"{index}ばんめのせりふなのだ",
+        "expression": "normal",
+        "visible_characters": ["zundamon", "metan"],
+    }
+    for index, speaker in enumerate(["zundamon", "metan", "zundamon", "metan"])
+]
+
+
+@pytest.fixture
+def assets(tmp_path, monkeypatch):
+    """単色のキャラクター画像・背景だけを置いたアセットディレクトリ"""
+    for name in ("zundamon", "metan", "tsumugi"):
+        expression_dir = tmp_path / name / "normal"
+        expression_dir.mkdir(parents=True)
+        for state in ("closed", "half", "open", "blink"):
+            Image.new("RGBA", (400, 600), (0, 160, 0, 255)).save(
+                expression_dir / f"normal_{state}.png"
+            )
+    (tmp_path / "backgrounds").mkdir()
+    Image.new("RGB", (1280, 720), (40, 40, 160)).save(tmp_path / "backgrounds" / "default.png")
+
+    monkeypatch.setattr(app_config.Paths, "get_assets_dir", staticmethod(lambda: str(tmp_path)))
+    monkeypatch.setattr(frame_preview, "_renderers", {})
+    image_loader._load_character_images_cached.cache_clear()
+    yield tmp_path
+    image_loader._load_character_images_cached.cache_clear()
+
+
+def test_repeated_renders_reuse_renderer_and_timeline(assets):
+    """2回目以降はレンダラーとタイムラインを再利用し、同じ時刻は同じ画像になる"""
+    first = frame_preview.render_frame_at(CONVERSATIONS, 1.5)
+    second = frame_preview.render_frame_at(CONVERSATIONS, 1.5)
+
+    assert first["timeline_cached"] is False
+    assert second["timeline_cached"] is True
+    assert second["image"] == first["image"]
+    assert frame_preview.get_frame_preview_renderer("preview") is frame_preview.get_frame_preview_renderer("preview")
+
+
+def test_concurrent_renders_match_serial_render(assets):
+    """複数スレッドから同時に描画しても、字幕を含めて直列に描画した結果と同じになる"""
+    times = [0.5, 1.5, 2.5, 3.5, 4.5, 5.5]
+    expected = {t: frame_preview.render_frame_at(CONVERSATIONS, t)["image"] for t in times}
+
+    results = {}
+    barrier = threading.Barrier(len(times))
+
+    def render(t):
+        barrier.wait()
+        results[t] = frame_preview.render_frame_at(CONVERSATIONS, t)["image"]
+
+    threads = [threading.Thread(target=render, args=(t,)) for t in times]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == expected
+
+
+@pytest.mark.benchmark
+def test_benchmark_cold_vs_warm_frame_latency(assets):
+    """初回（リソース読み込み込み）と常駐リソースでの描画の所要時間を比べる"""
+    started = time.perf_counter()
+    frame_preview.render_frame_at(CONVERSATIONS, 0.5)
+    cold_ms = (time.perf_counter() - started) * 1000
+
+    warm = []
+    for index in range(20):
+        started = time.perf_counter()
+        frame_preview.render_frame_at(CONVERSATIONS, 0.5 + index * 0.25)
+        warm.append((time.perf_counter() - started) * 1000)
+    warm_ms = sorted(warm)[len(warm) // 2]
+
+    print(f"\ncold: {cold_ms:.1f}ms / warm: 中央値 {warm_ms:.1f}ms ({len(warm)} 回)")
+    assert warm_ms < cold_ms
@@ -0,0 +1,61 @@
+"""ジョブ作業ディレクトリの分離"""
+
+import os
+import threading
+
+import pytest
+
+files = pytest.importorskip("app.utils_legacy.files")
+JobWorkspace = files.JobWorkspace
+
+
+def test_parallel_workspaces_do_not_collide(tmp_path):
+    """同時に開いた2つのジョブが同じファイル名で書いても互いに干渉しない"""
+    barrier = threading.Barrier(2)
+    written = {}
+
+    def run_job(job_id: str):
+        with JobWorkspace(job_id, base_dir=str(tmp_path)) as workspace:
+            barrier.wait()
+            path = workspace.path("voices", "conv_000_zundamon.wav")
+            with open(path, "w") as f:
+                f.write(job_id)
+            barrier.wait()
+            with open(path) as f:
+                written[job_id] = (path, f.read())
+
+    threads = [threading.Thread(target=run_job, args=(job_id,)) for job_id in ("job-a", "job-b")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert written["job-a"][0] != written["job-b"][0]
+    assert written["job-a"][1] == "job-a"
+    assert written["job-b"][1] == "job-b"
+    # with文を抜けたらどちらも削除されている
+    assert os.listdir(tmp_path) == []
+
+
+def test_cleanup_leaves_other_workspace_intact(tmp_path):
+    first = JobWorkspace("job-a", base_dir=str(tmp_path))
+    second = JobWorkspace("job-b", base_dir=str(tmp_path))
+    first.create()
+    second.create()
+    kept = second.path("video_temp.mp4")
+    with open(kept, "w") as f:
+        f.write("frames")
+
+    assert first.cleanup()
+
+    assert not os.path.exists(first.root)
+    assert os.path.exists(kept)
+    second.cleanup()
+
+
+def test_workspace_removed_on_failure(tmp_path):
+    with pytest.raises(RuntimeError):
+        with JobWorkspace("job-a", base_dir=str(tmp_path)) as workspace:
+            workspace.subdir("voices")
+            raise RuntimeError("render failed")
+    assert not os.path.exists(os.path.join(tmp_path, "job-a"))
@@ -0,0 +1,77 @@
+"""LLM呼び出しのスレッドプール実行（イベントループを塞がない）"""
+
+import asyncio
+import time
+
+import pytest
+
+llm_executor = pytest.importorskip("app.utils.llm_executor")
+httpx = pytest.importorskip("httpx")
+
+# 同期の生成処理（llm.invoke 相当）の所要時間
+GENERATION_SECONDS = 0.5
+
+
+def slow_generation(label: str) -> str:
+    """応答の遅い同期のLLM呼び出しを模す"""
+    time.sleep(GENERATION_SECONDS)
+    return f"script:{label}"
+
+
+def test_event_loop_keeps_running_during_generation():
+    """生成中も他のコルーチンが進む"""
+
+    async def scenario():
+        ticks = 0
+        generation = asyncio.create_task(llm_executor.run_llm_call(slow_generation, "a"))
+        while not generation.done():
+            await asyncio.sleep(0.01)
+            ticks += 1
+        return await generation, ticks
+
+    result, ticks = asyncio.run(scenario())
+    assert result == "script:a"
+    # 生成中に10ms間隔の処理が何度も実行されている
+    assert ticks >= 10
+
+
+def test_health_responds_during_generation():
+    """生成中でも /health がすぐに応答する"""
+    main = pytest.importorskip("app.main")
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            generation = asyncio.create_task(llm_executor.run_llm_call(slow_generation, "b"))
+            await asyncio.sleep(0.05)
+            started = time.monotonic()
+            response = await client.get("/health")
+            health_seconds = time.monotonic() - started
+            generation_done = generation.done()
+            result = await generation
+        return response, health_seconds, generation_done, result
+
+    response, health_seconds, generation_done, result = asyncio.run(scenario())
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+    assert not generation_done
+    assert health_seconds < GENERATION_SECONDS / 2
+    assert result == "script:b"
+
+
+def test_concurrent_generations_overlap():
+    """複数の生成はプール内で並行して実行される"""
+    calls = min(4, llm_executor.LLM_MAX_CONCURRENCY)
+    if calls < 2:
+        pytest.skip("LLM_MAX_CONCURRENCY が1のため並行実行されない")
+
+    async def scenario():
+        started = time.monotonic()
+        results = await asyncio.gather(
+            *(llm_executor.run_llm_call(slow_generation, str(i)) for i in range(calls))
+        )
+        return results, time.monotonic() - started
+
+    results, elapsed = asyncio.run(scenario())
+    assert results == [f"script:{i}" for i in range(calls)]
+    assert elapsed < GENERATION_SECONDS * calls * 0.75
@@ -0,0 +1,140 @@
+"""Bedrockクライアント・LLMインスタンスの共有"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+llm_factory = pytest.importorskip("app.utils.llm_factory")
+pytest.importorskip("langchain_aws")
+
+MODEL_ID = "anthropic.claude-3-haiku-20240307-v1:0"
+
+
+@pytest.fixture(autouse=True)
+def bedrock_env(monkeypatch):
+    """ダミーの認証情報で、テストごとに空のレジストリから始める"""
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    llm_factory.clear_llm_registry()
+    yield
+    llm_factory.clear_llm_registry()
+
+
+def test_same_settings_reuse_instance():
+    """同じ設定の呼び出しは同じLLMインスタンスを返す"""
+    first = llm_factory.create_bedrock_llm(MODEL_ID, temperature=0.7, max_tokens=1000)
+    second = llm_factory.create_bedrock_llm(MODEL_ID, temperature=0.7, max_tokens=1000)
+    assert first is second
+
+
+def test_generation_settings_get_own_instance_but_share_client():
+    """temperature / max_tokens が違えば別インスタンスだが、boto3クライアントは共有する"""
+    base = llm_factory.create_bedrock_llm(MODEL_ID, temperature=0.7, max_tokens=1000)
+    warmer = llm_factory.create_bedrock_llm(MODEL_ID, temperature=0.9, max_tokens=1000)
+    longer = llm_factory.create_bedrock_llm(MODEL_ID, temperature=0.7, max_tokens=2000)
+
+    assert len({id(base), id(warmer), id(longer)}) == 3
+    assert warmer.temperature == 0.9
+    assert longer.max_tokens == 2000
+    assert base.client is warmer.client is longer.client
+
+
+def test_client_is_keyed_by_region_and_timeout():
+    """boto3クライアントは (リージョン, タイムアウト) ごとに作る"""
+    default = llm_factory.get_bedrock_runtime_client("us-east-1", 600)
+    assert llm_factory.get_bedrock_runtime_client("us-east-1", 600) is default
+    assert llm_factory.get_bedrock_runtime_client("us-east-1", 60) is not default
+    assert llm_factory.get_bedrock_runtime_client("us-west-2", 600) is not default
+
+    llm = llm_factory.create_bedrock_llm(MODEL_ID, region_name="us-west-2", request_timeout=60)
+    assert llm.client is llm_factory.get_bedrock_runtime_client("us-west-2", 60)
+
+
+def test_concurrent_creation_returns_one_instance():
+    """同時に取得しても同じ設定のインスタンスは1つになる"""
+    barrier = threading.Barrier(8)
+    results = []
+
+    def create():
+        barrier.wait()
+        results.append(llm_factory.create_bedrock_llm(MODEL_ID))
+
+    threads = [threading.Thread(target=create) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(llm) for llm in results}) == 1
+
+
+def test_missing_credentials_raise(monkeypatch):
+    """認証情報がなければ ValueError"""
+    monkeypatch.delenv("AWS_ACCESS_KEY_ID")
+    with pytest.raises(ValueError):
+        llm_factory.create_bedrock_llm(MODEL_ID)
+
+
+class _StubBedrockHandler(BaseHTTPRequestHandler):
+    """bedrock-runtime の InvokeModel に即座に応答するスタブ"""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("content-length", 0)))
+        body = json.dumps({
+            "id": "stub",
+            "type": "message",
+            "role": "assistant",
+            "model": MODEL_ID,
+            "content": [{"type": "text", "text": "ok"}],
+            "stop_reason": "end_turn",
+            "usage": {"input_tokens": 1, "output_tokens": 1},
+        }).encode()
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_endpoint(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubBedrockHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv(
+        "AWS_ENDPOINT_URL_BEDROCK_RUNTIME", f"http://127.0.0.1:{server.server_port}"
+    )
+    yield
+    server.shutdown()
+
+
+@pytest.mark.benchmark
+def test_benchmark_setup_latency(stub_endpoint):
+    """呼び出しごとに作り直す場合と共有する場合の、準備+呼び出しの時間を比べる"""
+    calls = 20
+    # 初回の読み込み（langchain_aws・botocore のデータ）は計測から除く
+    llm_factory.create_bedrock_llm(MODEL_ID).invoke("warm up")
+
+    cold = []
+    for _ in range(calls):
+        llm_factory.clear_llm_registry()
+        started = time.perf_counter()
+        llm_factory.create_bedrock_llm(MODEL_ID).invoke("hi")
+        cold.append(time.perf_counter() - started)
+
+    warm = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        llm_factory.create_bedrock_llm(MODEL_ID).invoke("hi")
+        warm.append(time.perf_counter() - started)
+
+    cold_ms = sorted(cold)[calls // 2] * 1000
+    warm_ms = sorted(warm)[calls // 2] * 1000
+    print(f"\n作り直し: 中央値 {cold_ms:.1f}ms / 共有: 中央値 {warm_ms:.1f}ms ({calls} 回)")
+    assert warm_ms < cold_ms
@@ -0,0 +1,88 @@
+"""進捗ブローカーの購読キューへの配信"""
+
+import asyncio
+import json
+
+import pytest
+
+broker_module = pytest.importorskip("app.api.progress_broker")
+redis_client = pytest.importorskip("app.utils.redis_client")
+
+
+def _event(state, progress=None, **info):
+    if progress is not None:
+        info["progress"] = progress
+    return json.dumps({"state": state, "info": info})
+
+
+def _dispatch(broker, task_id, data):
+    broker._dispatch(redis_client.progress_channel(task_id), data)
+
+
+def _drain(queue):
+    events = []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    return events
+
+
+def _broker_with_queue(task_ids, maxsize):
+    broker = broker_module.ProgressBroker()
+    queue = asyncio.Queue(maxsize=maxsize)
+    for task_id in task_ids:
+        broker._subscribers[task_id] = {queue}
+    return broker, queue
+
+
+def test_events_are_delivered_in_order():
+    """キューに空きがあればイベントをそのまま届ける"""
+    broker, queue = _broker_with_queue(["a"], maxsize=10)
+    _dispatch(broker, "a", _event("PROGRESS", 0.1))
+    _dispatch(broker, "a", _event("PROGRESS", 0.2))
+
+    assert [event["progress"] for event in _drain(queue)] == [0.1, 0.2]
+
+
+def test_full_queue_keeps_latest_progress_per_task():
+    """一杯になったらタスクごとに最新の途中経過だけを残す"""
+    broker, queue = _broker_with_queue(["a", "b"], maxsize=4)
+    _dispatch(broker, "a", _event("PROGRESS", 0.1))
+    _dispatch(broker, "b", _event("PROGRESS", 0.1))
+    _dispatch(broker, "a", _event("PROGRESS", 0.2))
+    _dispatch(broker, "b", _event("PROGRESS", 0.2))
+    _dispatch(broker, "a", _event("PROGRESS", 0.3))
+
+    events = _drain(queue)
+    assert [(event["task_id"], event["progress"]) for event in events] == [
+        ("b", 0.2),
+        ("a", 0.3),
+    ]
+
+
+def test_terminal_events_are_never_dropped():
+    """遅い購読者でも完了・失敗イベントは必ず届く"""
+    broker, queue = _broker_with_queue(["a", "b"], maxsize=3)
+    _dispatch(broker, "a", _event("SUCCESS", message="完了"))
+    _dispatch(broker, "b", _event("FAILURE", error="boom"))
+    for step in range(1, 20):
+        _dispatch(broker, "b", _event("PROGRESS", step / 20))
+
+    events = _drain(queue)
+    statuses = [(event["task_id"], event["status"]) for event in events]
+    assert ("a", "completed") in statuses
+    assert ("b", "failed") in statuses
+    assert events[-1]["progress"] == pytest.approx(19 / 20)
+    assert len(events) <= 3
+
+
+def test_terminal_event_fits_when_queue_full_of_progress():
+    """途中経過で一杯のキューにも終了イベントが入る"""
+    broker, queue = _broker_with_queue(["a", "b", "c"], maxsize=3)
+    for task_id in ("a", "b", "c"):
+        _dispatch(broker, task_id, _event("PROGRESS", 0.5))
+    _dispatch(broker, "a", _event("SUCCESS"))
+
+    events = _drain(queue)
+    assert events[-1]["task_id"] == "a"
+    assert events[-1]["status"] == "completed"
+    assert len(events) == 3
@@ -0,0 +1,110 @@
+"""ProgressReporter の間引き・ハートビート"""
+
+import threading
+import time
+
+import pytest
+
+progress = pytest.importorskip("app.tasks.progress")
+ProgressReporter = progress.ProgressReporter
+
+
+class FakeTask:
+    """update_state の呼び出しを記録するタスク（latency で結果バックエンドの往復を模す）"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def update_state(self, task_id=None, state=None, meta=None):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls.append((time.monotonic(), state, dict(meta)))
+
+
+def test_frequent_updates_are_coalesced():
+    """描画ループの高頻度な更新はまとめて配信し、最後の進捗は必ず配信する"""
+    task = FakeTask()
+    with ProgressReporter(task, task_id="job", stage="render", min_interval=0.1) as reporter:
+        total = 3000
+        for frame in range(1, total + 1):
+            reporter.update(frame / total, frames_done=frame, total_frames=total)
+            if frame % 100 == 0:
+                time.sleep(0.01)
+
+    assert reporter.update_count == total
+    assert 1 <= len(task.calls) <= 10
+    _, state, meta = task.calls[-1]
+    assert state == "PROGRESS"
+    assert meta["progress"] == 1.0
+    assert meta["stage"] == "render"
+    assert meta["frames_done"] == total
+    assert meta["total_frames"] == total
+
+
+def test_progress_is_mapped_into_range():
+    """ステージ内の進捗を progress_range に割り当て、ETAを付ける"""
+    task = FakeTask()
+    reporter = ProgressReporter(task, task_id="job", progress_range=(0.2, 0.6))
+    reporter.update(0.5, frames_done=10, total_frames=20)
+    reporter.close()
+
+    meta = task.calls[-1][2]
+    assert meta["progress"] == pytest.approx(0.4)
+    assert "eta_seconds" in meta
+    assert meta["message"] == "処理中... (50%)"
+
+
+def test_heartbeat_republishes_last_progress():
+    """更新が途絶えても max_interval ごとに最後の進捗を再配信する"""
+    task = FakeTask()
+    with ProgressReporter(
+        task, task_id="job", stage="encode", min_interval=0.01, max_interval=0.2
+    ) as reporter:
+        reporter.update(0.42, message="エンコード中")
+        time.sleep(0.9)
+
+    assert len(task.calls) >= 3
+    assert all(meta["message"] == "エンコード中" for _, _, meta in task.calls)
+    assert all(meta["progress"] == pytest.approx(0.42) for _, _, meta in task.calls)
+    gaps = [b[0] - a[0] for a, b in zip(task.calls, task.calls[1:])]
+    assert max(gaps) < 0.2 * 2
+
+
+def test_no_heartbeat_before_first_update():
+    """一度も更新がなければ何も配信しない"""
+    task = FakeTask()
+    with ProgressReporter(task, task_id="job", max_interval=0.05):
+        time.sleep(0.2)
+    assert task.calls == []
+
+
+@pytest.mark.benchmark
+def test_benchmark_reporter_vs_per_frame_update_state():
+    """フレームごとの update_state と ProgressReporter の描画ループへの負荷を比べる"""
+    frames = 600
+    latency = 0.002  # 結果バックエンド（Redis）への保存・配信1回分
+
+    task = FakeTask(latency=latency)
+    started = time.perf_counter()
+    for frame in range(1, frames + 1):
+        task.update_state(task_id="job", state="PROGRESS", meta={"progress": frame / frames})
+    per_frame = time.perf_counter() - started
+
+    task = FakeTask(latency=latency)
+    started = time.perf_counter()
+    with ProgressReporter(task, task_id="job", min_interval=0.1) as reporter:
+        for frame in range(1, frames + 1):
+            reporter.update(frame / frames, frames_done=frame, total_frames=frames)
+    coalesced = time.perf_counter() - started
+
+    print(
+        f"\nper-frame update_state: {frames} 回 {per_frame * 1000:.1f}ms "
+        f"({frames / per_frame:.0f} frames/s)"
+        f"\nProgressReporter: {len(task.calls)} 回 {coalesced * 1000:.1f}ms "
+        f"({frames / coalesced:.0f} frames/s)"
+    )
+    assert len(task.calls) < frames / 10
+    assert coalesced < per_frame
@@ -0,0 +1,55 @@
+"""逐次出力プレビューの古いディレクトリの削除"""
+
+import os
+import time
+
+import pytest
+
+progressive_output = pytest.importorskip("app.services.video.progressive_output")
+app_config = pytest.importorskip("app.config.app")
+
+
+@pytest.fixture
+def previews(tmp_path, monkeypatch):
+    previews_dir = tmp_path / "previews"
+    previews_dir.mkdir()
+    monkeypatch.setattr(app_config.Paths, "get_previews_dir", staticmethod(lambda: str(previews_dir)))
+    monkeypatch.setattr(app_config.WORKER_CONFIG, "preview_keep", 2)
+    monkeypatch.setattr(app_config.WORKER_CONFIG, "preview_max_age_hours", 1.0)
+
+    def make(job_id, finished, age_seconds):
+        path = previews_dir / job_id
+        path.mkdir()
+        playlist = "#EXTM3U\n#EXTINF:2.0,\nsegment_00000.m4s\n"
+        if finished:
+            playlist += "#EXT-X-ENDLIST\n"
+        (path / progressive_output.PLAYLIST_NAME).write_text(playlist)
+        modified = time.time() - age_seconds
+        os.utime(path, (modified, modified))
+
+    make.dir = previews_dir
+    return make
+
+
+def test_running_previews_are_never_pruned(previews):
+    """描画中のプレビューは、完了済みより古くても件数に関係なく残す"""
+    for index in range(3):
+        previews(f"running-{index}", finished=False, age_seconds=600 + index)
+    previews("done-old", finished=True, age_seconds=300)
+    previews("done-new", finished=True, age_seconds=100)
+
+    progressive_output.create_preview_dir("new-job")
+
+    assert sorted(os.listdir(previews.dir)) == [
+        "done-new", "new-job", "running-0", "running-1", "running-2",
+    ]
+
+
+def test_stale_unfinished_previews_are_pruned(previews):
+    """閉じられないまま上限時間を過ぎたプレビューは放置されたものとして削除する"""
+    previews("crashed", finished=False, age_seconds=2 * 3600)
+    previews("running", finished=False, age_seconds=60)
+
+    progressive_output.create_preview_dir("new-job")
+
+    assert sorted(os.listdir(previews.dir)) == ["new-job", "running"]
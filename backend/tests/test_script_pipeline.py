@@ -0,0 +1,121 @@
+"""台本生成パイプラインの依存グラフ実行"""
+
+import threading
+import time
+
+import pytest
+
+script_pipeline = pytest.importorskip("app.core.script_generators.script_pipeline")
+PipelineNode = script_pipeline.PipelineNode
+ScriptPipeline = script_pipeline.ScriptPipeline
+
+
+def _step(value, seconds=0.0):
+    def run(inputs):
+        time.sleep(seconds)
+        return value(inputs) if callable(value) else value
+
+    return run
+
+
+def test_nodes_run_after_dependencies_with_their_results():
+    """依存ノードの結果を受け取り、依存の完了後に実行される"""
+    pipeline = ScriptPipeline([
+        PipelineNode("script", _step(lambda i: i["outline"] + "+script"), depends_on=("outline",)),
+        PipelineNode("title", _step("title", 0.05)),
+        PipelineNode("outline", _step(lambda i: i["title"] + "+outline"), depends_on=("title",)),
+    ])
+    results = pipeline.run()
+
+    assert results == {
+        "title": "title",
+        "outline": "title+outline",
+        "script": "title+outline+script",
+    }
+    timings = pipeline.timings
+    assert timings["outline"].started_at >= timings["title"].finished_at
+    assert timings["script"].started_at >= timings["outline"].finished_at
+    assert all(t.status == "completed" for t in timings.values())
+
+
+def test_independent_nodes_overlap():
+    """互いに独立したノードは並列に実行される"""
+    pipeline = ScriptPipeline(
+        [
+            PipelineNode("outline", _step("outline")),
+            PipelineNode("metadata", _step("metadata", 0.3), depends_on=("outline",)),
+            PipelineNode("script", _step("script", 0.3), depends_on=("outline",)),
+        ],
+        max_workers=2,
+    )
+    started = time.monotonic()
+    pipeline.run()
+
+    assert time.monotonic() - started < 0.5
+    timings = pipeline.timings
+    assert timings["metadata"].started_at < timings["script"].finished_at
+    assert timings["script"].started_at < timings["metadata"].finished_at
+
+
+def test_optional_node_failure_yields_none():
+    """任意ノードが失敗しても結果 None で後続を実行する"""
+
+    def broken(inputs):
+        raise RuntimeError("metadata failed")
+
+    pipeline = ScriptPipeline([
+        PipelineNode("outline", _step("outline")),
+        PipelineNode("metadata", broken, depends_on=("outline",), optional=True),
+        PipelineNode("publish", _step(lambda i: i["metadata"]), depends_on=("metadata",)),
+    ])
+    results = pipeline.run()
+
+    assert results["metadata"] is None
+    assert results["publish"] is None
+    assert pipeline.timings["metadata"].status == "failed"
+
+
+def test_required_node_failure_does_not_wait_for_running_nodes():
+    """必須ノードが失敗したら、実行中の任意ノードの完了を待たずに例外を返す"""
+    release = threading.Event()
+
+    def slow_metadata(inputs):
+        release.wait(timeout=5.0)
+        return "metadata"
+
+    def broken(inputs):
+        raise ValueError("script failed")
+
+    pipeline = ScriptPipeline([
+        PipelineNode("outline", _step("outline")),
+        PipelineNode("metadata", slow_metadata, depends_on=("outline",), optional=True),
+        PipelineNode("script", broken, depends_on=("outline",)),
+        PipelineNode("review", _step("review"), depends_on=("script",)),
+    ])
+    started = time.monotonic()
+    try:
+        with pytest.raises(ValueError, match="script failed"):
+            pipeline.run()
+        assert time.monotonic() - started < 1.0
+        # 失敗したノードの後続は実行しない
+        assert "review" not in pipeline.timings
+    finally:
+        release.set()
+
+
+def test_cycle_is_rejected():
+    """依存の循環は構築時に検出する"""
+    with pytest.raises(ValueError, match="循環"):
+        ScriptPipeline([
+            PipelineNode("a", _step("a"), depends_on=("c",)),
+            PipelineNode("b", _step("b"), depends_on=("a",)),
+            PipelineNode("c", _step("c"), depends_on=("b",)),
+        ])
+
+
+def test_undefined_dependency_and_duplicate_names_are_rejected():
+    """未定義の依存・重複したノード名は構築時に検出する"""
+    with pytest.raises(ValueError, match="未定義"):
+        ScriptPipeline([PipelineNode("a", _step("a"), depends_on=("missing",))])
+    with pytest.raises(ValueError, match="重複"):
+        ScriptPipeline([PipelineNode("a", _step("a")), PipelineNode("a", _step("b"))])
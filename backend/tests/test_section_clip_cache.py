@@ -0,0 +1,131 @@
+"""セクションクリップキャッシュの再利用とクリップ情報"""
+
+import os
+
+import pytest
+
+section_clip_cache = pytest.importorskip("app.services.video.section_clip_cache")
+app_config = pytest.importorskip("app.config.app")
+common = pytest.importorskip("app.models.scripts.common")
+
+FPS = 30
+
+
+def make_section(key: str, lines: int) -> "common.VideoSection":
+    return common.VideoSection(
+        section_name=key,
+        section_key=key,
+        scene_background="default",
+        segments=[
+            common.ConversationSegment(
+                speaker="zundamon",
+                text=f"{key} のセリフ {index}",
+                text_for_voicevox=f"せりふ {index}",
+                expression="normal",
+                visible_characters=["zundamon"],
+            )
+            for index in range(lines)
+        ],
+    )
+
+
+class FakeGenerator:
+    """セリフ1つを1秒として描画したことにする VideoGenerator"""
+
+    def __init__(self):
+        self.profile = app_config.get_render_profile(None)
+        self.last_timeline = None
+        self.rendered = []
+
+    def generate_conversation_video_streaming(self, conversations, audio_stream, output_path, **kwargs):
+        list(audio_stream)
+        with open(output_path, "wb") as f:
+            f.write(b"clip")
+        self.last_timeline = {
+            "duration": float(len(conversations)),
+            "frames": FPS * len(conversations),
+        }
+        self.rendered.append(kwargs["sections"][0].section_key)
+        return output_path
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_config.Paths, "get_jobs_dir", staticmethod(lambda: str(tmp_path / "jobs")))
+    monkeypatch.setattr(
+        section_clip_cache.SectionClipCache,
+        "_voice_stream",
+        lambda self, conversations, *args: ((index, None) for index in range(len(conversations))),
+    )
+    return section_clip_cache.SectionClipCache(cache_dir=str(tmp_path / "clips"), max_entries=10)
+
+
+def test_hit_returns_clip_own_info_not_generator_state(cache):
+    """再利用時はクリップ自身の長さ・フレーム数を返し、VideoGenerator の状態を参照しない"""
+    generator = FakeGenerator()
+    section = make_section("hook", 2)
+
+    first = cache.get_or_render(section, {}, generator)
+    assert first["reused"] is False
+    assert first["frames"] == 2 * FPS
+    assert first["duration"] == 2.0
+
+    # 別のジョブ・別のセクションの描画で共有状態が書き換わっても影響しない
+    generator.last_timeline = {"duration": 99.0, "frames": 9999}
+    second = cache.get_or_render(section, {}, generator)
+    assert second == {**first, "reused": True}
+    assert generator.rendered == ["hook"]
+
+
+def test_render_video_by_section_sums_clip_frames(cache, monkeypatch, tmp_path):
+    """セクション単位の描画は各クリップの長さ・フレーム数を合計する"""
+    monkeypatch.setattr(section_clip_cache, "get_section_clip_cache", lambda: cache)
+    concatenated = []
+    monkeypatch.setattr(
+        section_clip_cache,
+        "concat_videos",
+        lambda paths, output_path, profile=None: concatenated.append(paths) or output_path,
+    )
+    sections = [make_section("hook", 1), make_section("body", 3)]
+    conversations = [
+        conv
+        for section in sections
+        for conv in section_clip_cache.section_to_conversations(section)
+    ]
+    generator = FakeGenerator()
+
+    # 先に hook だけ描画しておき、最後に描画したセクションの状態を古いまま残す
+    cache.get_or_render(sections[0], {}, generator, conversations=conversations[:1])
+    generator.last_timeline = {"duration": 50.0, "frames": 1500}
+
+    progress = []
+    result = section_clip_cache.render_video_by_section(
+        generator,
+        conversations,
+        sections,
+        {},
+        str(tmp_path / "out.mp4"),
+        progress_callback=lambda value, frames_done=0: progress.append(frames_done),
+    )
+
+    assert [s["reused"] for s in result["sections"]] == [True, False]
+    assert result["frames"] == 4 * FPS
+    assert result["duration"] == 4.0
+    # 進捗のフレーム数はこのジョブで描画したセクションの分だけ
+    assert progress[-1] == 3 * FPS
+    assert len(concatenated[0]) == 2
+
+
+def test_clip_without_info_falls_back_to_probe(cache, monkeypatch):
+    """情報ファイルのない古いクリップは動画ファイルから長さを求める"""
+    section = make_section("hook", 1)
+    clip_path = cache.clip_path(section, {})
+    os.makedirs(os.path.dirname(clip_path), exist_ok=True)
+    with open(clip_path, "wb") as f:
+        f.write(b"clip")
+    monkeypatch.setattr(section_clip_cache, "probe_duration", lambda path: 2.5)
+
+    clip = cache.get_or_render(section, {}, FakeGenerator())
+    assert clip["reused"] is True
+    assert clip["duration"] == 2.5
+    assert clip["frames"] == int(round(2.5 * FakeGenerator().profile.fps))
@@ -0,0 +1,137 @@
+"""ステージ分割チェーンでのセクション単位の再利用"""
+
+import os
+
+import pytest
+
+pipeline = pytest.importorskip("app.tasks.video_pipeline_tasks")
+section_clip_cache = pytest.importorskip("app.services.video.section_clip_cache")
+voice_generator = pytest.importorskip("app.core.asset_generators.voice_generator")
+app_config = pytest.importorskip("app.config.app")
+common = pytest.importorskip("app.models.scripts.common")
+
+FPS = 30
+
+
+def make_section(key, texts):
+    return common.VideoSection(
+        section_name=key,
+        section_key=key,
+        scene_background="default",
+        segments=[
+            common.ConversationSegment(
+                speaker="zundamon",
+                text=text,
+                text_for_voicevox=text,
+                expression="normal",
+                visible_characters=["zundamon"],
+            )
+            for text in texts
+        ],
+    )
+
+
+class FakeGenerator:
+    """セリフ1つを1秒として描画したことにする VideoGenerator"""
+
+    def __init__(self):
+        self.profile = app_config.get_render_profile(None)
+        self.last_timeline = None
+        self.last_encode = None
+        self.rendered = []
+
+    def generate_conversation_video_streaming(self, conversations, audio_stream, output_path, **kwargs):
+        audio = [path for _, path in audio_stream]
+        assert all(path and os.path.exists(path) for path in audio)
+        with open(output_path, "wb") as f:
+            f.write(b"clip")
+        self.last_timeline = {"duration": float(len(conversations)), "frames": FPS * len(conversations)}
+        self.rendered.append(kwargs["sections"][0].section_key)
+        return output_path
+
+    def release_job_resources(self):
+        pass
+
+
+@pytest.fixture
+def staged(tmp_path, monkeypatch):
+    """VOICEVOX・描画・ffmpeg・結果バックエンドを差し替えたステージ分割チェーン"""
+    paths = app_config.Paths
+    monkeypatch.setattr(paths, "get_jobs_dir", staticmethod(lambda: str(tmp_path / "jobs")))
+    monkeypatch.setattr(paths, "get_section_clips_dir", staticmethod(lambda: str(tmp_path / "clips")))
+    monkeypatch.setattr(paths, "get_outputs_dir", staticmethod(lambda: str(tmp_path / "outputs")))
+    monkeypatch.setattr(app_config.WORKER_CONFIG, "template_clip_cache", False)
+    monkeypatch.setattr(app_config.WORKER_CONFIG, "section_render_cache", True)
+    monkeypatch.setattr(section_clip_cache, "_section_clip_cache", None)
+    monkeypatch.setattr(pipeline.VideoGenerationTask, "update_state", lambda *args, **kwargs: None)
+    os.makedirs(tmp_path / "outputs")
+    monkeypatch.setattr(
+        pipeline.FileManager,
+        "create_video_output_path",
+        staticmethod(lambda title: str(tmp_path / "outputs" / f"{title}.mp4")),
+    )
+    monkeypatch.setattr(
+        pipeline, "record_render", lambda *args, **kwargs: {"realtime_factor": 1.0, "speedup_vs_default": None}
+    )
+    monkeypatch.setattr(pipeline, "probe_duration", lambda path: 1.0)
+
+    def fake_concat(paths, output_path, profile=None):
+        with open(output_path, "wb") as f:
+            f.write(b"".join(open(path, "rb").read() for path in paths))
+        return output_path
+
+    monkeypatch.setattr(section_clip_cache, "concat_videos", fake_concat)
+
+    synthesized = []
+
+    def fake_voices(self, conversations, output_dir=None, **kwargs):
+        os.makedirs(output_dir, exist_ok=True)
+        for index, conv in enumerate(conversations):
+            synthesized.append(conv["text"])
+            path = os.path.join(output_dir, f"line_{index}.wav")
+            with open(path, "wb") as f:
+                f.write(conv["text"].encode())
+            yield index, path
+
+    monkeypatch.setattr(voice_generator.VoiceGenerator, "stream_conversation_voices", fake_voices)
+
+    generator = FakeGenerator()
+    monkeypatch.setattr(pipeline, "get_video_generator", lambda profile=None: generator)
+
+    def run(job_id, sections):
+        conversations = [
+            conv for section in sections for conv in section_clip_cache.section_to_conversations(section)
+        ]
+        job_ref = pipeline.synthesize_voices_stage.run(
+            job_id,
+            conversations,
+            title=job_id,
+            sections=[section.model_dump() for section in sections],
+        )
+        job_ref = pipeline.render_frames_stage.run(job_ref)
+        return pipeline.encode_video_stage.run(job_ref)
+
+    run.synthesized = synthesized
+    run.generator = generator
+    return run
+
+
+def test_staged_chain_rerenders_only_changed_sections(staged):
+    """ステージ分割でも変更のないセクションはクリップを再利用し、音声も合成しない"""
+    first = staged("job-1", [make_section("hook", ["あ", "い"]), make_section("body", ["う"])])
+    assert first["status"] == "completed"
+    # 締めくくりクリップを使わない設定のため、締めくくりも1セクションとして描画される
+    assert [s["section_key"] for s in first["sections"]] == ["hook", "body", "closing"]
+    assert not any(s["reused"] for s in first["sections"])
+    assert staged.generator.rendered == ["hook", "body", "closing"]
+    assert {"あ", "い", "う"} <= set(staged.synthesized)
+    assert os.path.exists(first["video_path"])
+
+    staged.synthesized.clear()
+    staged.generator.rendered.clear()
+    second = staged("job-2", [make_section("hook", ["あ", "い"]), make_section("body", ["え"])])
+
+    assert second["reused_sections"] == ["hook", "closing"]
+    assert staged.generator.rendered == ["body"]
+    # 音声合成ステージは描画が必要なセクションの新しいセリフだけを合成する
+    assert staged.synthesized == ["え"]
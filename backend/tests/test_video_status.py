@@ -0,0 +1,40 @@
+"""動画生成ステータスレスポンスの進捗情報"""
+
+import pytest
+
+task_status = pytest.importorskip("app.api.task_status")
+videos_models = pytest.importorskip("app.api.videos.videos_models")
+
+
+def test_progress_details_survive_response_model():
+    """ステージ・フレーム数・速度・残り時間がレスポンスに残る"""
+    payload = task_status.build_status_payload(
+        "job",
+        "PROGRESS",
+        {
+            "progress": 0.5,
+            "message": "描画中",
+            "stage": "render",
+            "frames_done": 120,
+            "total_frames": 240,
+            "fps": 30.5,
+            "eta_seconds": 4.0,
+        },
+    )
+    response = videos_models.VideoStatusResponse(**payload).model_dump()
+
+    assert response["stage"] == "render"
+    assert response["frames_done"] == 120
+    assert response["total_frames"] == 240
+    assert response["fps"] == 30.5
+    assert response["eta_seconds"] == 4.0
+
+
+def test_progress_details_are_optional():
+    """進捗情報のないステータスもそのまま返せる"""
+    payload = task_status.build_status_payload("job", "PENDING")
+    response = videos_models.VideoStatusResponse(**payload).model_dump()
+
+    assert response["status"] == "pending"
+    assert response["stage"] is None
+    assert response["eta_seconds"] is None
@@ -5,6 +5,12 @@ import type {
   VideoStatusResponse,
   JsonFileInfo,
   JsonFileStatusUpdate,
+  StoryboardRequest,
+  StoryboardResponse,
+  FrameRenderRequest,
+  FrameRenderResult,
+  RenderEstimateRequest,
+  RenderEstimateResponse,
 } from "@/types";
 
 export const videoApi = {
@@ -21,6 +27,61 @@ export const videoApi = {
     return response.data;
   },
 
+  /**
+   * 動画を生成せずにストーリーボード（代表フレームのコンタクトシート）を作成
+   */
+  createStoryboard: async (
+    data: StoryboardRequest
+  ): Promise<StoryboardResponse> => {
+    const response = await apiClient.post<StoryboardResponse>(
+      "/videos/storyboard",
+      data
+    );
+    return response.data;
+  },
+
+  /**
+   * 台本の指定時刻のフレームを描画（タイムラインのスクラブ用）
+   */
+  renderFrame: async (data: FrameRenderRequest): Promise<FrameRenderResult> => {
+    const response = await apiClient.post<Blob>("/videos/frame", data, {
+      responseType: "blob",
+    });
+    const lineIndex = response.headers["x-line-index"];
+    return {
+      image: response.data,
+      renderTimeMs: Number(response.headers["x-render-time-ms"]),
+      timelineCached: response.headers["x-timeline-cached"] === "1",
+      totalDuration: Number(response.headers["x-total-duration"]),
+      lineIndex: lineIndex !== undefined ? Number(lineIndex) : undefined,
+    };
+  },
+
+  /**
+   * フレーム描画用の画像・フォントを事前に読み込む
+   */
+  warmUpFrameRenderer: async (
+    renderProfile: "default" | "preview" = "preview"
+  ): Promise<{ profile: string; elapsed_ms: number }> => {
+    const response = await apiClient.post("/videos/frame/warmup", null, {
+      params: { render_profile: renderProfile },
+    });
+    return response.data;
+  },
+
+  /**
+   * 動画を生成せずに長さ・必要なアセット・所要時間を見積もる（ドライラン）
+   */
+  estimate: async (
+    data: RenderEstimateRequest
+  ): Promise<RenderEstimateResponse> => {
+    const response = await apiClient.post<RenderEstimateResponse>(
+      "/videos/estimate",
+      data
+    );
+    return response.data;
+  },
+
   /**
    * 動画生成のステータスを取得
    */
@@ -31,6 +92,17 @@ export const videoApi = {
     return response.data;
   },
 
+  /**
+   * 複数タスクのステータスをまとめて取得
+   */
+  getStatuses: async (taskIds: string[]): Promise<VideoStatusResponse[]> => {
+    const response = await apiClient.post<{ statuses: VideoStatusResponse[] }>(
+      "/videos/status/bulk",
+      { task_ids: taskIds }
+    );
+    return response.data.statuses;
+  },
+
   /**
    * ヘルスチェック
    */
@@ -83,3 +83,117 @@ export const createWebSocketClient = (
 ): WebSocketClient => {
   return new WebSocketClient(taskId, onMessage, onError, onClose);
 };
+
+export interface MultiplexProgressMessage {
+  type: "progress" | "error";
+  updates?: ProgressUpdate[];
+  message?: string;
+}
+
+/**
+ * 1本のWebSocket接続で複数タスクの進捗を購読するクライアント
+ * 接続前に購読したタスクは接続確立時にまとめて送信する
+ */
+export class MultiplexWebSocketClient {
+  private ws: WebSocket | null = null;
+  private taskIds = new Set<string>();
+  private onUpdate: (data: ProgressUpdate) => void;
+  private onError: (error: Event) => void;
+  private onClose: () => void;
+
+  constructor(
+    onUpdate: (data: ProgressUpdate) => void,
+    onError?: (error: Event) => void,
+    onClose?: () => void
+  ) {
+    this.onUpdate = onUpdate;
+    this.onError = onError || (() => {});
+    this.onClose = onClose || (() => {});
+  }
+
+  connect(): void {
+    const wsUrl = `${WS_BASE_URL}/ws/tasks`;
+    console.log("Multiplex WebSocket connecting to:", wsUrl);
+
+    this.ws = new WebSocket(wsUrl);
+
+    this.ws.onopen = () => {
+      console.log("Multiplex WebSocket connected");
+      if (this.taskIds.size > 0) {
+        this.send("subscribe", Array.from(this.taskIds));
+      }
+    };
+
+    this.ws.onmessage = (event) => {
+      try {
+        const data: MultiplexProgressMessage = JSON.parse(event.data);
+        if (data.type === "error") {
+          console.error("Multiplex WebSocket error message:", data.message);
+          return;
+        }
+        for (const update of data.updates || []) {
+          // 完了または失敗したタスクはサーバー側で購読解除される
+          if (update.status === "completed" || update.status === "failed") {
+            this.taskIds.delete(update.task_id);
+          }
+          this.onUpdate(update);
+        }
+      } catch (error) {
+        console.error("Failed to parse WebSocket message:", error);
+      }
+    };
+
+    this.ws.onerror = (error) => {
+      console.error("Multiplex WebSocket error:", error);
+      this.onError(error);
+    };
+
+    this.ws.onclose = () => {
+      console.log("Multiplex WebSocket disconnected");
+      this.ws = null;
+      this.onClose();
+    };
+  }
+
+  subscribe(taskIds: string[]): void {
+    const added = taskIds.filter((id) => !this.taskIds.has(id));
+    added.forEach((id) => this.taskIds.add(id));
+    if (added.length > 0) {
+      this.send("subscribe", added);
+    }
+  }
+
+  unsubscribe(taskIds: string[]): void {
+    const removed = taskIds.filter((id) => this.taskIds.has(id));
+    removed.forEach((id) => this.taskIds.delete(id));
+    if (removed.length > 0) {
+      this.send("unsubscribe", removed);
+    }
+  }
+
+  disconnect(): void {
+    if (this.ws) {
+      this.ws.close();
+      this.ws = null;
+    }
+    this.taskIds.clear();
+  }
+
+  isConnected(): boolean {
+    return this.ws !== null && this.ws.readyState === WebSocket.OPEN;
+  }
+
+  private send(action: "subscribe" | "unsubscribe", taskIds: string[]): void {
+    if (this.isConnected()) {
+      this.ws!.send(JSON.stringify({ action, task_ids: taskIds }));
+    }
+  }
+}
+
+export const createMultiplexWebSocketClient = (
+  onUpdate: (data: ProgressUpdate) => void,
+  onError?: (error: Event) => void,
+  onClose?: () => void
+): MultiplexWebSocketClient => {
+  return new MultiplexWebSocketClient(onUpdate, onError, onClose);
+};
@@ -31,6 +31,24 @@ export interface VideoGenerationRequest {
   speed?: number;
   pitch?: number;
   intonation?: number;
+  // 瞬きなどのアニメーションのシード（省略時は台本の内容から決定）
+  animation_seed?: number;
+  // 描画プロファイル（preview は 640x360・低フレームレートの確認用）
+  render_profile?: "default" | "preview";
+  // 描画中の動画をHLSで逐次出力する（進捗の playlist_url で再生できる）
+  progressive?: boolean;
+  // 追加出力（合成済みのフレームを1回のエンコードで全解像度に書き出す）
+  renditions?: RenditionSpec[];
+}
+
+export interface RenditionSpec {
+  // 出力名（ファイル名の接尾辞）。"720p" / "480p" / "360p" は height 省略時にプリセットを使用
+  name: string;
+  height?: number;
+  crf?: number;
+  // 映像ビットレート（例: "1500k"）。指定時はCRFより優先
+  video_bitrate?: string;
+  container?: "mp4" | "mkv" | "webm";
 }
 
 export interface VideoGenerationResponse {
@@ -39,6 +57,136 @@ export interface VideoGenerationResponse {
   message: string;
 }
 
+export interface StoryboardRequest {
+  conversations: ConversationLine[];
+  sections?: VideoSection[];
+  enable_subtitles?: boolean;
+  conversation_mode?: string;
+  speed?: number;
+  pitch?: number;
+  intonation?: number;
+  // 代表フレームの単位（セリフごと / セクションごと）
+  per?: "line" | "section";
+  // キャッシュにないセリフの音声を合成して正確な長さを使う（省略時は推定値）
+  synthesize_voices?: boolean;
+  columns?: number;
+  thumbnail_width?: number;
+}
+
+export interface StoryboardFrame {
+  index: number;
+  section_index?: number;
+  time: number;
+  start_time: number;
+  duration: number;
+  speaker: string;
+  text: string;
+  duration_source: "cached" | "synthesized" | "estimated";
+  // サムネイル画像（data URL）
+  image: string;
+}
+
+export interface StoryboardResponse {
+  // コンタクトシート画像（data URL）
+  contact_sheet?: string;
+  frames: StoryboardFrame[];
+  total_duration: number;
+  elapsed_ms: number;
+}
+
+export interface FrameRenderRequest {
+  conversations: ConversationLine[];
+  // 描画する時刻（秒）
+  time: number;
+  enable_subtitles?: boolean;
+  conversation_mode?: string;
+  speed?: number;
+  pitch?: number;
+  intonation?: number;
+  format?: "jpeg" | "webp";
+  quality?: number;
+  render_profile?: "default" | "preview";
+}
+
+export interface FrameRenderResult {
+  image: Blob;
+  renderTimeMs: number;
+  timelineCached: boolean;
+  totalDuration: number;
+  // 指定時刻のセリフ（セリフ間・範囲外の場合は undefined）
+  lineIndex?: number;
+}
+
+export interface RenderEstimateRequest {
+  // conversations / sections の代わりに保存済みの台本（outputs/json からの相対パス）を指定できる
+  conversations?: ConversationLine[];
+  sections?: VideoSection[];
+  json_file?: string;
+  enable_subtitles?: boolean;
+  conversation_mode?: string;
+  speed?: number;
+  pitch?: number;
+  intonation?: number;
+  animation_seed?: number;
+  render_profile?: "default" | "preview";
+  progressive?: boolean;
+  renditions?: RenditionSpec[];
+}
+
+export interface RenderEstimateAsset {
+  type: "background" | "character" | "bgm" | "font";
+  // キャラクターは "名前/表情"
+  name: string;
+  available: boolean;
+  // 存在しない場合に代わりに使われるもの
+  fallback?: string;
+}
+
+export interface RenderEstimateResponse {
+  render_profile: string;
+  // 動画全体の長さ（秒、推定値を含む）
+  total_duration: number;
+  frame_count: number;
+  fps: number;
+  resolution: [number, number];
+  duration_source: "cached" | "estimated" | "mixed";
+  lines: {
+    index: number;
+    duration: number;
+    duration_source: "cached" | "estimated";
+  }[];
+  // セクション単位で描画しない場合は空
+  sections: {
+    index: number;
+    section_key?: string;
+    section_name: string;
+    duration: number;
+    cached: boolean;
+  }[];
+  // 締めくくりクリップ（本編に含めて描画する場合は undefined）
+  closing?: { duration: number; cached: boolean };
+  cache: {
+    voices_cached: number;
+    voices_total: number;
+    sections_cached: number;
+    sections_total: number;
+    closing_cached?: boolean;
+  };
+  assets: RenderEstimateAsset[];
+  missing_assets: RenderEstimateAsset[];
+  // 所要時間（記録済みジョブの実時間比から算出。記録がなければ undefined）
+  estimate: {
+    render_duration: number;
+    estimated_seconds?: number;
+    render_seconds?: number;
+    encode_seconds?: number;
+    realtime_factor?: number;
+    samples: number;
+    calibrated: boolean;
+  };
+  elapsed_ms: number;
+}
+
 export interface VideoStatusResponse {
   task_id: string;
   status: string;
@@ -48,8 +196,21 @@ export interface VideoStatusResponse {
     video_path?: string;
     status?: string;
     message?: string;
+    playlist_url?: string;
+    renditions?: string[];
+    encode_seconds?: number;
   };
   error?: string;
+  // 描画中の動画のHLSプレイリスト（progressive 指定時）
+  playlist_url?: string;
+  // 処理中のステージ（voice / render / encode など）
+  stage?: string;
+  // 描画済みフレーム数・総フレーム数・描画速度（フレーム/秒）
+  frames_done?: number;
+  total_frames?: number;
+  fps?: number;
+  // ステージ完了までの残り時間の目安（秒）
+  eta_seconds?: number;
 }
 
 // === 共通セクション定義 ===